@@ -1,7 +1,59 @@
 # flake8: noqa
-from aws_handler.aws_integration.connectors.aws_connector.aws_connector import (
-    AwsConnector,
-)
-from aws_handler.aws_integration.connectors.boto3.boto3_connector import (
-    Boto3Connector,
-)
+from typing import TYPE_CHECKING
+
+from aws_handler.util.lazy_import import lazy_module_getattr
+
+# The connectors (and boto3 or aiobotocore with them) are imported on first
+# access
+_LAZY_IMPORTS = {
+    "AwsConnector": (
+        "aws_handler.aws_integration.connectors.aws_connector.aws_connector"
+    ),
+    "AsyncAwsConnector": (
+        "aws_handler.aws_integration.connectors.aws_connector."
+        "async_aws_connector"
+    ),
+    "Boto3Connector": (
+        "aws_handler.aws_integration.connectors.boto3.boto3_connector"
+    ),
+    "AiobotocoreConnector": (
+        "aws_handler.aws_integration.connectors.aiobotocore."
+        "aiobotocore_connector"
+    ),
+    "Boto3ConnectorConfig": (
+        "aws_handler.aws_integration.connectors.boto3.client_pool"
+    ),
+    "InMemoryConnector": (
+        "aws_handler.aws_integration.connectors.memory.memory_connector"
+    ),
+    "NetworkSimulator": (
+        "aws_handler.aws_integration.connectors.memory.network"
+    ),
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__ = lazy_module_getattr(__name__, _LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from aws_handler.aws_integration.connectors.aws_connector.aws_connector import (
+        AwsConnector,
+    )
+    from aws_handler.aws_integration.connectors.aws_connector.async_aws_connector import (
+        AsyncAwsConnector,
+    )
+    from aws_handler.aws_integration.connectors.boto3.boto3_connector import (
+        Boto3Connector,
+    )
+    from aws_handler.aws_integration.connectors.aiobotocore.aiobotocore_connector import (
+        AiobotocoreConnector,
+    )
+    from aws_handler.aws_integration.connectors.boto3.client_pool import (
+        Boto3ConnectorConfig,
+    )
+    from aws_handler.aws_integration.connectors.memory.memory_connector import (
+        InMemoryConnector,
+    )
+    from aws_handler.aws_integration.connectors.memory.network import (
+        NetworkSimulator,
+    )
@@ -0,0 +1,528 @@
+from contextlib import AsyncExitStack
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import asyncio
+import io
+import json
+
+import pandas as pd
+
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AsyncAwsConnector,
+)
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    compress_bytes,
+    normalize_compression,
+    open_compressed,
+)
+from aws_handler.util.encoding import EncodingDetector
+from aws_handler.util.keyword_matcher import KeywordMatcher
+from aws_handler.util.logger import log
+from aws_handler.util.pandas import dataframe_to_bytes
+
+
+class AiobotocoreConnector(AsyncAwsConnector):
+    # Maximum number of sub-prefixes listed concurrently
+    LIST_MAX_WORKERS = 8
+    # Number of bytes at the start of an object used to detect its encoding
+    ENCODING_SAMPLE_SIZE = 64 * 1024
+    # Size in bytes of each part of a streamed multipart upload
+    MULTIPART_PART_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, client_kwargs: Optional[Dict] = None):
+        """
+        Initialize an AiobotocoreConnector object.
+
+        The aiobotocore client is created on the first request (or when
+        entering the connector as an async context manager) and released by
+        `close`.
+
+        :param client_kwargs: Optional keyword arguments for the creation of
+        the S3 client (region_name, endpoint_url, config, ...).
+        """
+        self._client_kwargs = client_kwargs if client_kwargs else {}
+        self._s3 = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client_lock = asyncio.Lock()
+        # Encoding detector caching its results per object version
+        self._encoding_detector = EncodingDetector(
+            sample_size=self.ENCODING_SAMPLE_SIZE
+        )
+
+    async def _verify_aws_connection(self):
+        async with self._client_lock:
+            if self._s3 is not None:
+                return
+            try:
+                from aiobotocore.session import get_session
+            except ImportError as excpt:
+                raise ImportError(
+                    "AiobotocoreConnector requires the 'aiobotocore' "
+                    "package, install it with `pip install aiobotocore`."
+                ) from excpt
+
+            try:
+                exit_stack = AsyncExitStack()
+                self._s3 = await exit_stack.enter_async_context(
+                    get_session().create_client("s3", **self._client_kwargs)
+                )
+                self._exit_stack = exit_stack
+                log.debug("AWS Connection Verified.")
+            except Exception as excpt:
+                raise Exception("Failed to verify AWS connection") from excpt
+
+    async def _get_client(self):
+        """
+        Get the S3 client, creating it on first use.
+
+        :return: The aiobotocore S3 client.
+        """
+        if self._s3 is None:
+            await self._verify_aws_connection()
+        return self._s3
+
+    async def close(self):
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._s3 = None
+
+    async def _iter_pages(
+        self,
+        bucket: str,
+        prefix: str = "",
+        start_after: str = "",
+        delimiter: str = "",
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        Iterate over the pages of `list_objects_v2` under a prefix.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix to list.
+        :param start_after: Only list the keys after this one.
+        :param delimiter: Optional delimiter grouping the keys.
+        :return: An async generator yielding the raw listing pages.
+        """
+        s3 = await self._get_client()
+        paginator = s3.get_paginator("list_objects_v2")
+        pagination_args = {"Bucket": bucket, "Prefix": prefix}
+        if start_after:
+            pagination_args["StartAfter"] = start_after
+        if delimiter:
+            pagination_args["Delimiter"] = delimiter
+        async for page in paginator.paginate(**pagination_args):
+            yield page
+
+    async def _iter_objects_concurrently(
+        self, bucket: str, prefixes: List[str]
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        Iterate over every object under several prefixes, splitting each
+        prefix into its sub-prefixes (using "/" as delimiter) and listing the
+        sub-prefixes concurrently.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefixes: The prefixes to list, they must not overlap.
+        :return: An async generator yielding the raw object summaries, in no
+        particular order.
+        """
+        sub_prefixes = prefixes
+        while True:
+            # Objects directly under the prefixes are listed with the split
+            split_prefixes, sub_prefixes = sub_prefixes, []
+            for prefix in split_prefixes:
+                async for page in self._iter_pages(
+                    bucket, prefix=prefix, delimiter="/"
+                ):
+                    for obj in page.get("Contents", []):
+                        yield obj
+                    sub_prefixes.extend(
+                        common_prefix["Prefix"]
+                        for common_prefix in page.get("CommonPrefixes", [])
+                    )
+            # A single sub-prefix (such as the folder "data" listed as
+            # "data/") is split again, there is nothing to list concurrently
+            if len(sub_prefixes) != 1:
+                break
+
+        pages = asyncio.Queue(maxsize=2 * self.LIST_MAX_WORKERS)
+        listing_slots = asyncio.Semaphore(self.LIST_MAX_WORKERS)
+
+        async def list_sub_prefix(sub_prefix: str) -> None:
+            try:
+                async with listing_slots:
+                    async for page in self._iter_pages(
+                        bucket, prefix=sub_prefix
+                    ):
+                        await pages.put(page.get("Contents", []))
+                await pages.put(None)
+            except Exception as excpt:
+                await pages.put(excpt)
+
+        tasks = [
+            asyncio.create_task(list_sub_prefix(sub_prefix))
+            for sub_prefix in sub_prefixes
+        ]
+        try:
+            pending_sub_prefixes = len(tasks)
+            while pending_sub_prefixes:
+                page_objects = await pages.get()
+                if page_objects is None:
+                    pending_sub_prefixes -= 1
+                elif isinstance(page_objects, Exception):
+                    raise page_objects
+                else:
+                    for obj in page_objects:
+                        yield obj
+        finally:
+            # Stop the listing if it was not fully consumed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _to_file_info(obj: Dict) -> Dict[str, str]:
+        """
+        Convert a raw object summary into a file information dictionary.
+
+        :param obj: The object summary returned by `list_objects_v2`.
+        :return: A dictionary with "file_path", "last_modified", "size" and
+        "etag".
+        """
+        return {
+            "file_path": obj["Key"],
+            "last_modified": str(obj["LastModified"]),
+            "size": obj.get("Size"),
+            "etag": obj.get("ETag"),
+        }
+
+    async def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: Optional[List[str]] = None,
+        match_mode: str = "glob",
+    ) -> AsyncGenerator[Tuple[str, Dict[str, str]], None]:
+        if keywords is None:
+            keywords = [""]
+
+        if "" in keywords:
+            log.warning(
+                "S3 being accessed with no filtering, "
+                " this may result in low performance."
+            )
+
+        keyword_matcher = KeywordMatcher(keywords, mode=match_mode)
+        prefixes = keyword_matcher.listing_prefixes(folder)
+        async for obj in self._iter_objects_concurrently(bucket, prefixes):
+            # Skip objects that represent folders
+            if obj["Key"].endswith("/"):
+                continue
+
+            file_info = self._to_file_info(obj)
+            for keyword in keyword_matcher.match(file_info["file_path"]):
+                yield keyword, file_info
+
+    async def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> AsyncGenerator[Dict[str, str], None]:
+        async for page in self._iter_pages(
+            bucket, prefix=prefix, start_after=start_after
+        ):
+            for obj in page.get("Contents", []):
+                yield self._to_file_info(obj)
+
+    async def s3_list_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: Optional[List[str]] = None,
+        match_mode: str = "glob",
+    ) -> Dict[str, List[Dict[str, str]]]:
+        if keywords is None:
+            keywords = [""]
+
+        result = {keyword: [] for keyword in keywords}
+        async for keyword, file_info in self.s3_iter_files(
+            bucket=bucket,
+            folder=folder,
+            keywords=keywords,
+            match_mode=match_mode,
+        ):
+            result[keyword].append(file_info)
+
+        return result
+
+    async def s3_read_file(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        raw: bool = False,
+        bytes_: bool = False,
+        detect_encoding: bool = True,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        s3 = await self._get_client()
+        try:
+            # Get the file object from S3
+            response = await s3.get_object(Bucket=bucket, Key=key)
+            async with response["Body"] as stream:
+                obj = await stream.read()
+            encoding = (
+                self._encoding_detector.detect(
+                    obj, cache_key=(bucket, key, response.get("ETag"))
+                )
+                if detect_encoding
+                else None
+            )
+        except s3.exceptions.NoSuchKey:
+            # Handle the case where the object is not found
+            return None, None
+        except Exception as e:
+            # Handle any other unexpected errors
+            return None, f"Error: {str(e)}"
+
+        # Return based on the requested format
+        if raw:
+            return obj, encoding
+        elif bytes_:
+            return io.BytesIO(obj), encoding
+        else:
+            return obj.decode(code), encoding
+
+    async def s3_read_file_by_chunks(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        chunk_size: int = 65536,
+        bytes_: bool = False,
+        raw: bool = False,
+        detect_encoding: bool = True,
+    ) -> AsyncGenerator[Tuple[bytes, str], None]:
+        s3 = await self._get_client()
+        try:
+            response = await s3.get_object(Bucket=bucket, Key=key)
+        except s3.exceptions.NoSuchKey:
+            return
+
+        encoding = None
+        async with response["Body"] as stream:
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    yield -1, -1
+                    break
+                # The encoding is detected once, from the first chunk
+                if detect_encoding and encoding is None:
+                    encoding = self._encoding_detector.detect(
+                        chunk, cache_key=(bucket, key, response.get("ETag"))
+                    )
+                    detect_encoding = False
+                if raw:
+                    yield chunk, encoding
+                elif bytes_:
+                    yield io.BytesIO(chunk), encoding
+                else:
+                    yield chunk.decode(code), encoding
+
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        # Unknown versions of an object are not cached
+        cache_key = (bucket, key, etag, compression) if etag else None
+        return self._encoding_detector.detect(data, cache_key=cache_key)
+
+    async def s3_head_file(
+        self, bucket: str, key: str
+    ) -> Optional[Dict[str, str]]:
+        s3 = await self._get_client()
+        try:
+            response = await s3.head_object(Bucket=bucket, Key=key)
+        except s3.exceptions.ClientError as excpt:
+            if excpt.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+            ):
+                return None
+            raise
+        return {
+            "file_path": key,
+            "last_modified": str(response["LastModified"]),
+            "size": response["ContentLength"],
+            "etag": response.get("ETag"),
+        }
+
+    async def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        if end <= start:
+            return b""
+        s3 = await self._get_client()
+        conditions = {"IfMatch": etag} if etag else {}
+        response = await s3.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes={start}-{end - 1}",
+            **conditions,
+        )
+        async with response["Body"] as stream:
+            return await stream.read()
+
+    async def upload_dataframe_to_s3(
+        self,
+        data: Union[pd.DataFrame, io.BytesIO],
+        bucket: str,
+        key: str,
+        file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        # Serialize the DataFrame without blocking the event loop
+        body, content_type = await asyncio.to_thread(
+            dataframe_to_bytes, data, file_format
+        )
+        compression = normalize_compression(compression)
+        if compression is not None:
+            body = await asyncio.to_thread(
+                compress_bytes, body, compression, compression_level
+            )
+            content_type = COMPRESSION_CONTENT_TYPES[compression]
+        await self.put_object_to_s3(
+            bucket, key, body, content_type=content_type
+        )
+
+    async def upload_stream_to_s3(
+        self,
+        chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        s3 = await self._get_client()
+        compression = normalize_compression(compression)
+        # Holds the (compressed) data of the part being filled
+        part_buffer = io.BytesIO()
+        sink = part_buffer
+        if compression is not None:
+            content_type = COMPRESSION_CONTENT_TYPES[compression]
+            sink = open_compressed(part_buffer, compression, compression_level)
+        upload_id = None
+        parts = []
+
+        async def upload_part():
+            nonlocal upload_id
+            if upload_id is None:
+                response = await s3.create_multipart_upload(
+                    Bucket=bucket, Key=key, ContentType=content_type
+                )
+                upload_id = response["UploadId"]
+            response = await s3.upload_part(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=part_buffer.getvalue(),
+            )
+            parts.append(
+                {"ETag": response["ETag"], "PartNumber": len(parts) + 1}
+            )
+            part_buffer.seek(0)
+            part_buffer.truncate()
+
+        try:
+            async for chunk in _iter_async(chunks):
+                if compression is not None:
+                    await asyncio.to_thread(sink.write, chunk)
+                else:
+                    sink.write(chunk)
+                if part_buffer.tell() >= self.MULTIPART_PART_SIZE:
+                    await upload_part()
+            if compression is not None:
+                await asyncio.to_thread(sink.close)
+
+            if upload_id is None:
+                # Small contents are sent in a single request
+                await self.put_object_to_s3(
+                    bucket, key, part_buffer.getvalue(), content_type
+                )
+                return
+            if part_buffer.tell():
+                await upload_part()
+            await s3.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                await s3.abort_multipart_upload(
+                    Bucket=bucket, Key=key, UploadId=upload_id
+                )
+            raise
+
+    async def put_object_to_s3(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        s3 = await self._get_client()
+        await s3.put_object(
+            Body=data, Bucket=bucket, Key=key, ContentType=content_type
+        )
+
+    async def put_dict_to_s3(
+        self, bucket: str, key: str, dict_obj: Dict
+    ) -> None:
+        s3 = await self._get_client()
+        await s3.put_object(
+            Body=json.dumps(dict_obj).encode("utf-8"),
+            Bucket=bucket,
+            Key=key,
+        )
+
+
+async def _iter_async(
+    chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+) -> AsyncGenerator[bytes, None]:
+    """
+    Iterate over an iterable or an async iterable of chunks. The chunks of a
+    (blocking) iterable are produced in a worker thread.
+
+    :param chunks: The chunks.
+    :return: An async generator yielding the chunks.
+    """
+    if hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+        return
+    chunk_iterator = iter(chunks)
+    while True:
+        chunk = await asyncio.to_thread(next, chunk_iterator, None)
+        if chunk is None:
+            return
+        yield chunk
@@ -1,3 +1,5 @@
 # flake8: noqa
 from .aws_connector import AwsConnector
+from .async_aws_connector import AsyncAwsConnector
 from .mock import AwsConnectorMock
+from .async_mock import AsyncAwsConnectorMock
@@ -0,0 +1,28 @@
+from abc import abstractmethod
+
+from .async_s3 import AsyncAwsS3
+
+
+# Asynchronous connector class that must implement the methods from AsyncAwsS3
+class AsyncAwsConnector(AsyncAwsS3):
+    @abstractmethod
+    async def _verify_aws_connection(self):
+        """
+        Verify that the connection to AWS is successful.
+
+        This method must be implemented by all subclasses.
+        """
+        pass
+
+    async def close(self):
+        """
+        Release the resources (clients, connections) held by the connector.
+        """
+        pass
+
+    async def __aenter__(self) -> "AsyncAwsConnector":
+        await self._verify_aws_connection()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,132 @@
+# flake8: noqa
+
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import io
+import pandas as pd
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AsyncAwsConnector,
+)
+
+
+class AsyncAwsConnectorMock(AsyncAwsConnector):
+
+    async def _verify_aws_connection(self):
+        pass
+
+    async def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> AsyncGenerator[Tuple[str, Dict[str, str]], None]:
+        return
+        yield
+
+    async def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> AsyncGenerator[Dict[str, str], None]:
+        return
+        yield
+
+    async def s3_list_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> Dict[str, List[Dict[str, str]]]:
+        return {}
+
+    async def s3_read_file(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        raw: bool = False,
+        bytes_: bool = False,
+        detect_encoding: bool = True,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        return None, None
+
+    async def s3_read_file_by_chunks(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        chunk_size: int = 65536,
+        bytes_: bool = False,
+        raw: bool = False,
+        detect_encoding: bool = True,
+    ) -> AsyncGenerator[Tuple[bytes, str], None]:
+        yield -1, -1
+
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        return None
+
+    async def s3_head_file(
+        self, bucket: str, key: str
+    ) -> Optional[Dict[str, str]]:
+        return None
+
+    async def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        return b""
+
+    async def upload_dataframe_to_s3(
+        self,
+        data: Union[pd.DataFrame, io.BytesIO],
+        bucket: str,
+        key: str,
+        file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        return None
+
+    async def upload_stream_to_s3(
+        self,
+        chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        return None
+
+    async def put_object_to_s3(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        return None
+
+    async def put_dict_to_s3(
+        self, bucket: str, key: str, dict_obj: Dict
+    ) -> None:
+        return None
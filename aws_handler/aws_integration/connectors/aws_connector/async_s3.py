@@ -0,0 +1,284 @@
+import io
+from abc import ABC, abstractmethod
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+
+class AsyncAwsS3(ABC):
+    """
+    Asynchronous counterpart of AwsS3. Every method is a coroutine (or an
+    async generator) with the same parameters and results as the blocking
+    method with the same name.
+    """
+
+    @abstractmethod
+    async def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> AsyncGenerator[Tuple[str, Dict[str, str]], None]:
+        """
+        Lazily lists objects (files) within an Amazon S3 bucket and yields
+        every file matching a keyword as soon as its page is received.
+
+        :param bucket: The name of the S3 bucket.
+        :param folder: A common folder for all the files to be searched.
+        :param keywords: Optional list of keywords to search for files within
+        the bucket.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+
+        :return: An async generator yielding tuples of (keyword, file
+        information), where the file information is a dictionary containing
+        "file_path", "last_modified", "size" and "etag".
+        """
+        yield
+
+    @abstractmethod
+    async def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> AsyncGenerator[Dict[str, str], None]:
+        """
+        Lazily lists every object under a prefix of an Amazon S3 bucket, in
+        ascending key order.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix of the objects to list.
+        :param start_after: Optional key after which the listing starts.
+
+        :return: An async generator yielding a dictionary per object
+        containing "file_path", "last_modified", "size" and "etag".
+        """
+        yield
+
+    @abstractmethod
+    async def s3_list_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Lists objects (files) within an Amazon S3 bucket, optionally filtered
+        by keywords.
+
+        :param bucket: The name of the S3 bucket.
+        :param folder: A common folder for all the files to be searched.
+        :param keywords: Optional list of keywords to search for files within
+        the bucket.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+
+        :return: A dictionary with the list of matching files of each keyword.
+        """
+        pass
+
+    @abstractmethod
+    async def s3_read_file(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        raw: bool = False,
+        bytes_: bool = False,
+        detect_encoding: bool = True,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Reads a file from S3 and returns its content.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :param code: The encoding to decode the content (default: 'utf-8').
+        :param raw: If True, returns raw bytes.
+        :param bytes_: If True, returns an in-memory BytesIO object.
+        :param detect_encoding: If False, the encoding is not detected and
+        None is returned instead (for binary formats or when the caller
+        already knows the encoding).
+        :return: A tuple of (file content, encoding).
+        """
+        pass
+
+    @abstractmethod
+    async def s3_read_file_by_chunks(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        chunk_size: int = 65536,
+        bytes_: bool = False,
+        raw: bool = False,
+        detect_encoding: bool = True,
+    ) -> AsyncGenerator[Tuple[bytes, str], None]:
+        """
+        Stream a file from an S3 bucket in smaller, manageable chunks.
+
+        :param bucket: S3 bucket name.
+        :param key: S3 key (file path) for the file in the S3 bucket.
+        :param code: The encoding to use when decoding chunks (default is
+        'utf-8').
+        :param chunk_size: The size of each chunk to read from the S3 object
+        (default is 65536 bytes).
+        :param bytes_: Yields each chunk as a `BytesIO` stream.
+        :param raw: If True, yields raw byte data for each chunk.
+        :param detect_encoding: If False, the encoding is not detected and
+        None is yielded instead.
+        :return: An async generator yielding a tuple of (file content chunk,
+        encoding) for each chunk read, followed by (-1, -1) at the end.
+        """
+        yield
+
+    @abstractmethod
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Detect the encoding of content read from an object, with the
+        connector's encoding detector. Used for content the connector did not
+        detect itself, such as decompressed files.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :param data: The content to detect the encoding from (its start is
+        enough).
+        :param etag: The ETag of the object. If given, the result is cached
+        for this version of the object.
+        :param compression: The compression the content was decompressed
+        from, None if the content was not compressed.
+        :return: The detected encoding, None if it could not be detected.
+        """
+        pass
+
+    @abstractmethod
+    async def s3_head_file(
+        self, bucket: str, key: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Get the information of an object without downloading it.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :return: A dictionary containing "file_path", "last_modified", "size"
+        and "etag", or None if the object does not exist in S3.
+        """
+        pass
+
+    @abstractmethod
+    async def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        """
+        Read a byte range of an object.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :param start: The offset of the first byte.
+        :param end: The offset after the last byte.
+        :param etag: Optional ETag the object must still have, otherwise
+        the request fails.
+        :return: The bytes of the range.
+        """
+        pass
+
+    @abstractmethod
+    async def upload_dataframe_to_s3(
+        self,
+        data: Union[pd.DataFrame, io.BytesIO],
+        bucket: str,
+        key: str,
+        file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        """
+        Uploads a Pandas DataFrame or a BytesIO buffer to Amazon S3.
+
+        :param data: Pandas DataFrame or BytesIO buffer to upload.
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param file_format: File format for the uploaded data.
+        :param compression: Optional compression of the uploaded data:
+        "gzip", "bz2", "xz" or "zstd".
+        :param compression_level: Optional compression level.
+        """
+        pass
+
+    @abstractmethod
+    async def upload_stream_to_s3(
+        self,
+        chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        """
+        Uploads a stream of bytes chunks to Amazon S3, without holding the
+        whole content in memory: large contents are sent in a multipart
+        upload as the chunks are produced.
+
+        :param chunks: Iterable (or async iterable) of the bytes chunks to
+        upload, consumed lazily.
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param content_type: The MIME type of the uploaded (uncompressed)
+        data.
+        :param compression: Optional compression of the uploaded data:
+        "gzip", "bz2", "xz" or "zstd".
+        :param compression_level: Optional compression level.
+        """
+        pass
+
+    @abstractmethod
+    async def put_object_to_s3(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """
+        Uploads an object to Amazon S3.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the object to in S3.
+        :param data: The data to upload.
+        :param content_type: The MIME type of the object being uploaded.
+        """
+        pass
+
+    @abstractmethod
+    async def put_dict_to_s3(
+        self, bucket: str, key: str, dict_obj: Dict
+    ) -> None:
+        """
+        Uploads a dictionary as a JSON object to Amazon S3.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the dictionary to in S3.
+        :param dict_obj: The dictionary to upload.
+        """
+        pass
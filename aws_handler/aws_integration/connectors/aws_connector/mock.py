@@ -1,6 +1,6 @@
 # flake8: noqa
 
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Generator, Iterable, List, Optional, Tuple, Union
 import io
 import pandas as pd
 from aws_handler.aws_integration.connectors.aws_connector import AwsConnector
@@ -12,10 +12,28 @@ class AwsConnectorMock(AwsConnector):
         pass
 
     def s3_list_files(
-        self, bucket: str, folder: str = "", keywords: List[str] = None
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
     ) -> Dict[str, List[Dict[str, str]]]:
         return {}
 
+    def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> Generator[Tuple[str, Dict[str, str]], None, None]:
+        yield from ()
+
+    def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict[str, str], None, None]:
+        yield from ()
+
     def s3_read_file(
         self,
         bucket: str,
@@ -23,6 +41,7 @@ class AwsConnectorMock(AwsConnector):
         code: str = "utf-8",
         raw: bool = False,
         bytes_: bool = False,
+        detect_encoding: bool = True,
     ) -> Tuple[Optional[bytes], Optional[str]]:
         return None, None
 
@@ -34,15 +53,52 @@ class AwsConnectorMock(AwsConnector):
         chunk_size: int = 65536,
         bytes_: bool = False,
         raw: bool = False,
+        detect_encoding: bool = True,
     ) -> Optional[Tuple[bytes, str]]:
         return None
 
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        return None
+
+    def s3_head_file(self, bucket: str, key: str) -> Optional[Dict[str, str]]:
+        return None
+
+    def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        return b""
+
     def upload_dataframe_to_s3(
         self,
         data: Union[pd.DataFrame, io.BytesIO],
         bucket: str,
         key: str,
         file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        return None
+
+    def upload_stream_to_s3(
+        self,
+        chunks: Iterable[bytes],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ) -> None:
         return None
 
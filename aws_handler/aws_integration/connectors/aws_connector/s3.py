@@ -1,6 +1,14 @@
 import io
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Union
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 
@@ -8,7 +16,11 @@ import pandas as pd
 class AwsS3(ABC):
     @abstractmethod
     def s3_list_files(
-        self, bucket: str, folder: str = "", keywords: List[str] = None
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
     ) -> Dict[str, List[Dict[str, str]]]:
         """
         Lists objects (files) within an Amazon S3 bucket, optionally filtered
@@ -18,10 +30,60 @@ class AwsS3(ABC):
         :param folder: A common folder for all the files to be searched.
         :param keywords: Optional list of keywords to search for files within
         the bucket.
+        :param match_mode: How the keywords are interpreted: "glob" patterns
+        found anywhere in the key (default), "anchored" glob patterns matching
+        the whole key, or "regex" regular expressions. Only anchored keywords
+        narrow the listing to the prefixes they start with.
 
         :return: A dictionary where each key represents a prefix, and the
-        corresponding value is a list of dictionaries containing "file_path"
-        and "last_modified" for each file.
+        corresponding value is a list of dictionaries containing "file_path",
+        "last_modified", "size" and "etag" for each file.
+        """
+        pass
+
+    @abstractmethod
+    def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: List[str] = None,
+        match_mode: str = "glob",
+    ) -> Generator[Tuple[str, Dict[str, str]], None, None]:
+        """
+        Lazily lists objects (files) within an Amazon S3 bucket, following
+        the listing pagination, and yields every file matching a keyword as
+        soon as its page is received.
+
+        :param bucket: The name of the S3 bucket.
+        :param folder: A common folder for all the files to be searched.
+        :param keywords: Optional list of keywords to search for files within
+        the bucket.
+        :param match_mode: How the keywords are interpreted: "glob" patterns
+        found anywhere in the key (default), "anchored" glob patterns matching
+        the whole key, or "regex" regular expressions. Only anchored keywords
+        narrow the listing to the prefixes they start with.
+
+        :return: A generator yielding tuples of (keyword, file information),
+        where the file information is a dictionary containing "file_path",
+        "last_modified", "size" and "etag". A file matching several keywords
+        is yielded once per keyword.
+        """
+        pass
+
+    @abstractmethod
+    def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict[str, str], None, None]:
+        """
+        Lazily lists every object under a prefix of an Amazon S3 bucket, in
+        ascending key order, following the listing pagination.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix of the objects to list.
+        :param start_after: Optional key after which the listing starts.
+
+        :return: A generator yielding a dictionary per object containing
+        "file_path", "last_modified", "size" and "etag".
         """
         pass
 
@@ -33,6 +95,7 @@ class AwsS3(ABC):
         code: str = "utf-8",
         raw: bool = False,
         bytes_: bool = False,
+        detect_encoding: bool = True,
     ) -> Tuple[Optional[bytes], Optional[str]]:
         """
         Reads a file from S3 and returns its content.
@@ -42,6 +105,9 @@ class AwsS3(ABC):
         :param code: The encoding to decode the content (default: 'utf-8').
         :param raw: If True, returns raw bytes.
         :param bytes_: If True, returns an in-memory BytesIO object.
+        :param detect_encoding: If False, the encoding is not detected and
+        None is returned instead (for binary formats or when the caller
+        already knows the encoding).
         :return: A tuple of (file content, encoding).
         """
         pass
@@ -55,6 +121,7 @@ class AwsS3(ABC):
         chunk_size: int = 65536,
         bytes_: bool = False,
         raw: bool = False,
+        detect_encoding: bool = True,
     ) -> Optional[Tuple[bytes, str]]:
         """
         Stream a file from an S3 bucket in smaller, manageable chunks.
@@ -69,12 +136,75 @@ class AwsS3(ABC):
         for pandas (default is False).
         :param raw: If True, yields raw byte data for each chunk (default is
         False).
+        :param detect_encoding: If False, the encoding is not detected and
+        None is yielded instead (default is True). The encoding is detected
+        from the first chunk only.
         :return: A generator that yields a tuple of (file content chunk,
         encoding) for each chunk read, or None if the object does not exist in
         S3.
         """
         pass
 
+    @abstractmethod
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Detect the encoding of content read from an object, with the
+        connector's encoding detector. Used for content the connector did not
+        detect itself, such as decompressed files.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :param data: The content to detect the encoding from (its start is
+        enough).
+        :param etag: The ETag of the object. If given, the result is cached
+        for this version of the object.
+        :param compression: The compression the content was decompressed
+        from, None if the content was not compressed.
+        :return: The detected encoding, None if it could not be detected.
+        """
+        pass
+
+    @abstractmethod
+    def s3_head_file(self, bucket: str, key: str) -> Optional[Dict[str, str]]:
+        """
+        Get the information of an object without downloading it.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :return: A dictionary containing "file_path", "last_modified", "size"
+        and "etag", or None if the object does not exist in S3.
+        """
+        pass
+
+    @abstractmethod
+    def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        """
+        Read a byte range of an object.
+
+        :param bucket: The S3 bucket name.
+        :param key: The S3 object key.
+        :param start: The offset of the first byte.
+        :param end: The offset after the last byte.
+        :param etag: Optional ETag the object must still have, otherwise
+        the request fails.
+        :return: The bytes of the range.
+        """
+        pass
+
     @abstractmethod
     def upload_dataframe_to_s3(
         self,
@@ -82,6 +212,8 @@ class AwsS3(ABC):
         bucket: str,
         key: str,
         file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ) -> None:
         """
         Uploads a Pandas DataFrame or a BytesIO buffer to Amazon S3.
@@ -90,6 +222,36 @@ class AwsS3(ABC):
         :param bucket: The name of the S3 bucket.
         :param key: The key (path) to upload the data to in S3.
         :param file_format: File format for the uploaded data.
+        :param compression: Optional compression of the uploaded data:
+        "gzip", "bz2", "xz" or "zstd".
+        :param compression_level: Optional compression level.
+        """
+        pass
+
+    @abstractmethod
+    def upload_stream_to_s3(
+        self,
+        chunks: Iterable[bytes],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        """
+        Uploads a stream of bytes chunks to Amazon S3, without holding the
+        whole content in memory: large contents are sent in a multipart
+        upload as the chunks are produced.
+
+        :param chunks: Iterable of the bytes chunks to upload, consumed
+        lazily.
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param content_type: The MIME type of the uploaded (uncompressed)
+        data.
+        :param compression: Optional compression of the uploaded data:
+        "gzip", "bz2", "xz" or "zstd".
+        :param compression_level: Optional compression level.
         """
         pass
 
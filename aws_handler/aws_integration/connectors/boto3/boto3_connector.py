@@ -1,56 +1,344 @@
-from typing import Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterable, List, Optional, Tuple, Union
 import io
 import json
-import re
+import mmap
+import queue
+import threading
 
-import boto3
 import botocore
 import botocore.client
+import botocore.exceptions
 import pandas as pd
 
 from aws_handler.aws_integration.connectors.aws_connector import AwsConnector
-from aws_handler.aws_integration.connectors.boto3.util import (
-    detect_encoding_from_bytes,
+from aws_handler.aws_integration.connectors.boto3.client_pool import (
+    Boto3ClientPool,
+    Boto3ConnectorConfig,
 )
+from aws_handler.aws_integration.connectors.boto3.disk_cache import (
+    DiskCache,
+)
+from aws_handler.aws_integration.connectors.boto3.multipart import (
+    MultipartUploadWriter,
+)
+from aws_handler.aws_integration.connectors.boto3.ranged import (
+    RangedDownloader,
+)
+from aws_handler.util.arrow import ARROW_FILE_TYPES, write_arrow_file
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    normalize_compression,
+    open_compressed,
+)
+from aws_handler.util.encoding import EncodingDetector
+from aws_handler.util.json_engine import NDJSON_FILE_TYPES
+from aws_handler.util.keyword_matcher import KeywordMatcher
 from aws_handler.util.logger import log
+from aws_handler.util.pandas import (
+    get_dataframe_content_type,
+    iter_csv_slices,
+    iter_ndjson_slices,
+    write_df_to_excel,
+)
 
 
 class Boto3Connector(AwsConnector):
     # Class variable to store the singleton instance
     _instance = None
+    # Lock guarding the creation and initialization of the singleton
+    _instance_lock = threading.Lock()
+    # Maximum number of sub-prefixes listed concurrently
+    LIST_MAX_WORKERS = 8
+    # Size in bytes above which uploads use a multipart upload
+    MULTIPART_THRESHOLD = 64 * 1024 * 1024
+    # Size in bytes of each part of a multipart upload
+    MULTIPART_PART_SIZE = 16 * 1024 * 1024
+    # Maximum number of parts uploaded at the same time
+    MULTIPART_MAX_IN_FLIGHT = 4
+    # Number of DataFrame rows serialized at a time when uploading a CSV
+    CSV_ROWS_PER_SLICE = 50000
+    # Number of bytes at the start of an object used to detect its encoding
+    ENCODING_SAMPLE_SIZE = 64 * 1024
+    # Size in bytes of each range of a download, larger objects are
+    # downloaded with concurrent range requests
+    RANGED_GET_PART_SIZE = 8 * 1024 * 1024
+    # Maximum number of ranges downloaded at the same time
+    RANGED_GET_MAX_WORKERS = 8
+    # Maximum number of attempts of each range
+    RANGED_GET_MAX_ATTEMPTS = 3
 
     def __new__(cls, *args, **kwargs):
         """
         Ensure that only one instance of the class is created.
         If an instance already exists, return the existing one.
         """
-        if not cls._instance:
-            cls._instance = super().__new__(cls, *args, **kwargs)
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self):
-        # Avoid re-initialization
-        if not hasattr(self, "_initialized"):
-            # Initialize boto3 client
-            self._s3: botocore.client.S3 = None
-            # Start AWS connections
-            self._verify_aws_connection()
+    def __init__(self, config: Optional[Boto3ConnectorConfig] = None):
+        """
+        Initialize the Boto3Connector singleton. Only the first
+        initialization applies its configuration.
+
+        :param config: Optional configuration of the S3 clients (connection
+        pool size, timeouts, retries, endpoint, ...).
+        """
+        with self._instance_lock:
+            # Avoid re-initialization
+            if hasattr(self, "_initialized"):
+                if config is not None and config is not self.config:
+                    log.warning(
+                        "Boto3Connector is already initialized, "
+                        "the new configuration is ignored."
+                    )
+                return
+            # Pool of the boto3 clients
+            self._client_pool = Boto3ClientPool(
+                config if config else Boto3ConnectorConfig()
+            )
+            # Encoding detector caching its results per object version
+            self._encoding_detector = EncodingDetector(
+                sample_size=self.ENCODING_SAMPLE_SIZE
+            )
+            # Downloader splitting large objects in concurrent range requests
+            self._ranged_downloader = RangedDownloader(
+                self._get_client,
+                part_size=self.RANGED_GET_PART_SIZE,
+                max_workers=self.RANGED_GET_MAX_WORKERS,
+                max_attempts=self.RANGED_GET_MAX_ATTEMPTS,
+            )
+            # Optional local cache of the downloaded objects
+            self._disk_cache: Optional[DiskCache] = None
             # Mark as initialized
             self._initialized = True
 
     def _verify_aws_connection(self):
         try:
-            self._s3 = boto3.client("s3")
+            self._client_pool.get_client()
             log.debug("AWS Connection Verified.")
         except Exception as excpt:
             raise Exception("Failed to verify AWS connection") from excpt
 
-    def s3_list_files(
+    def _get_client(self) -> botocore.client.BaseClient:
+        """
+        Get the S3 client of the calling thread. The clients are created on
+        the first request, not with the connector.
+
+        :return: The boto3 S3 client.
+        """
+        if self._client_pool.clients_created == 0:
+            self._verify_aws_connection()
+        return self._client_pool.get_client()
+
+    @property
+    def config(self) -> Boto3ConnectorConfig:
+        """
+        Get the config of the Boto3Connector object.
+        """
+        return self._client_pool.config
+
+    @property
+    def _s3(self) -> botocore.client.BaseClient:
+        """
+        Get the S3 client of the calling thread.
+        """
+        return self._get_client()
+
+    @property
+    def disk_cache(self) -> Optional[DiskCache]:
+        """
+        Get the disk cache of the Boto3Connector object, None if disabled.
+        """
+        return self._disk_cache
+
+    def enable_disk_cache(
+        self, directory: str, max_bytes: int = 10 * 1024**3
+    ) -> None:
+        """
+        Enable a read-through disk cache for `s3_read_file`. Every read of a
+        cached object is validated with a conditional GET (If-None-Match on
+        its ETag), and served from a memory map of the cached file if the
+        object did not change. The directory can be shared by several
+        processes.
+
+        :param directory: Directory of the cache, created if missing.
+        :param max_bytes: Maximum total size in bytes of the cached objects,
+        the least recently read ones are evicted beyond it.
+        """
+        self._disk_cache = DiskCache(directory, max_bytes=max_bytes)
+
+    def disable_disk_cache(self) -> None:
+        """
+        Disable the disk cache. The cached files are kept on disk.
+        """
+        self._disk_cache = None
+
+    def _download(
+        self, bucket: str, key: str
+    ) -> Tuple[Union[bytes, bytearray, mmap.mmap], Dict]:
+        """
+        Download an object, through the disk cache if it is enabled.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :return: A tuple of (content, response metadata with its "ETag").
+        """
+        disk_cache = self._disk_cache
+        if disk_cache is None:
+            return self._ranged_downloader.download(bucket, key)
+
+        etag = disk_cache.get_etag(bucket, key)
+        try:
+            obj, response = self._ranged_downloader.download(
+                bucket, key, if_none_match=etag
+            )
+        except botocore.exceptions.ClientError as excpt:
+            status = excpt.response.get("ResponseMetadata", {}).get(
+                "HTTPStatusCode"
+            )
+            if etag is None or status != 304:
+                raise
+            obj = disk_cache.read(bucket, key, etag)
+            if obj is not None:
+                log.debug(f"Disk cache hit for {bucket}/{key}")
+                return obj, {"ETag": etag}
+            # Evicted in the meantime by another process
+            obj, response = self._ranged_downloader.download(bucket, key)
+
+        disk_cache.write(bucket, key, response["ETag"], obj)
+        return obj, response
+
+    def _iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict, None, None]:
+        """
+        Iterate over every object under a prefix, following the continuation
+        tokens of `list_objects_v2` so listings are not cut at 1000 keys.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix to list.
+        :param start_after: Only list the keys after this one.
+        :return: A generator yielding the raw object summaries of each page.
+        """
+        paginator = self._s3.get_paginator("list_objects_v2")
+        pagination_args = {"Bucket": bucket, "Prefix": prefix}
+        if start_after:
+            pagination_args["StartAfter"] = start_after
+        for page in paginator.paginate(**pagination_args):
+            yield from page.get("Contents", [])
+
+    @staticmethod
+    def _to_file_info(obj: Dict) -> Dict[str, str]:
+        """
+        Convert a raw object summary into a file information dictionary.
+
+        :param obj: The object summary returned by `list_objects_v2`.
+        :return: A dictionary with "file_path", "last_modified", "size" and
+        "etag".
+        """
+        return {
+            "file_path": obj["Key"],
+            "last_modified": str(obj["LastModified"]),
+            "size": obj.get("Size"),
+            "etag": obj.get("ETag"),
+        }
+
+    def _iter_objects_concurrently(
+        self, bucket: str, prefixes: List[str]
+    ) -> Generator[Dict, None, None]:
+        """
+        Iterate over every object under several prefixes, splitting each
+        prefix into its sub-prefixes (using "/" as delimiter) and listing the
+        sub-prefixes concurrently.
+
+        Pages are handed over through a bounded queue, so the memory usage
+        does not depend on the size of the sub-prefixes.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefixes: The prefixes to list, they must not overlap.
+        :return: A generator yielding the raw object summaries, in no
+        particular order.
+        """
+        # The listing threads share the client of the calling thread
+        s3 = self._s3
+        paginator = s3.get_paginator("list_objects_v2")
+        sub_prefixes = prefixes
+        while True:
+            # Objects directly under the prefixes are listed with the split
+            split_prefixes, sub_prefixes = sub_prefixes, []
+            for prefix in split_prefixes:
+                for page in paginator.paginate(
+                    Bucket=bucket, Prefix=prefix, Delimiter="/"
+                ):
+                    yield from page.get("Contents", [])
+                    sub_prefixes.extend(
+                        common_prefix["Prefix"]
+                        for common_prefix in page.get("CommonPrefixes", [])
+                    )
+            # A single sub-prefix (such as the folder "data" listed as
+            # "data/") is split again, there is nothing to list concurrently
+            if len(sub_prefixes) != 1:
+                break
+
+        if len(sub_prefixes) <= 1 or self.LIST_MAX_WORKERS <= 1:
+            for sub_prefix in sub_prefixes:
+                yield from self._iter_objects(bucket, prefix=sub_prefix)
+            return
+
+        pages = queue.Queue(maxsize=2 * self.LIST_MAX_WORKERS)
+        stop_listing = threading.Event()
+
+        def put_page(page_objects) -> None:
+            # Wait for room in the queue unless the consumer went away
+            while not stop_listing.is_set():
+                try:
+                    pages.put(page_objects, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def list_sub_prefix(sub_prefix: str) -> None:
+            try:
+                sub_paginator = s3.get_paginator("list_objects_v2")
+                for page in sub_paginator.paginate(
+                    Bucket=bucket, Prefix=sub_prefix
+                ):
+                    if stop_listing.is_set():
+                        return
+                    put_page(page.get("Contents", []))
+                put_page(None)
+            except Exception as excpt:
+                put_page(excpt)
+
+        with ThreadPoolExecutor(max_workers=self.LIST_MAX_WORKERS) as pool:
+            for sub_prefix in sub_prefixes:
+                pool.submit(list_sub_prefix, sub_prefix)
+            try:
+                pending_sub_prefixes = len(sub_prefixes)
+                while pending_sub_prefixes:
+                    page_objects = pages.get()
+                    if page_objects is None:
+                        pending_sub_prefixes -= 1
+                    elif isinstance(page_objects, Exception):
+                        raise page_objects
+                    else:
+                        yield from page_objects
+            finally:
+                # Release the workers if the listing was not fully consumed
+                stop_listing.set()
+
+    def s3_iter_files(
         self,
         bucket: str,
         folder: str = "",
         keywords: Optional[List[str]] = None,
-    ) -> Dict[str, List[Dict[str, str]]]:
+        match_mode: str = "glob",
+    ) -> Generator[Tuple[str, Dict[str, str]], None, None]:
         if keywords is None:
             keywords = [""]
 
@@ -60,43 +348,46 @@ class Boto3Connector(AwsConnector):
                 " this may result in low performance."
             )
 
-        result = {}
+        # Compile the keywords once for the whole listing
+        keyword_matcher = KeywordMatcher(keywords, mode=match_mode)
 
-        # Get the list of objects with the specified prefix (folder)
-        response = self._s3.list_objects_v2(Bucket=bucket, Prefix=folder)
+        # Push the literal part of the keywords down into the listing
+        prefixes = keyword_matcher.listing_prefixes(folder)
+        for obj in self._iter_objects_concurrently(bucket, prefixes):
+            # Skip objects that represent folders
+            if obj["Key"].endswith("/"):
+                continue
 
-        # Check if the response contains objects
-        if "Contents" not in response:
-            return result
+            file_info = self._to_file_info(obj)
+            for keyword in keyword_matcher.match(file_info["file_path"]):
+                yield keyword, file_info
 
-        result = {}
+    def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict[str, str], None, None]:
+        for obj in self._iter_objects(
+            bucket, prefix=prefix, start_after=start_after
+        ):
+            yield self._to_file_info(obj)
 
-        # List all objects (files and folders) within the specified folder
-        all_objects = [obj_summary for obj_summary in response["Contents"]]
-
-        # Filter out objects that represent folders
-        file_objects = [
-            obj for obj in all_objects if not obj["Key"].endswith("/")
-        ]
-
-        # Create a dictionary using the file path and last_modified
-        all_files = [
-            {
-                "file_path": file["Key"],
-                "last_modified": str(file["LastModified"]),
-            }
-            for file in file_objects
-        ]
+    def s3_list_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: Optional[List[str]] = None,
+        match_mode: str = "glob",
+    ) -> Dict[str, List[Dict[str, str]]]:
+        if keywords is None:
+            keywords = [""]
 
-        # Iterate over each keyword and retrieve the filtered list of files
-        for keyword in keywords:
-            pattern = keyword.replace("*", ".*")
-            filtered_objects = [
-                file_path
-                for file_path in all_files
-                if re.search(pattern, file_path["file_path"])
-            ]
-            result[keyword] = filtered_objects
+        result = {keyword: [] for keyword in keywords}
+        for keyword, file_info in self.s3_iter_files(
+            bucket=bucket,
+            folder=folder,
+            keywords=keywords,
+            match_mode=match_mode,
+        ):
+            result[keyword].append(file_info)
 
         return result
 
@@ -107,11 +398,18 @@ class Boto3Connector(AwsConnector):
         code: str = "utf-8",
         raw: bool = False,
         bytes_: bool = False,
+        detect_encoding: bool = True,
     ) -> Tuple[Optional[bytes], Optional[str]]:
         try:
-            # Get the file object from S3
-            obj = self._s3.get_object(Bucket=bucket, Key=key)["Body"].read()
-            encoding = detect_encoding_from_bytes(obj)
+            # Get the file object from S3 (or the disk cache)
+            obj, response = self._download(bucket, key)
+            encoding = (
+                self._encoding_detector.detect(
+                    obj, cache_key=(bucket, key, response.get("ETag"))
+                )
+                if detect_encoding
+                else None
+            )
         except self._s3.exceptions.NoSuchKey:
             # Handle the case where the object is not found
             return None, None
@@ -125,7 +423,7 @@ class Boto3Connector(AwsConnector):
         elif bytes_:
             return io.BytesIO(obj), encoding
         else:
-            return obj.decode(code), encoding
+            return str(obj, code), encoding
 
     def s3_read_file_by_chunks(
         self,
@@ -135,23 +433,84 @@ class Boto3Connector(AwsConnector):
         chunk_size=65536,
         bytes_=False,
         raw=False,
+        detect_encoding=True,
     ):
         try:
-            obj = self._s3.get_object(Bucket=bucket, Key=key)["Body"]
+            response = self._s3.get_object(Bucket=bucket, Key=key)
+        except self._s3.exceptions.NoSuchKey:
+            return
+
+        body = response["Body"]
+        encoding = None
+        try:
             while True:
-                chunk = obj.read(chunk_size)
-                encoding = detect_encoding_from_bytes(chunk)
+                chunk = body.read(chunk_size)
                 if not chunk:
                     yield -1, -1
                     break
+                # The encoding is detected once, from the first chunk
+                if detect_encoding and encoding is None:
+                    encoding = self._encoding_detector.detect(
+                        chunk, cache_key=(bucket, key, response.get("ETag"))
+                    )
+                    detect_encoding = False
                 if raw:
                     yield chunk, encoding
-                if bytes_:
+                elif bytes_:
                     yield io.BytesIO(chunk), encoding
                 else:
                     yield chunk.decode(code), encoding
-        except self._s3.exceptions.NoSuchKey:
-            return None, None
+        finally:
+            # Stop the download if the stream is not fully consumed
+            body.close()
+
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        # Unknown versions of an object are not cached
+        cache_key = (bucket, key, etag, compression) if etag else None
+        return self._encoding_detector.detect(data, cache_key=cache_key)
+
+    def s3_head_file(self, bucket: str, key: str) -> Optional[Dict[str, str]]:
+        try:
+            response = self._s3.head_object(Bucket=bucket, Key=key)
+        except botocore.exceptions.ClientError as excpt:
+            if excpt.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+            ):
+                return None
+            raise
+        return {
+            "file_path": key,
+            "last_modified": str(response["LastModified"]),
+            "size": response["ContentLength"],
+            "etag": response.get("ETag"),
+        }
+
+    def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        if end <= start:
+            return b""
+        conditions = {"IfMatch": etag} if etag else {}
+        response = self._s3.get_object(
+            Bucket=bucket,
+            Key=key,
+            Range=f"bytes={start}-{end - 1}",
+            **conditions,
+        )
+        return response["Body"].read()
 
     def upload_dataframe_to_s3(
         self,
@@ -159,59 +518,124 @@ class Boto3Connector(AwsConnector):
         bucket: str,
         key: str,
         file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
     ) -> None:
-        if isinstance(data, pd.DataFrame):
-            # Create BytesIO buffer
-            data_buffer = io.BytesIO()
-            if file_format == "csv":
-                data.to_csv(data_buffer, index=False)
-                data_buffer.seek(0)
-                self.put_object_to_s3(
-                    bucket,
-                    key,
-                    data_buffer.getvalue(),
-                    content_type="text/csv",
-                )
-            elif file_format in ["excel", "xlsx", "xls"]:
-                data.to_excel(data_buffer, index=False, engine="xlsxwriter")
-                data_buffer.seek(0)
-                self.put_object_to_s3(
-                    bucket,
-                    key,
-                    data_buffer.getvalue(),
-                    content_type="application/vnd."
-                    "openxmlformats-officedocument."
-                    "spreadsheetml.sheet",
-                )
-            else:
-                raise ValueError(
-                    "Unsupported file format. "
-                    "Only 'csv' and 'excel' are supported."
-                )
-        elif isinstance(data, io.BytesIO):
-            if file_format == "csv":
-                self.put_object_to_s3(
-                    bucket, key, data.getvalue(), content_type="text/csv"
-                )
-            elif file_format in ["excel", "xlsx", "xls"]:
-                self.put_object_to_s3(
-                    bucket,
-                    key,
-                    data.getvalue(),
-                    content_type="application/"
-                    "vnd.openxmlformats-officedocument."
-                    "spreadsheetml.sheet",
-                )
-            else:
-                raise ValueError(
-                    "Unsupported file format. "
-                    "Only 'csv' and 'excel' are supported."
-                )
-        else:
-            raise ValueError(
-                "Unsupported data type. "
-                "Expected Pandas DataFrame or BytesIO buffer."
-            )
+        content_type = get_dataframe_content_type(data, file_format)
+        with self._open_upload_sink(
+            bucket, key, content_type, compression, compression_level
+        ) as sink:
+            if isinstance(data, pd.DataFrame) and file_format == "csv":
+                # Serialize the rows while the previous parts are uploaded
+                for csv_slice in iter_csv_slices(
+                    data, rows_per_slice=self.CSV_ROWS_PER_SLICE
+                ):
+                    sink.write(csv_slice)
+                return
+            if (
+                isinstance(data, pd.DataFrame)
+                and file_format in NDJSON_FILE_TYPES
+            ):
+                for ndjson_slice in iter_ndjson_slices(
+                    data, rows_per_slice=self.CSV_ROWS_PER_SLICE
+                ):
+                    sink.write(ndjson_slice)
+                return
+            if isinstance(data, pd.DataFrame) and file_format in (
+                ARROW_FILE_TYPES
+            ):
+                # Columnar files are written sequentially into the upload
+                write_arrow_file(data, file_format, sink)
+                return
+
+            if isinstance(data, pd.DataFrame):
+                # The workbook is written sequentially into the upload
+                write_df_to_excel(data, sink)
+                return
+            # Write the buffer by parts instead of copying it as a whole
+            with data.getbuffer() as data_view:
+                for start in range(
+                    0, len(data_view), self.MULTIPART_PART_SIZE
+                ):
+                    sink.write(
+                        data_view[start : start + self.MULTIPART_PART_SIZE]
+                    )
+
+    def upload_stream_to_s3(
+        self,
+        chunks: Iterable[bytes],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        with self._open_upload_sink(
+            bucket, key, content_type, compression, compression_level
+        ) as sink:
+            for chunk in chunks:
+                sink.write(chunk)
+
+    @contextmanager
+    def _open_upload_sink(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> Generator[io.IOBase, None, None]:
+        """
+        Open a stream uploading its content to S3, compressing it first when
+        a compression is given. Compressed data is streamed into the upload
+        as it is produced. The upload is completed when the context exits,
+        and aborted if it exits with an exception.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param content_type: The MIME type of the uncompressed data.
+        :param compression: Optional compression: "gzip", "bz2", "xz" or
+        "zstd".
+        :param compression_level: Optional compression level.
+        :return: A context manager yielding the writable stream.
+        """
+        compression = normalize_compression(compression)
+        if compression is None:
+            with self._open_upload(bucket, key, content_type) as upload:
+                yield upload
+            return
+        with (
+            self._open_upload(
+                bucket, key, COMPRESSION_CONTENT_TYPES[compression]
+            ) as upload,
+            open_compressed(upload, compression, compression_level) as sink,
+        ):
+            yield sink
+
+    def _open_upload(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+    ) -> MultipartUploadWriter:
+        """
+        Open a stream uploading its content to S3, through a multipart
+        upload when the content is larger than MULTIPART_THRESHOLD.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param content_type: The MIME type of the object being uploaded.
+        :return: The upload stream, to be used as a context manager.
+        """
+        return MultipartUploadWriter(
+            self._s3,
+            bucket,
+            key,
+            content_type=content_type,
+            threshold=self.MULTIPART_THRESHOLD,
+            part_size=self.MULTIPART_PART_SIZE,
+            max_in_flight=self.MULTIPART_MAX_IN_FLIGHT,
+        )
 
     def put_object_to_s3(
         self,
@@ -0,0 +1,235 @@
+from typing import Any, Dict, Optional
+import threading
+
+import boto3
+import botocore.client
+import botocore.config
+
+# Default size of the connection pool of each client. botocore defaults to
+# 10, which is less than the files read concurrently by `read_files` (8)
+# times the ranges downloaded concurrently for each file (8).
+DEFAULT_MAX_POOL_CONNECTIONS = 64
+# Default connect and read timeouts in seconds (the botocore defaults)
+DEFAULT_CONNECT_TIMEOUT = 60
+DEFAULT_READ_TIMEOUT = 60
+# Retry modes supported by botocore
+RETRY_MODES = ("legacy", "standard", "adaptive")
+
+
+class Boto3ConnectorConfig:
+    def __init__(
+        self,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retry_mode: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        tcp_keepalive: bool = False,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        client_per_thread: bool = False,
+        client_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a Boto3ConnectorConfig object.
+
+        :param max_pool_connections: Maximum number of connections kept open
+        by each S3 client.
+        :param connect_timeout: Timeout in seconds to open a connection.
+        :param read_timeout: Timeout in seconds to read from a connection.
+        :param retry_mode: Optional retry mode ("legacy", "standard" or
+        "adaptive"). If None, the mode of the AWS configuration is used.
+        :param max_attempts: Optional maximum number of attempts of each
+        request, including the first one.
+        :param tcp_keepalive: If True, TCP keepalive is enabled on the
+        connections.
+        :param endpoint_url: Optional URL of the S3 endpoint (an S3
+        compatible storage or a local mock, for example).
+        :param region_name: Optional AWS region of the client.
+        :param client_per_thread: If True, each thread gets its own client
+        (and connection pool) instead of sharing a single one.
+        :param client_kwargs: Optional extra keyword arguments for the
+        creation of the clients (aws_access_key_id, verify, ...).
+        """
+        if max_pool_connections < 1:
+            raise ValueError("max_pool_connections must be positive.")
+        if retry_mode is not None and retry_mode not in RETRY_MODES:
+            raise ValueError(
+                f"Unsupported retry mode {retry_mode!r}. "
+                f"Only {', '.join(RETRY_MODES)} are supported."
+            )
+        if max_attempts is not None and max_attempts < 1:
+            raise ValueError("max_attempts must be positive.")
+        self._max_pool_connections = max_pool_connections
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._retry_mode = retry_mode
+        self._max_attempts = max_attempts
+        self._tcp_keepalive = tcp_keepalive
+        self._endpoint_url = endpoint_url
+        self._region_name = region_name
+        self._client_per_thread = client_per_thread
+        self._client_kwargs = client_kwargs if client_kwargs else {}
+
+    @property
+    def max_pool_connections(self) -> int:
+        """
+        Get the max pool connections of the Boto3ConnectorConfig object.
+        """
+        return self._max_pool_connections
+
+    @property
+    def connect_timeout(self) -> float:
+        """
+        Get the connect timeout of the Boto3ConnectorConfig object.
+        """
+        return self._connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        """
+        Get the read timeout of the Boto3ConnectorConfig object.
+        """
+        return self._read_timeout
+
+    @property
+    def retry_mode(self) -> Optional[str]:
+        """
+        Get the retry mode of the Boto3ConnectorConfig object.
+        """
+        return self._retry_mode
+
+    @property
+    def max_attempts(self) -> Optional[int]:
+        """
+        Get the max attempts of the Boto3ConnectorConfig object.
+        """
+        return self._max_attempts
+
+    @property
+    def tcp_keepalive(self) -> bool:
+        """
+        Get the tcp keepalive of the Boto3ConnectorConfig object.
+        """
+        return self._tcp_keepalive
+
+    @property
+    def endpoint_url(self) -> Optional[str]:
+        """
+        Get the endpoint url of the Boto3ConnectorConfig object.
+        """
+        return self._endpoint_url
+
+    @property
+    def region_name(self) -> Optional[str]:
+        """
+        Get the region name of the Boto3ConnectorConfig object.
+        """
+        return self._region_name
+
+    @property
+    def client_per_thread(self) -> bool:
+        """
+        Get the client per thread of the Boto3ConnectorConfig object.
+        """
+        return self._client_per_thread
+
+    def to_botocore_config(self) -> botocore.config.Config:
+        """
+        Build the botocore configuration of the clients.
+
+        :return: The botocore Config object.
+        """
+        retries = {}
+        if self._retry_mode is not None:
+            retries["mode"] = self._retry_mode
+        if self._max_attempts is not None:
+            retries["total_max_attempts"] = self._max_attempts
+        return botocore.config.Config(
+            max_pool_connections=self._max_pool_connections,
+            connect_timeout=self._connect_timeout,
+            read_timeout=self._read_timeout,
+            retries=retries if retries else None,
+            tcp_keepalive=self._tcp_keepalive,
+        )
+
+    def get_client_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the keyword arguments of the creation of the clients.
+
+        :return: The keyword arguments of `Session.client`.
+        """
+        client_kwargs = dict(self._client_kwargs)
+        if self._endpoint_url is not None:
+            client_kwargs["endpoint_url"] = self._endpoint_url
+        if self._region_name is not None:
+            client_kwargs["region_name"] = self._region_name
+        client_kwargs["config"] = self.to_botocore_config()
+        return client_kwargs
+
+
+class Boto3ClientPool:
+    def __init__(self, config: Boto3ConnectorConfig):
+        """
+        Initialize a Boto3ClientPool object.
+
+        The pool hands out the S3 clients of a connector: a single client
+        shared by every thread (boto3 clients are thread-safe), or one client
+        per thread with `client_per_thread`, so threads do not compete for
+        the connections of a single pool. The clients are created from a
+        dedicated session, one at a time, since boto3 sessions are not
+        thread-safe.
+
+        :param config: The configuration of the clients.
+        """
+        self._config = config
+        self._client_kwargs = config.get_client_kwargs()
+        self._session = boto3.session.Session()
+        self._lock = threading.Lock()
+        self._client: Optional[botocore.client.BaseClient] = None
+        self._thread_clients = threading.local()
+        self._clients_created = 0
+
+    @property
+    def config(self) -> Boto3ConnectorConfig:
+        """
+        Get the config of the Boto3ClientPool object.
+        """
+        return self._config
+
+    @property
+    def clients_created(self) -> int:
+        """
+        Get the number of clients created by the Boto3ClientPool object.
+        """
+        return self._clients_created
+
+    def get_client(self) -> botocore.client.BaseClient:
+        """
+        Get the S3 client of the calling thread, creating it on first use.
+
+        :return: The boto3 S3 client.
+        """
+        if not self._config.client_per_thread:
+            if self._client is None:
+                with self._lock:
+                    if self._client is None:
+                        self._client = self._create_client()
+            return self._client
+
+        client = getattr(self._thread_clients, "client", None)
+        if client is None:
+            with self._lock:
+                client = self._create_client()
+            self._thread_clients.client = client
+        return client
+
+    def _create_client(self) -> botocore.client.BaseClient:
+        """
+        Create a S3 client. The lock of the pool must be held.
+
+        :return: The new boto3 S3 client.
+        """
+        client = self._session.client("s3", **self._client_kwargs)
+        self._clients_created += 1
+        return client
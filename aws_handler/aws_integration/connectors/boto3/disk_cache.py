@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import time
+
+from aws_handler.util.logger import log
+
+# Name of the SQLite index inside the cache directory
+DISK_CACHE_INDEX_NAME = "index.sqlite"
+
+# Schema of the cache index
+DISK_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (bucket, key)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_bytes: int = 10 * 1024**3):
+        """
+        Initialize a DiskCache object.
+
+        A local cache of S3 objects keyed by bucket, key and ETag. Every
+        object is stored in its own file, written to a temporary file and
+        moved into place atomically, and the entries are tracked in a SQLite
+        index (in WAL mode), so several processes can share the same
+        directory. Once the cached objects exceed `max_bytes`, the least
+        recently read ones are evicted. Cached objects are returned as
+        read-only memory maps.
+
+        :param directory: Directory of the cache, created if missing.
+        :param max_bytes: Maximum total size in bytes of the cached objects.
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(DISK_CACHE_SCHEMA)
+
+    @property
+    def directory(self) -> str:
+        """
+        Get the directory of the DiskCache object.
+        """
+        return self._directory
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        Get the max_bytes of the DiskCache object.
+        """
+        return self._max_bytes
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the cache index, committing on success.
+
+        :return: A context manager yielding the connection.
+        """
+        connection = sqlite3.connect(
+            os.path.join(self._directory, DISK_CACHE_INDEX_NAME), timeout=30
+        )
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _file_name(bucket: str, key: str, etag: str) -> str:
+        """
+        Get the name of the file storing a version of an object.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :param etag: The ETag of the object.
+        :return: The file name.
+        """
+        return hashlib.sha256(
+            "\0".join((bucket, key, etag)).encode("utf-8")
+        ).hexdigest()
+
+    def get_etag(self, bucket: str, key: str) -> Optional[str]:
+        """
+        Get the ETag of the cached version of an object.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :return: The ETag, None if the object is not cached.
+        """
+        with self._connect() as connection:
+            entry = connection.execute(
+                "SELECT etag FROM entries WHERE bucket = ? AND key = ?",
+                (bucket, key),
+            ).fetchone()
+        return entry[0] if entry else None
+
+    def read(
+        self, bucket: str, key: str, etag: str
+    ) -> Optional[Union[mmap.mmap, bytes]]:
+        """
+        Read a cached object and mark it as recently used.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :param etag: The expected ETag of the object.
+        :return: A read-only memory map of the object (an empty bytes object
+        for empty objects), or None if this version of the object is not
+        cached (anymore).
+        """
+        file_path = os.path.join(
+            self._directory, self._file_name(bucket, key, etag)
+        )
+        try:
+            with open(file_path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                content = (
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if size
+                    else b""
+                )
+        except FileNotFoundError:
+            # Evicted by another process
+            return None
+
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE entries SET last_access = ? "
+                "WHERE bucket = ? AND key = ? AND etag = ?",
+                (time.time(), bucket, key, etag),
+            )
+        return content
+
+    def write(self, bucket: str, key: str, etag: str, content: bytes) -> None:
+        """
+        Store a version of an object, replacing the previous one, and evict
+        the least recently used objects if the cache is full.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :param etag: The ETag of the object.
+        :param content: The content of the object.
+        """
+        size = len(content)
+        if size > self._max_bytes:
+            return
+
+        file_name = self._file_name(bucket, key, etag)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=self._directory, prefix=".tmp-"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(content)
+            os.replace(temp_path, os.path.join(self._directory, file_name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        with self._connect() as connection:
+            previous = connection.execute(
+                "SELECT file_name FROM entries WHERE bucket = ? AND key = ?",
+                (bucket, key),
+            ).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(bucket, key, etag, file_name, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (bucket, key, etag, file_name, size, time.time()),
+            )
+            stale_files = [previous[0]] if previous else []
+            if stale_files == [file_name]:
+                stale_files = []
+            stale_files.extend(self._evict(connection))
+
+        for stale_file in stale_files:
+            self._remove_file(stale_file)
+
+    def _evict(self, connection: sqlite3.Connection) -> List[str]:
+        """
+        Drop the least recently used entries until the cache fits in
+        max_bytes.
+
+        :param connection: An open connection to the cache index.
+        :return: The names of the files of the dropped entries.
+        """
+        (total_size,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        evicted_files = []
+        if total_size <= self._max_bytes:
+            return evicted_files
+
+        for bucket, key, file_name, size in connection.execute(
+            "SELECT bucket, key, file_name, size FROM entries "
+            "ORDER BY last_access"
+        ).fetchall():
+            if total_size <= self._max_bytes:
+                break
+            connection.execute(
+                "DELETE FROM entries WHERE bucket = ? AND key = ?",
+                (bucket, key),
+            )
+            evicted_files.append(file_name)
+            total_size -= size
+        log.debug(f"Evicted {len(evicted_files)} objects from the disk cache")
+        return evicted_files
+
+    def _remove_file(self, file_name: str) -> None:
+        """
+        Remove a cached file. Open memory maps of the file stay valid.
+
+        :param file_name: The name of the file.
+        """
+        try:
+            os.unlink(os.path.join(self._directory, file_name))
+        except FileNotFoundError:
+            pass
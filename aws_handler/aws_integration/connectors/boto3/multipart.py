@@ -0,0 +1,183 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+import io
+import threading
+
+import botocore.client
+
+from aws_handler.util.logger import log
+
+# Minimum size of a multipart upload part accepted by S3 (except the last)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class MultipartUploadWriter(io.RawIOBase):
+    def __init__(
+        self,
+        s3: botocore.client.BaseClient,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        threshold: int = 64 * 1024 * 1024,
+        part_size: int = 16 * 1024 * 1024,
+        max_in_flight: int = 4,
+    ):
+        """
+        Initialize a MultipartUploadWriter object.
+
+        A write-only stream uploading its content to S3. Data is buffered
+        until the threshold is reached, then a multipart upload is started
+        and parts are uploaded concurrently while the producer keeps
+        writing. At most `max_in_flight` parts are buffered or uploading at
+        the same time, so the memory usage is bounded. Content smaller than
+        the threshold is sent with a single `put_object`.
+
+        The upload is completed by `close`. If the stream is used as a
+        context manager and an exception is raised, the multipart upload is
+        aborted instead.
+
+        :param s3: The boto3 S3 client.
+        :param bucket: The name of the S3 bucket.
+        :param key: The key (path) to upload the data to in S3.
+        :param content_type: The MIME type of the object being uploaded.
+        :param threshold: Size in bytes above which a multipart upload is
+        used.
+        :param part_size: Size in bytes of each uploaded part.
+        :param max_in_flight: Maximum number of parts uploaded at the same
+        time.
+        """
+        super().__init__()
+        self._s3 = s3
+        self._bucket = bucket
+        self._key = key
+        self._content_type = content_type
+        self._part_size = max(part_size, MIN_PART_SIZE)
+        self._threshold = max(threshold, self._part_size)
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id: Optional[str] = None
+        self._parts: List[Future] = []
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._max_in_flight = max_in_flight
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed MultipartUploadWriter.")
+        size = len(memoryview(data).cast("B"))
+        self._buffer += data
+        self._position += size
+
+        if self._upload_id is None and len(self._buffer) >= self._threshold:
+            self._start_upload()
+        if self._upload_id is not None:
+            while len(self._buffer) >= self._part_size:
+                self._upload_part(self._buffer[: self._part_size])
+                del self._buffer[: self._part_size]
+        return size
+
+    def _start_upload(self):
+        """
+        Start the multipart upload.
+        """
+        response = self._s3.create_multipart_upload(
+            Bucket=self._bucket, Key=self._key, ContentType=self._content_type
+        )
+        self._upload_id = response["UploadId"]
+        self._pool = ThreadPoolExecutor(max_workers=self._max_in_flight)
+        log.debug(f"Started multipart upload of {self._bucket}/{self._key}")
+
+    def _upload_part(self, part: bytearray):
+        """
+        Upload a part in the background, waiting if too many parts are
+        already in flight.
+
+        :param part: The content of the part.
+        """
+        # Surface the failure of a previous part as soon as possible
+        for future in self._parts:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        self._in_flight.acquire()
+        part_number = len(self._parts) + 1
+
+        def upload() -> Dict:
+            try:
+                response = self._s3.upload_part(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    PartNumber=part_number,
+                    Body=part,
+                )
+                return {"ETag": response["ETag"], "PartNumber": part_number}
+            finally:
+                self._in_flight.release()
+
+        self._parts.append(self._pool.submit(upload))
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._s3.put_object(
+                    Body=self._buffer,
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    ContentType=self._content_type,
+                )
+            else:
+                if self._buffer:
+                    self._upload_part(self._buffer)
+                parts = [future.result() for future in self._parts]
+                self._s3.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+                self._pool.shutdown()
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            super().close()
+
+    def abort(self):
+        """
+        Abort the multipart upload, discarding the uploaded parts.
+        """
+        if self._upload_id is not None:
+            self._pool.shutdown(cancel_futures=True)
+            try:
+                self._s3.abort_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                )
+                log.debug(
+                    f"Aborted multipart upload of {self._bucket}/{self._key}"
+                )
+            except Exception as excpt:
+                log.error(f"Failed to abort multipart upload: {excpt}")
+            self._upload_id = None
+        self._buffer = bytearray()
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
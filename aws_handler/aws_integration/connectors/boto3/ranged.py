@@ -0,0 +1,155 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import botocore.client
+import botocore.exceptions
+
+from aws_handler.util.logger import log
+
+
+def read_into(body, buffer_view: memoryview) -> None:
+    """
+    Read a response body into a memoryview until it is full.
+
+    :param body: The StreamingBody of a `get_object` response.
+    :param buffer_view: The memoryview to fill, sized as the body.
+    """
+    offset = 0
+    while offset < len(buffer_view):
+        read_size = body.readinto(buffer_view[offset:])
+        if not read_size:
+            raise IOError(
+                f"Incomplete read: {offset} out of {len(buffer_view)} bytes."
+            )
+        offset += read_size
+
+
+class RangedDownloader:
+    def __init__(
+        self,
+        get_client: Callable[[], botocore.client.BaseClient],
+        part_size: int = 8 * 1024 * 1024,
+        max_workers: int = 8,
+        max_attempts: int = 3,
+    ):
+        """
+        Initialize a RangedDownloader object.
+
+        Downloads objects with concurrent byte-range GETs. The first range
+        request also returns the size of the object (in its Content-Range),
+        so objects fitting in one part are downloaded with a single request.
+        Larger objects are read into one preallocated bytearray, each range
+        being read straight into its memoryview slice. Every range is
+        requested with If-Match on the ETag of the first response, so all
+        the ranges belong to the same version of the object, and a failed
+        range is retried on its own.
+
+        :param get_client: Function returning the boto3 S3 client of the
+        calling thread, shared by the range requests of a download.
+        :param part_size: Size in bytes of each range, objects larger than
+        this are downloaded concurrently.
+        :param max_workers: Maximum number of ranges downloaded at the same
+        time.
+        :param max_attempts: Maximum number of attempts of each range.
+        """
+        self._get_client = get_client
+        self._part_size = part_size
+        self._max_workers = max_workers
+        self._max_attempts = max_attempts
+
+    @property
+    def part_size(self) -> int:
+        """
+        Get the part size of the RangedDownloader object.
+        """
+        return self._part_size
+
+    def download(
+        self, bucket: str, key: str, if_none_match: Optional[str] = None
+    ) -> Tuple[Union[bytes, bytearray], Dict]:
+        """
+        Download an object.
+
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :param if_none_match: Optional ETag, if the object still has it S3
+        answers with a 304 (Not Modified) ClientError instead.
+        :return: A tuple of (content, response of the first request). The
+        content is a bytearray when the object was downloaded in ranges.
+        """
+        s3 = self._get_client()
+        conditions = {"IfNoneMatch": if_none_match} if if_none_match else {}
+        try:
+            response = s3.get_object(
+                Bucket=bucket,
+                Key=key,
+                Range=f"bytes=0-{self._part_size - 1}",
+                **conditions,
+            )
+        except botocore.exceptions.ClientError as excpt:
+            # An empty object has no satisfiable range
+            if excpt.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            response = s3.get_object(Bucket=bucket, Key=key, **conditions)
+
+        content_range = response.get("ContentRange")
+        if not content_range:
+            # The whole object was returned
+            return response["Body"].read(), response
+        size = int(content_range.rpartition("/")[2])
+        if size <= self._part_size:
+            return response["Body"].read(), response
+
+        content = bytearray(size)
+        buffer_view = memoryview(content)
+        etag = response["ETag"]
+        ranges = [
+            (start, min(start + self._part_size, size))
+            for start in range(0, size, self._part_size)
+        ]
+        log.debug(f"Downloading {bucket}/{key} in {len(ranges)} ranges")
+
+        def download_range(start: int, end: int, body=None) -> None:
+            for attempt in range(1, self._max_attempts + 1):
+                try:
+                    if body is None:
+                        body = s3.get_object(
+                            Bucket=bucket,
+                            Key=key,
+                            Range=f"bytes={start}-{end - 1}",
+                            IfMatch=etag,
+                        )["Body"]
+                    with body:
+                        read_into(body, buffer_view[start:end])
+                    return
+                except botocore.exceptions.ClientError as excpt:
+                    # The object changed (412) or is gone, do not retry
+                    status = excpt.response.get("ResponseMetadata", {}).get(
+                        "HTTPStatusCode"
+                    )
+                    if status in (404, 412) or attempt == self._max_attempts:
+                        raise
+                except Exception:
+                    if attempt == self._max_attempts:
+                        raise
+                log.debug(
+                    f"Retrying range {start}-{end - 1} of {bucket}/{key}"
+                )
+                body = None
+
+        pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = [
+                pool.submit(download_range, *ranges[0], response["Body"])
+            ]
+            futures.extend(
+                pool.submit(download_range, start, end)
+                for start, end in ranges[1:]
+            )
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return content, response
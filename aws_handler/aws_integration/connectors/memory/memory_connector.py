@@ -0,0 +1,459 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+import bisect
+import datetime
+import hashlib
+import io
+import json
+import threading
+import time
+
+import pandas as pd
+
+from aws_handler.aws_integration.connectors.aws_connector import AwsConnector
+from aws_handler.aws_integration.connectors.memory.network import (
+    NetworkSimulator,
+    is_retryable,
+    make_client_error,
+)
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    compress_bytes,
+    normalize_compression,
+)
+from aws_handler.util.encoding import EncodingDetector
+from aws_handler.util.keyword_matcher import KeywordMatcher
+from aws_handler.util.logger import log
+from aws_handler.util.pandas import dataframe_to_bytes
+
+# Content type S3 gives to objects uploaded without one
+DEFAULT_CONTENT_TYPE = "binary/octet-stream"
+
+
+class InMemoryConnector(AwsConnector):
+    # Maximum number of objects of each listing page, as S3
+    LIST_PAGE_SIZE = 1000
+    # Number of bytes at the start of an object used to detect its encoding
+    ENCODING_SAMPLE_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        network: Optional[NetworkSimulator] = None,
+        max_attempts: int = 1,
+        retry_backoff: float = 0.05,
+    ):
+        """
+        Initialize an InMemoryConnector object.
+
+        The connector keeps the objects of every bucket in memory, with their
+        ETag (MD5 of the content), size, last modification time and content
+        type, and answers like S3: listings are paginated in key order,
+        reads support byte ranges and ETag conditions, and missing objects
+        raise the same errors. Buckets are created by the first write.
+        Every request goes through a NetworkSimulator, so the behavior of
+        parallel reads, retries and caches can be measured under latency,
+        bandwidth limits, throttling and failures without AWS.
+
+        :param network: Optional simulated network, none by default (every
+        request is immediate).
+        :param max_attempts: Maximum number of attempts of each request,
+        throttled and failed requests are retried as boto3 does.
+        :param retry_backoff: Base time in seconds of the exponential backoff
+        between two attempts.
+        """
+        self._network = network if network else NetworkSimulator()
+        self._max_attempts = max_attempts
+        self._retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        # Objects per bucket, and their keys in ascending order
+        self._buckets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._sorted_keys: Dict[str, List[str]] = {}
+        self._encoding_detector = EncodingDetector(
+            sample_size=self.ENCODING_SAMPLE_SIZE
+        )
+
+    @property
+    def network(self) -> NetworkSimulator:
+        """
+        Get the network of the InMemoryConnector object.
+        """
+        return self._network
+
+    def _verify_aws_connection(self):
+        log.debug("In-memory connection verified.")
+
+    def _request(self, operation: str, send: Callable[[], Any]) -> Any:
+        """
+        Send a request through the simulated network, retrying throttled and
+        failed requests.
+
+        :param operation: The name of the S3 operation ("GetObject", ...).
+        :param send: Function answering the request, called inside the
+        simulated request.
+        :return: The answer of the request.
+        """
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                with self._network.request(operation):
+                    return send()
+            except Exception as excpt:
+                if not is_retryable(excpt) or attempt == self._max_attempts:
+                    raise
+            self._network.count("retries")
+            time.sleep(self._retry_backoff * 2 ** (attempt - 1))
+
+    def _get_object(self, bucket: str, key: str, operation: str) -> Dict:
+        """
+        Get a stored object.
+
+        :param bucket: The name of the bucket.
+        :param key: The key of the object.
+        :param operation: The name of the S3 operation, for the error.
+        :return: The stored object.
+        :raises: botocore.exceptions.ClientError (NoSuchKey) if the object
+        does not exist.
+        """
+        with self._lock:
+            obj = self._buckets.get(bucket, {}).get(key)
+        if obj is None:
+            raise make_client_error(404, "NoSuchKey", operation)
+        return obj
+
+    @staticmethod
+    def _to_file_info(obj: Dict) -> Dict[str, str]:
+        """
+        Convert a stored object into a file information dictionary.
+
+        :param obj: The stored object.
+        :return: A dictionary with "file_path", "last_modified", "size" and
+        "etag".
+        """
+        return {
+            "file_path": obj["key"],
+            "last_modified": str(obj["last_modified"]),
+            "size": len(obj["body"]),
+            "etag": obj["etag"],
+        }
+
+    def _store(
+        self,
+        bucket: str,
+        key: str,
+        body: Union[bytes, str],
+        content_type: str,
+    ) -> None:
+        """
+        Upload an object through the simulated network.
+
+        :param bucket: The name of the bucket.
+        :param key: The key of the object.
+        :param body: The content of the object, a text is stored UTF-8
+        encoded (as boto3 does).
+        :param content_type: The MIME type of the object.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        def send() -> None:
+            self._network.transfer(len(body), upload=True)
+            obj = {
+                "key": key,
+                "body": bytes(body),
+                "etag": f'"{hashlib.md5(body).hexdigest()}"',
+                "last_modified": datetime.datetime.now(
+                    datetime.timezone.utc
+                ).replace(microsecond=0),
+                "content_type": content_type,
+            }
+            with self._lock:
+                objects = self._buckets.setdefault(bucket, {})
+                if key not in objects:
+                    bisect.insort(
+                        self._sorted_keys.setdefault(bucket, []), key
+                    )
+                objects[key] = obj
+
+        self._request("PutObject", send)
+
+    def _list_page(
+        self, bucket: str, prefix: str, start_after: str
+    ) -> List[Dict]:
+        """
+        Get a listing page: the next objects under a prefix after a key.
+
+        :param bucket: The name of the bucket.
+        :param prefix: The prefix of the objects.
+        :param start_after: The key after which the page starts.
+        :return: Up to LIST_PAGE_SIZE stored objects, in key order.
+        """
+        with self._lock:
+            keys = self._sorted_keys.get(bucket, [])
+            objects = self._buckets.get(bucket, {})
+            if start_after >= prefix:
+                start = bisect.bisect_right(keys, start_after)
+            else:
+                start = bisect.bisect_left(keys, prefix)
+            page = []
+            for key in keys[start : start + self.LIST_PAGE_SIZE]:
+                if not key.startswith(prefix):
+                    break
+                page.append(objects[key])
+            return page
+
+    def _iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict, None, None]:
+        """
+        Iterate over every object under a prefix, one listing request per
+        page.
+
+        :param bucket: The name of the bucket.
+        :param prefix: The prefix to list.
+        :param start_after: Only list the keys after this one.
+        :return: A generator yielding the stored objects in key order.
+        """
+        while True:
+            page = self._request(
+                "ListObjectsV2",
+                lambda: self._list_page(bucket, prefix, start_after),
+            )
+            yield from page
+            if len(page) < self.LIST_PAGE_SIZE:
+                return
+            start_after = page[-1]["key"]
+
+    def s3_iter_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: Optional[List[str]] = None,
+        match_mode: str = "glob",
+    ) -> Generator[Tuple[str, Dict[str, str]], None, None]:
+        if keywords is None:
+            keywords = [""]
+
+        keyword_matcher = KeywordMatcher(keywords, mode=match_mode)
+        for prefix in keyword_matcher.listing_prefixes(folder):
+            for obj in self._iter_objects(bucket, prefix=prefix):
+                # Skip objects that represent folders
+                if obj["key"].endswith("/"):
+                    continue
+                file_info = self._to_file_info(obj)
+                for keyword in keyword_matcher.match(file_info["file_path"]):
+                    yield keyword, file_info
+
+    def s3_iter_objects(
+        self, bucket: str, prefix: str = "", start_after: str = ""
+    ) -> Generator[Dict[str, str], None, None]:
+        for obj in self._iter_objects(bucket, prefix, start_after):
+            yield self._to_file_info(obj)
+
+    def s3_list_files(
+        self,
+        bucket: str,
+        folder: str = "",
+        keywords: Optional[List[str]] = None,
+        match_mode: str = "glob",
+    ) -> Dict[str, List[Dict[str, str]]]:
+        if keywords is None:
+            keywords = [""]
+
+        result = {keyword: [] for keyword in keywords}
+        for keyword, file_info in self.s3_iter_files(
+            bucket, folder, keywords, match_mode
+        ):
+            result[keyword].append(file_info)
+        return result
+
+    def _read_object(self, bucket: str, key: str) -> Dict:
+        """
+        Download a whole object through the simulated network.
+
+        :param bucket: The name of the bucket.
+        :param key: The key of the object.
+        :return: The stored object.
+        """
+
+        def send() -> Dict:
+            obj = self._get_object(bucket, key, "GetObject")
+            self._network.transfer(len(obj["body"]))
+            return obj
+
+        return self._request("GetObject", send)
+
+    def s3_read_file(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        raw: bool = False,
+        bytes_: bool = False,
+        detect_encoding: bool = True,
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        try:
+            obj = self._read_object(bucket, key)
+            content = obj["body"]
+            encoding = (
+                self._encoding_detector.detect(
+                    content, cache_key=(bucket, key, obj["etag"])
+                )
+                if detect_encoding
+                else None
+            )
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") == (
+                "NoSuchKey"
+            ):
+                return None, None
+            return None, f"Error: {str(e)}"
+
+        if raw:
+            return content, encoding
+        elif bytes_:
+            return io.BytesIO(content), encoding
+        else:
+            return str(content, code), encoding
+
+    def s3_read_file_by_chunks(
+        self,
+        bucket: str,
+        key: str,
+        code: str = "utf-8",
+        chunk_size: int = 65536,
+        bytes_: bool = False,
+        raw: bool = False,
+        detect_encoding: bool = True,
+    ):
+        try:
+            # The response starts after the latency, the body is then read
+            # chunk by chunk at the bandwidth
+            obj = self._request(
+                "GetObject",
+                lambda: self._get_object(bucket, key, "GetObject"),
+            )
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") == (
+                "NoSuchKey"
+            ):
+                return
+            raise
+
+        content = obj["body"]
+        encoding = None
+        for start in range(0, len(content), chunk_size):
+            chunk = content[start : start + chunk_size]
+            self._network.transfer(len(chunk))
+            # The encoding is detected once, from the first chunk
+            if detect_encoding and encoding is None:
+                encoding = self._encoding_detector.detect(
+                    chunk, cache_key=(bucket, key, obj["etag"])
+                )
+                detect_encoding = False
+            if raw:
+                yield chunk, encoding
+            elif bytes_:
+                yield io.BytesIO(chunk), encoding
+            else:
+                yield chunk.decode(code), encoding
+        yield -1, -1
+
+    def s3_detect_encoding(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> Optional[str]:
+        # Unknown versions of an object are not cached
+        cache_key = (bucket, key, etag, compression) if etag else None
+        return self._encoding_detector.detect(data, cache_key=cache_key)
+
+    def s3_head_file(self, bucket: str, key: str) -> Optional[Dict[str, str]]:
+        def send() -> Optional[Dict]:
+            with self._lock:
+                return self._buckets.get(bucket, {}).get(key)
+
+        obj = self._request("HeadObject", send)
+        return self._to_file_info(obj) if obj is not None else None
+
+    def s3_read_range(
+        self,
+        bucket: str,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None,
+    ) -> bytes:
+        if end <= start:
+            return b""
+
+        def send() -> bytes:
+            obj = self._get_object(bucket, key, "GetObject")
+            if etag and etag != obj["etag"]:
+                raise make_client_error(412, "PreconditionFailed", "GetObject")
+            if start >= len(obj["body"]):
+                raise make_client_error(416, "InvalidRange", "GetObject")
+            content = obj["body"][start:end]
+            self._network.transfer(len(content))
+            return content
+
+        return self._request("GetObject", send)
+
+    def upload_dataframe_to_s3(
+        self,
+        data: Union[pd.DataFrame, io.BytesIO],
+        bucket: str,
+        key: str,
+        file_format: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        body, content_type = dataframe_to_bytes(data, file_format)
+        compression = normalize_compression(compression)
+        if compression is not None:
+            body = compress_bytes(body, compression, compression_level)
+            content_type = COMPRESSION_CONTENT_TYPES[compression]
+        self._store(bucket, key, body, content_type)
+
+    def upload_stream_to_s3(
+        self,
+        chunks: Iterable[bytes],
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        body = b"".join(chunks)
+        compression = normalize_compression(compression)
+        if compression is not None:
+            body = compress_bytes(body, compression, compression_level)
+            content_type = COMPRESSION_CONTENT_TYPES[compression]
+        self._store(bucket, key, body, content_type)
+
+    def put_object_to_s3(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        self._store(bucket, key, data, content_type)
+
+    def put_dict_to_s3(self, bucket: str, key: str, dict_obj: Dict) -> None:
+        self._store(
+            bucket,
+            key,
+            json.dumps(dict_obj).encode("utf-8"),
+            DEFAULT_CONTENT_TYPE,
+        )
@@ -0,0 +1,240 @@
+from contextlib import contextmanager
+from typing import Dict, Generator, List, Optional
+import random
+import threading
+import time
+
+import botocore.exceptions
+
+# HTTP status and error code of the simulated errors
+THROTTLING_ERROR = (503, "SlowDown")
+INJECTED_ERROR = (500, "InternalError")
+
+# Status codes of the errors worth retrying
+RETRYABLE_STATUS_CODES = (500, 503)
+
+
+def make_client_error(
+    status: int, code: str, operation: str, message: str = ""
+) -> botocore.exceptions.ClientError:
+    """
+    Build the ClientError raised by boto3 for an error response of S3.
+
+    :param status: The HTTP status code.
+    :param code: The S3 error code ("NoSuchKey", "SlowDown", ...).
+    :param operation: The name of the S3 operation ("GetObject", ...).
+    :param message: Optional message of the error.
+    :return: The ClientError.
+    """
+    return botocore.exceptions.ClientError(
+        {
+            "Error": {"Code": code, "Message": message or code},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        operation,
+    )
+
+
+def is_retryable(excpt: Exception) -> bool:
+    """
+    Check whether an error is transient (throttling or server error).
+
+    :param excpt: The raised exception.
+    :return: True if the request can be retried.
+    """
+    if not isinstance(excpt, botocore.exceptions.ClientError):
+        return False
+    status = excpt.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status in RETRYABLE_STATUS_CODES
+
+
+class NetworkSimulator:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        bandwidth: Optional[float] = None,
+        total_bandwidth: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        max_requests_per_second: Optional[float] = None,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize a NetworkSimulator object.
+
+        Simulates the network between a client and S3 by sleeping: every
+        request waits for its latency, and every transfer for the time its
+        bytes take at the bandwidth of its connection and of the shared
+        link. Requests above the request rate are throttled, and requests
+        can fail at random or on demand. The simulated errors are the
+        ClientErrors boto3 raises for the same S3 responses.
+
+        :param latency: Time in seconds before the first byte of each
+        response.
+        :param latency_jitter: Maximum random time in seconds added to the
+        latency of each request.
+        :param bandwidth: Optional bandwidth in bytes per second of each
+        connection (request).
+        :param total_bandwidth: Optional bandwidth in bytes per second of
+        the link shared by all the connections.
+        :param max_connections: Optional maximum number of requests in
+        progress at the same time, the next ones wait for a free connection.
+        :param max_requests_per_second: Optional request rate above which
+        requests fail with a 503 SlowDown error.
+        :param failure_rate: Probability that a request fails with a 500
+        InternalError.
+        :param seed: Optional seed of the random jitter and failures.
+        """
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1.")
+        self._latency = latency
+        self._latency_jitter = latency_jitter
+        self._bandwidth = bandwidth
+        self._total_bandwidth = total_bandwidth
+        self._max_requests_per_second = max_requests_per_second
+        self._failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._connections = (
+            threading.BoundedSemaphore(max_connections)
+            if max_connections
+            else None
+        )
+        self._lock = threading.Lock()
+        # Time at which the shared link finishes the transfers queued so far
+        self._link_free_at = 0.0
+        # Token bucket of the request rate, one second of burst
+        self._request_tokens = max_requests_per_second or 0.0
+        self._tokens_updated_at = time.monotonic()
+        # Operations of the next requests failing on demand (None: any)
+        self._injected_failures: List[Optional[str]] = []
+        self._stats: Dict[str, int] = {}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the stats of the NetworkSimulator object: the number of
+        "requests" (and of requests per operation), "bytes_sent",
+        "bytes_received", "throttled" and "failed" requests, and "retries".
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """
+        Reset the stats to zero.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def count(self, stat: str, value: int = 1) -> None:
+        """
+        Add a value to a stat.
+
+        :param stat: The name of the stat.
+        :param value: The value to add.
+        """
+        with self._lock:
+            self._stats[stat] = self._stats.get(stat, 0) + value
+
+    def inject_failures(
+        self, count: int = 1, operation: Optional[str] = None
+    ) -> None:
+        """
+        Make the next requests fail with a 500 InternalError.
+
+        :param count: Number of requests to fail.
+        :param operation: Optional S3 operation ("GetObject", "PutObject",
+        ...) of the requests to fail, any operation by default.
+        """
+        with self._lock:
+            self._injected_failures.extend([operation] * count)
+
+    @contextmanager
+    def request(self, operation: str) -> Generator[None, None, None]:
+        """
+        Simulate a request: wait for a free connection, check the request
+        rate and the injected failures, then wait for the latency. The
+        transfers of the request happen inside the context.
+
+        :param operation: The name of the S3 operation ("GetObject", ...).
+        :return: A context manager holding the connection of the request.
+        :raises: botocore.exceptions.ClientError for throttled or failed
+        requests.
+        """
+        if self._connections is not None:
+            self._connections.acquire()
+        try:
+            self.count("requests")
+            self.count(f"requests.{operation}")
+            self._check_request(operation)
+            latency = self._latency
+            if self._latency_jitter:
+                with self._lock:
+                    latency += self._random.uniform(0, self._latency_jitter)
+            if latency:
+                time.sleep(latency)
+            yield
+        finally:
+            if self._connections is not None:
+                self._connections.release()
+
+    def _check_request(self, operation: str) -> None:
+        """
+        Fail the request if it is throttled or if a failure is due.
+
+        :param operation: The name of the S3 operation.
+        :raises: botocore.exceptions.ClientError if the request fails.
+        """
+        with self._lock:
+            throttled = False
+            if self._max_requests_per_second:
+                now = time.monotonic()
+                self._request_tokens = min(
+                    self._max_requests_per_second,
+                    self._request_tokens
+                    + (now - self._tokens_updated_at)
+                    * self._max_requests_per_second,
+                )
+                self._tokens_updated_at = now
+                throttled = self._request_tokens < 1
+                if not throttled:
+                    self._request_tokens -= 1
+
+            failed = False
+            for index, failure in enumerate(self._injected_failures):
+                if failure is None or failure == operation:
+                    del self._injected_failures[index]
+                    failed = True
+                    break
+            if not failed and self._failure_rate:
+                failed = self._random.random() < self._failure_rate
+
+        if throttled:
+            self.count("throttled")
+            raise make_client_error(*THROTTLING_ERROR, operation)
+        if failed:
+            self.count("failed")
+            raise make_client_error(*INJECTED_ERROR, operation)
+
+    def transfer(self, size: int, upload: bool = False) -> None:
+        """
+        Simulate the transfer of bytes in the current request.
+
+        :param size: Number of bytes transferred.
+        :param upload: True for bytes sent to S3, False for bytes received.
+        """
+        self.count("bytes_sent" if upload else "bytes_received", size)
+        now = time.monotonic()
+        done_at = now
+        if self._bandwidth:
+            done_at = now + size / self._bandwidth
+        if self._total_bandwidth:
+            # The link transfers the queued bytes one request after another
+            with self._lock:
+                self._link_free_at = (
+                    max(now, self._link_free_at) + size / self._total_bandwidth
+                )
+                done_at = max(done_at, self._link_free_at)
+        if done_at > now:
+            time.sleep(done_at - now)
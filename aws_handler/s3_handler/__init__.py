@@ -1,2 +1,17 @@
 # flake8: noqa
-from aws_handler.s3_handler.s3_handler import S3Handler
+from typing import TYPE_CHECKING
+
+from aws_handler.util.lazy_import import lazy_module_getattr
+
+_LAZY_IMPORTS = {
+    "S3Handler": "aws_handler.s3_handler.s3_handler",
+    "AsyncS3Handler": "aws_handler.s3_handler.async_s3_handler",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__ = lazy_module_getattr(__name__, _LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from aws_handler.s3_handler.s3_handler import S3Handler
+    from aws_handler.s3_handler.async_s3_handler import AsyncS3Handler
@@ -0,0 +1,713 @@
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Tuple,
+    Union,
+)
+from functools import partial
+import asyncio
+import json
+import os
+
+import pandas as pd
+
+from aws_handler.aws_integration import (
+    AiobotocoreConnector,
+    AsyncAwsConnector,
+)
+from aws_handler.s3_handler.models import UrlFile, UrlFileCollection
+from aws_handler.s3_handler.reader.parsers import (
+    CHUNKED_FILE_TYPES,
+    DEFAULT_CHUNK_SIZE,
+    SUPPORTED_FILE_TYPES,
+    ChunkParser,
+    get_chunk_parser,
+    iter_excel_batches,
+    needs_encoding_detection,
+    parse_file_content,
+    read_file_content,
+)
+from aws_handler.s3_handler.writer.batch import (
+    DEFAULT_MAX_IN_FLIGHT_BYTES,
+    get_write_item_key,
+    normalize_write_item,
+    serialize_write_item,
+)
+from aws_handler.s3_handler.writer.writer import DATAFRAME_FILE_TYPES
+from aws_handler.util.json_engine import (
+    NDJSON_CHUNK_SIZE,
+    NDJSON_CONTENT_TYPE,
+    iter_ndjson_chunks,
+)
+from aws_handler.util.logger import log
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    compress_bytes,
+    StreamDecompressor,
+    normalize_compression,
+    split_compression_extension,
+)
+
+
+class AsyncS3Handler:
+    def __init__(self, bucket: str, aws_connector: AsyncAwsConnector = None):
+        """
+        Initialize an AsyncS3Handler object.
+
+        The asyncio counterpart of S3Handler: every method is a coroutine (or
+        an async generator) running the S3 requests on the event loop, while
+        CPU-bound parsing and serialization run in worker threads.
+
+        :param bucket: The name of the S3 bucket.
+        :param aws_connector: Asynchronous AWS connector object used for S3
+        interactions.
+        """
+        self._bucket = bucket
+        self._aws_connector = (
+            aws_connector if aws_connector else AiobotocoreConnector()
+        )
+
+    async def close(self):
+        """
+        Release the resources held by the AWS connector.
+        """
+        await self._aws_connector.close()
+
+    async def __aenter__(self) -> "AsyncS3Handler":
+        await self._aws_connector.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._aws_connector.__aexit__(exc_type, exc_value, traceback)
+
+    # Writer methods
+    async def write_df_to_s3(
+        self,
+        df_data: pd.DataFrame,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        """
+        Write data to S3 bucket.
+
+        :param df_data: Data to write (already a DataFrame).
+        :param file_name: Name of the file to write.
+        :param file_path: Path of the file to write.
+        :param compression: Optional compression: "gzip", "bz2", "xz" or
+        "zstd". By default, inferred from the file name ("data.csv.gz").
+        :param compression_level: Optional compression level.
+        """
+        if df_data.empty:
+            log.debug(f"Attempting to write an empty file: {file_name}")
+            return
+
+        # Check file extension to determine file type
+        uncompressed_name, file_compression = split_compression_extension(
+            file_name
+        )
+        compression = compression or file_compression
+        _, extension = os.path.splitext(uncompressed_name)
+        extension = extension.replace(".", "")
+        full_file_path = os.path.join(file_path, file_name)
+
+        # Upload to S3, formatted by the connector
+        if extension in DATAFRAME_FILE_TYPES:
+            await self._aws_connector.upload_dataframe_to_s3(
+                data=df_data,
+                bucket=self._bucket,
+                key=full_file_path,
+                file_format=extension,
+                compression=compression,
+                compression_level=compression_level,
+            )
+
+    async def write_json_to_s3(
+        self,
+        data,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        key = f"{file_path}/{file_name}"
+        compression = compression or split_compression_extension(file_name)[1]
+        if compression is None:
+            await self._aws_connector.put_dict_to_s3(
+                bucket=self._bucket, key=key, dict_obj=data
+            )
+            return
+        await self._aws_connector.put_object_to_s3(
+            bucket=self._bucket,
+            key=key,
+            data=await asyncio.to_thread(
+                compress_bytes,
+                json.dumps(data).encode("utf-8"),
+                compression,
+                compression_level,
+            ),
+            content_type=COMPRESSION_CONTENT_TYPES[
+                normalize_compression(compression)
+            ],
+        )
+
+    async def write_ndjson_to_s3(
+        self,
+        records: Union[Iterable, AsyncIterable],
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        """
+        Write records to S3 as newline-delimited JSON, one record per line.
+        The records are consumed lazily and serialized in a worker thread.
+
+        :param records: Iterable (or async iterable) of JSON-serializable
+        records.
+        :param file_name: Name of the file to write ("events.jsonl").
+        :param file_path: Path of the file to write.
+        :param compression: Optional compression: "gzip", "bz2", "xz" or
+        "zstd". By default, inferred from the file name ("events.jsonl.gz").
+        :param compression_level: Optional compression level.
+        """
+        if hasattr(records, "__aiter__"):
+            chunks = _iter_ndjson_chunks_async(records)
+        else:
+            chunks = iter_ndjson_chunks(records)
+        await self._aws_connector.upload_stream_to_s3(
+            chunks,
+            bucket=self._bucket,
+            key=f"{file_path}/{file_name}",
+            content_type=NDJSON_CONTENT_TYPE,
+            compression=compression
+            or split_compression_extension(file_name)[1],
+            compression_level=compression_level,
+        )
+
+    async def write_txt_to_s3(
+        self,
+        text: str,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        full_file_path = os.path.join(file_path, file_name)
+        compression = compression or split_compression_extension(file_name)[1]
+        if compression is None:
+            # Upload to S3
+            await self._aws_connector.put_object_to_s3(
+                bucket=self._bucket,
+                key=full_file_path,
+                data=text,
+                content_type="text/plain",
+            )
+            return
+        await self._aws_connector.put_object_to_s3(
+            bucket=self._bucket,
+            key=full_file_path,
+            data=await asyncio.to_thread(
+                compress_bytes,
+                text.encode("utf-8"),
+                compression,
+                compression_level,
+            ),
+            content_type=COMPRESSION_CONTENT_TYPES[
+                normalize_compression(compression)
+            ],
+        )
+
+    async def write_many(
+        self,
+        items: Union[Iterable[Union[Tuple, Dict]], AsyncIterable],
+        max_workers: int = 8,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[int, Exception]]:
+        """
+        Write many objects, serializing the next items (in a worker thread)
+        while the previous ones are uploaded.
+
+        :param items: Iterable (or async iterable) of items, each one a
+        dictionary with the "data", "file_name" and "file_path" keys (and
+        optionally "compression" and "compression_level"), or a tuple of
+        the values in that order. DataFrames are written as by
+        `write_df_to_s3`, strings as by `write_txt_to_s3`, bytes as they
+        are, and other values as JSON by `write_json_to_s3`.
+        :param max_workers: Maximum number of objects uploaded at the same
+        time.
+        :param max_in_flight_bytes: Maximum number of serialized bytes
+        waiting for (or being) uploaded. A single larger object is still
+        written.
+        :param return_exceptions: If True, the exception raised by an item
+        is returned as its outcome. Otherwise the first exception (in the
+        items order) is raised once the whole batch is done.
+        :return: A dictionary with the outcome of each item, keyed by object
+        key in the items order: the number of bytes uploaded (0 for empty
+        DataFrames, which are not written), or the exception raised.
+        """
+        outcomes: Dict[str, Union[int, Exception, asyncio.Task]] = {}
+        in_flight = asyncio.Condition()
+        in_flight_bytes = 0
+        upload_slots = asyncio.Semaphore(max_workers)
+
+        async def upload(key: str, body: bytes, content_type: str) -> int:
+            nonlocal in_flight_bytes
+            try:
+                async with upload_slots:
+                    await self._aws_connector.upload_stream_to_s3(
+                        [body],
+                        bucket=self._bucket,
+                        key=key,
+                        content_type=content_type,
+                    )
+                return len(body)
+            finally:
+                async with in_flight:
+                    in_flight_bytes -= len(body)
+                    in_flight.notify_all()
+
+        async def iter_items():
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    yield item
+            else:
+                for item in items:
+                    yield item
+
+        index = 0
+        async for item in iter_items():
+            # Items without a valid key are reported by position
+            key = f"items[{index}]"
+            index += 1
+            try:
+                item = normalize_write_item(item)
+                key = get_write_item_key(item)
+                body, content_type = await asyncio.to_thread(
+                    serialize_write_item, item
+                )
+                if body is None:
+                    log.debug(f"Attempting to write an empty file: {key}")
+                    outcomes[key] = 0
+                    continue
+                async with in_flight:
+                    await in_flight.wait_for(
+                        lambda: in_flight_bytes == 0
+                        or in_flight_bytes + len(body) <= max_in_flight_bytes
+                    )
+                    in_flight_bytes += len(body)
+                outcomes[key] = asyncio.create_task(
+                    upload(key, body, content_type)
+                )
+            except Exception as excpt:
+                log.error(f"Failed to serialize {key}: {excpt}")
+                outcomes[key] = excpt
+
+        for key, outcome in outcomes.items():
+            if isinstance(outcome, asyncio.Task):
+                try:
+                    outcomes[key] = await outcome
+                except Exception as excpt:
+                    log.error(f"Failed to write {key}: {excpt}")
+                    outcomes[key] = excpt
+
+        if not return_exceptions:
+            for outcome in outcomes.values():
+                if isinstance(outcome, Exception):
+                    raise outcome
+        return outcomes
+
+    # Reader methods
+    async def iter_files(
+        self, path: str, keywords: List[str], match_mode: str = "glob"
+    ) -> AsyncGenerator[Tuple[str, UrlFile], None]:
+        """
+        Lazily retrieve file information from S3 as UrlFile instances.
+
+        :param path: A common folder for all the files to be searched.
+        :param keywords: List of keywords to search for files.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+        :return: An async generator yielding tuples of (keyword, UrlFile).
+        """
+        async for keyword, file_info in self._aws_connector.s3_iter_files(
+            bucket=self._bucket,
+            folder=path,
+            keywords=keywords,
+            match_mode=match_mode,
+        ):
+            url_file_obj = UrlFile(
+                s3_url=file_info["file_path"],
+                last_modified=file_info["last_modified"],
+                size=file_info.get("size"),
+                etag=file_info.get("etag"),
+            )
+            yield keyword, url_file_obj
+
+    async def retrieve_files(
+        self, path: str, keywords: List[str], match_mode: str = "glob"
+    ) -> Dict[str, UrlFileCollection]:
+        """
+        Retrieve file information from S3 and store it as UrlFile instances.
+
+        :param path: A common folder for all the files to be searched.
+        :param keywords: List of keywords to search for files.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+        :return: A dictionary with a UrlFileCollection per keyword.
+        """
+        files_per_keyword: Dict[str, UrlFileCollection] = {
+            keyword: UrlFileCollection() for keyword in keywords or []
+        }
+
+        async for keyword, url_file_obj in self.iter_files(
+            path, keywords, match_mode
+        ):
+            if keyword not in files_per_keyword:
+                files_per_keyword[keyword] = UrlFileCollection()
+            files_per_keyword[keyword].add_url_file_object(url_file_obj)
+
+        for url_file_objects in files_per_keyword.values():
+            url_file_objects.order_files_by_last_modified_or_name()
+
+        return files_per_keyword
+
+    async def read_file(
+        self,
+        file_object: UrlFile,
+        custom_encoding: str = "",
+        engine: str = None,
+        columns: List[str] = None,
+        filters: List = None,
+        usecols: Union[List, Callable] = None,
+        dtype: Union[str, Dict] = None,
+        nrows: int = None,
+        skiprows: int = None,
+        sheet_name: Union[str, int, List] = None,
+    ) -> Union[pd.DataFrame, dict, bytes, None]:
+        """
+        Read a file from S3 based on a UrlFile.
+
+        :param file_object: The UrlFile to be read
+        :param custom_encoding: Custom encoding.
+        :param engine: Parser engine. For CSV files, the pandas engine: "c"
+        (default), "pyarrow" or "python". For Excel files, "calamine" or
+        "openpyxl" (calamine by default when `python-calamine` is installed).
+        For JSON and NDJSON files, "orjson" or "json" (orjson by default when
+        it is installed).
+        :param columns: For Parquet and Arrow files, the columns to read.
+        :param filters: For Parquet and Arrow files, row filters in the
+        pyarrow DNF format, e.g. [("year", "=", 2024)].
+        :param usecols: For CSV, Excel and NDJSON files, the subset of
+        columns to parse (names, positions or a callable, as in
+        `pd.read_csv`).
+        :param dtype: For CSV, Excel and NDJSON files, the dtype (or dtype
+        per column) to use.
+        :param nrows: For CSV, Excel and NDJSON files, the number of rows to
+        parse.
+        :param skiprows: For CSV and Excel files, the rows to skip, as in
+        `pd.read_csv`.
+        :param sheet_name: For Excel files, the sheet(s) to read, by name or
+        position. If None, the only sheet of the workbook, or a dictionary of
+        every sheet if there are several.
+        :return: The parsed file data. NDJSON files (".jsonl", ".ndjson")
+        are returned as a DataFrame with a row per line.
+        """
+        file_type = file_object.file_extension
+        if file_type not in SUPPORTED_FILE_TYPES:
+            return None
+
+        file_content, encoding = await self._aws_connector.s3_read_file(
+            self._bucket,
+            key=file_object.s3_url,
+            raw=True,
+            # Compressed content is detected once decompressed
+            detect_encoding=file_object.compression is None
+            and needs_encoding_detection(file_type, custom_encoding),
+        )
+        return await asyncio.to_thread(
+            parse_file_content,
+            file_type,
+            file_content,
+            encoding,
+            custom_encoding,
+            engine,
+            columns,
+            filters,
+            usecols,
+            dtype,
+            nrows,
+            skiprows,
+            file_object.compression,
+            sheet_name,
+            partial(
+                self._aws_connector.s3_detect_encoding,
+                self._bucket,
+                file_object.s3_url,
+                etag=file_object.etag,
+                compression=file_object.compression,
+            ),
+        )
+
+    async def read_files(
+        self,
+        file_collection: UrlFileCollection,
+        max_workers: int = 8,
+        return_exceptions: bool = False,
+        custom_encoding: str = "",
+    ) -> Dict[str, Union[pd.DataFrame, dict, bytes, Exception, None]]:
+        """
+        Read all the files of a UrlFileCollection concurrently.
+
+        :param file_collection: The UrlFileCollection to be read.
+        :param max_workers: Maximum number of files read at the same time.
+        :param return_exceptions: If True, the exception raised by a file is
+        returned as its result. Otherwise the first exception (in the
+        collection order) is raised once the whole batch is done.
+        :param custom_encoding: Custom encoding.
+        :return: A dictionary with the parsed data of each file, keyed by
+        s3_url in the collection order.
+        """
+        read_slots = asyncio.Semaphore(max_workers)
+
+        async def read_one_file(file_object: UrlFile):
+            async with read_slots:
+                try:
+                    return await self.read_file(file_object, custom_encoding)
+                except Exception as excpt:
+                    log.error(f"Failed to read {file_object.s3_url}: {excpt}")
+                    return excpt
+
+        results = dict(
+            zip(
+                (file_object.s3_url for file_object in file_collection),
+                await asyncio.gather(
+                    *(
+                        read_one_file(file_object)
+                        for file_object in file_collection
+                    )
+                ),
+            )
+        )
+
+        if not return_exceptions:
+            for result in results.values():
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    async def read_file_by_chunks(
+        self,
+        file_object: UrlFile,
+        chunk_size: int = None,
+        chunk_rows: int = None,
+        dtype: Union[str, Dict] = None,
+        engine: str = None,
+        usecols: Union[List, Callable] = None,
+        nrows: int = None,
+        skiprows: int = 0,
+        custom_encoding: str = "",
+        sheet_name: Union[str, int] = None,
+        as_records: bool = False,
+        xml_item: Union[str, int] = None,
+    ) -> AsyncGenerator[Union[pd.DataFrame, List[Any]], None]:
+        """
+        Read a file from S3 in chunks and parse it.
+
+        CSV, NDJSON (".jsonl", ".ndjson"), JSON and XML files are streamed
+        from S3. JSON files must hold a top-level array, whose elements are
+        parsed incrementally. The repeated elements of XML files are parsed
+        incrementally and freed once read, so the memory use does not depend
+        on the size of the document. Excel workbooks are downloaded, then their
+        rows are streamed from the sheet in read-only mode.
+
+        :param file_object: The UrlFile representing the file to be read.
+        :param chunk_size: Size (bytes) of each chunk to read at a time.
+        :param chunk_rows: Number of rows of each yielded DataFrame (the last
+        one may be shorter). If None, a DataFrame is yielded per chunk read
+        for CSV files, and per DEFAULT_EXCEL_CHUNK_ROWS rows for Excel files.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param engine: For CSV files, the pandas engine: "c" (default),
+        "pyarrow" or "python". For NDJSON files, the JSON engine: "orjson"
+        or "json".
+        :param usecols: Optional subset of the columns to parse (names,
+        positions or, for CSV files, a callable, as in `pd.read_csv`). For
+        JSON and XML files, the fields of the records.
+        :param nrows: Optional maximum number of rows to read, the download
+        stops once they are parsed.
+        :param skiprows: For CSV and Excel files, the number of rows skipped
+        at the start of the file, before the header.
+        :param custom_encoding: Custom encoding, skips the detection.
+        :param sheet_name: For Excel files, the sheet to read, by name or
+        position, the first one by default.
+        :param as_records: For JSON, NDJSON and XML files, yield lists of the
+        parsed records instead of DataFrames.
+        :param xml_item: For XML files, the repeated element to yield, as a
+        path of tag names from the root ("feed/products/product", "*"
+        matches any tag) or as a depth (1 is the root element). The children
+        of the root element by default. Each element is converted to a
+        dictionary as by xmltodict.
+        :return: An async generator yielding parsed chunks. Compressed files
+        are decompressed chunk by chunk.
+        """
+        file_type = file_object.file_extension
+        if file_type not in CHUNKED_FILE_TYPES:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        if nrows is not None and nrows <= 0:
+            return
+
+        if file_type == "xlsx":
+            file_content, _ = await self._aws_connector.s3_read_file(
+                self._bucket,
+                key=file_object.s3_url,
+                raw=True,
+                detect_encoding=False,
+            )
+            if file_object.compression is not None:
+                file_content = await asyncio.to_thread(
+                    read_file_content, file_content, file_object.compression
+                )
+            batches = iter_excel_batches(
+                file_content,
+                sheet_name=sheet_name,
+                chunk_rows=chunk_rows,
+                usecols=usecols,
+                dtype=dtype,
+                nrows=nrows,
+                skiprows=skiprows,
+            )
+            try:
+                # The rows are parsed in a worker thread, batch by batch
+                while True:
+                    df = await asyncio.to_thread(next, batches, None)
+                    if df is None:
+                        return
+                    yield df
+            finally:
+                batches.close()
+
+        async for batch in self._iter_parsed_chunks(
+            file_object.s3_url,
+            get_chunk_parser(
+                file_type,
+                chunk_rows=chunk_rows,
+                dtype=dtype,
+                engine=engine,
+                usecols=usecols,
+                skiprows=skiprows,
+                nrows=nrows,
+                as_records=as_records,
+                xml_item=xml_item,
+            ),
+            compression=file_object.compression,
+            chunk_size=chunk_size,
+            custom_encoding=custom_encoding,
+            detect_encoding=file_type == "csv",
+            etag=file_object.etag,
+        ):
+            yield batch
+
+    async def _iter_parsed_chunks(
+        self,
+        key: str,
+        parser: ChunkParser,
+        compression: str = None,
+        chunk_size: int = None,
+        custom_encoding: str = "",
+        detect_encoding: bool = True,
+        etag: str = None,
+    ) -> AsyncGenerator[Union[pd.DataFrame, List[Any]], None]:
+        """
+        Stream a file from S3 and parse it with a chunk parser (see
+        `get_chunk_parser`), in a worker thread.
+
+        :param key: The key of the file.
+        :param parser: The chunk parser.
+        :param compression: The compression of the file, None if
+        uncompressed.
+        :param chunk_size: Size (bytes) of each chunk to read at a time.
+        :param custom_encoding: Custom encoding.
+        :param detect_encoding: Whether the encoding of the file has to be
+        detected (text files), ignored with a custom encoding.
+        :param etag: The ETag of the file, None if unknown. Caches the
+        encoding detected from the decompressed content.
+        :return: An async generator yielding parsed chunks.
+        """
+        detect_encoding = detect_encoding and not custom_encoding
+        chunks = self._aws_connector.s3_read_file_by_chunks(
+            bucket=self._bucket,
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            key=key,
+            raw=True,
+            detect_encoding=detect_encoding and compression is None,
+        )
+        decompressor = StreamDecompressor(compression) if compression else None
+        encoding = custom_encoding or None
+        try:
+            async for file_content, chunk_encoding in chunks:
+                if file_content == -1:
+                    break
+                if decompressor is not None:
+                    file_content = await asyncio.to_thread(
+                        decompressor.decompress, file_content
+                    )
+                    if encoding is None and detect_encoding and file_content:
+                        encoding = self._aws_connector.s3_detect_encoding(
+                            self._bucket,
+                            key,
+                            file_content,
+                            etag=etag,
+                            compression=compression,
+                        )
+                else:
+                    encoding = encoding or chunk_encoding
+                for batch in await asyncio.to_thread(
+                    parser.feed, file_content, encoding
+                ):
+                    yield batch
+                if parser.done:
+                    return
+        finally:
+            # Stops the download once the rows are read
+            await chunks.aclose()
+        if decompressor is not None:
+            for batch in await asyncio.to_thread(
+                parser.feed, decompressor.flush(), encoding
+            ):
+                yield batch
+        for batch in await asyncio.to_thread(parser.finish):
+            yield batch
+
+
+async def _iter_ndjson_chunks_async(
+    records: AsyncIterable,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Serialize the records of an async iterable to newline-delimited JSON,
+    in chunks serialized in a worker thread.
+
+    :param records: Async iterable of JSON-serializable records.
+    :return: An async generator yielding the UTF-8 encoded chunks.
+    """
+    # Records are gathered by count, about NDJSON_CHUNK_SIZE bytes at 1 KiB
+    # per record
+    batch_size = NDJSON_CHUNK_SIZE // 1024
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield b"".join(
+                await asyncio.to_thread(list, iter_ndjson_chunks(batch))
+            )
+            batch = []
+    if batch:
+        yield b"".join(
+            await asyncio.to_thread(list, iter_ndjson_chunks(batch))
+        )
@@ -0,0 +1,2 @@
+# flake8: noqa
+from aws_handler.s3_handler.cache.result_cache import ParsedResultCache
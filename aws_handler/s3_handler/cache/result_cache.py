@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+import copy
+import mmap
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aws_handler.util.logger import log
+
+# How cached results are handed to the callers
+RESULT_CACHE_MODES = ("copy", "readonly", "cow")
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory used by a parsed result.
+
+    :param value: A DataFrame, a dictionary of DataFrames (Excel sheets),
+    the dictionary of a JSON or XML file, or any nested structure.
+    :return: The estimated size in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(
+            estimate_size(item) for item in value
+        )
+    if isinstance(value, (bytearray, memoryview, mmap.mmap)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+def lock_dataframe(df: pd.DataFrame) -> None:
+    """
+    Make the NumPy arrays backing a DataFrame read-only, so writing its
+    values in place raises a ValueError.
+
+    :param df: The DataFrame to lock.
+    """
+    for _, column in df.items():
+        array = column.to_numpy(copy=False)
+        # Lock the view and every array it is based on
+        while isinstance(array, np.ndarray):
+            array.flags.writeable = False
+            array = array.base
+
+
+def copy_on_write_enabled() -> bool:
+    """
+    Check whether the pandas Copy-on-Write mode is enabled.
+
+    :return: True if the mode is enabled.
+    """
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except (KeyError, pd.errors.OptionError):
+        # Copy-on-Write is always enabled since pandas 3
+        return True
+
+
+class ParsedResultCache:
+    def __init__(self, max_bytes: int = 512 * 1024**2, mode: str = "copy"):
+        """
+        Initialize a ParsedResultCache object.
+
+        An in-memory cache of parsed files keyed by the S3 URL, the version
+        of the file (its ETag or last modified date) and the parse options.
+        The least recently used results are evicted once their estimated
+        size exceeds `max_bytes`.
+
+        The mode sets how cached DataFrames are handed to the callers, so
+        they cannot corrupt the cached entries:
+        - "copy": a deep copy on every hit.
+        - "readonly": a shallow copy over read-only arrays, writing the
+        values in place raises a ValueError.
+        - "cow": a shallow copy relying on the pandas Copy-on-Write mode
+        (`pd.set_option("mode.copy_on_write", True)`), writes copy the
+        data.
+        Other results (JSON and XML dictionaries) are always deep copied.
+
+        :param max_bytes: Maximum estimated size in bytes of the cached
+        results.
+        :param mode: How cached results are returned: "copy", "readonly" or
+        "cow".
+        """
+        if mode not in RESULT_CACHE_MODES:
+            raise ValueError(
+                f"Invalid mode: {mode}, use one of {RESULT_CACHE_MODES}."
+            )
+        if mode == "cow" and not copy_on_write_enabled():
+            raise ValueError(
+                "The 'cow' mode requires the pandas Copy-on-Write mode, "
+                'enable it with pd.set_option("mode.copy_on_write", True).'
+            )
+        self._max_bytes = max_bytes
+        self._mode = mode
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """
+        Get the max_bytes of the ParsedResultCache object.
+        """
+        return self._max_bytes
+
+    @property
+    def mode(self) -> str:
+        """
+        Get the mode of the ParsedResultCache object.
+        """
+        return self._mode
+
+    @property
+    def size(self) -> int:
+        """
+        Get the estimated size in bytes of the ParsedResultCache object.
+        """
+        return self._size
+
+    @property
+    def hits(self) -> int:
+        """
+        Get the number of hits of the ParsedResultCache object.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Get the number of misses of the ParsedResultCache object.
+        """
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Get a cached result and mark it as recently used.
+
+        :param key: The key of the result.
+        :return: A tuple of (found, result).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return True, self._hand_out(entry[0])
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """
+        Cache a result, evicting the least recently used ones if needed.
+
+        :param key: The key of the result.
+        :param value: The parsed result.
+        :return: The result to hand to the caller (a copy or a view, as for
+        a hit).
+        """
+        if isinstance(value, tuple):
+            # Text files: the raw content may be a mutable buffer
+            value = tuple(
+                bytes(item) if isinstance(item, bytearray) else item
+                for item in value
+            )
+        size = estimate_size(value)
+        if size > self._max_bytes:
+            return value
+
+        if self._mode == "readonly":
+            for df in self._iter_dataframes(value):
+                lock_dataframe(df)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            evicted = 0
+            while self._size > self._max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                evicted += 1
+        if evicted:
+            log.debug(f"Evicted {evicted} results from the result cache")
+        return self._hand_out(value)
+
+    def clear(self) -> None:
+        """
+        Drop every cached result and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def _iter_dataframes(value: Any):
+        """
+        Iterate over the DataFrames of a result.
+
+        :param value: A DataFrame or a dictionary of DataFrames.
+        :return: A generator yielding the DataFrames.
+        """
+        if isinstance(value, pd.DataFrame):
+            yield value
+        elif isinstance(value, dict):
+            for item in value.values():
+                if isinstance(item, pd.DataFrame):
+                    yield item
+
+    def _hand_out(self, value: Any) -> Any:
+        """
+        Protect a cached result before handing it to a caller.
+
+        :param value: The cached result.
+        :return: A copy (or a shallow copy, for DataFrames in the "readonly"
+        and "cow" modes) of the result.
+        """
+        deep = self._mode == "copy"
+        if isinstance(value, pd.DataFrame):
+            return value.copy(deep=deep)
+        if isinstance(value, dict) and all(
+            isinstance(item, pd.DataFrame) for item in value.values()
+        ):
+            return {sheet: df.copy(deep=deep) for sheet, df in value.items()}
+        if isinstance(value, tuple):
+            return value
+        return copy.deepcopy(value)
@@ -0,0 +1,257 @@
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterable, Iterator, List, Tuple
+import itertools
+import sqlite3
+import time
+import uuid
+
+from aws_handler.aws_integration import AwsConnector
+from aws_handler.util.logger import log
+
+# Schema of the on-disk index
+LISTING_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    last_key TEXT NOT NULL,
+    reconciled_at REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+);
+CREATE TABLE IF NOT EXISTS objects (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    last_modified TEXT NOT NULL,
+    PRIMARY KEY (bucket, prefix, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS staged_objects (
+    token TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    last_modified TEXT NOT NULL,
+    PRIMARY KEY (token, key)
+) WITHOUT ROWID;
+"""
+
+# Number of listed objects written per transaction, so the write lock of
+# the database is only held for short periods during a listing
+REFRESH_BATCH_SIZE = 1000
+
+
+class ListingIndex:
+    def __init__(self, path: str, reconcile_interval: float = 3600.0):
+        """
+        Initialize a ListingIndex object.
+
+        The index keeps a local copy of the S3 listing of every
+        (bucket, prefix) pair in a SQLite database, so repeated searches on
+        the same prefix do not list the bucket again. A refresh only lists the
+        keys after the last indexed key; the listing is fully reconciled
+        (catching deleted, overwritten or out-of-order keys) once the
+        reconcile interval has elapsed.
+
+        :param path: Path of the SQLite database file.
+        :param reconcile_interval: Seconds between two full listings of the
+        same prefix.
+        """
+        self._path = path
+        self._reconcile_interval = reconcile_interval
+        with self._connect() as connection:
+            # WAL lets other processes read while the index is refreshed
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(LISTING_INDEX_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path of the ListingIndex object.
+
+        :return: The path of the SQLite database file.
+        """
+        return self._path
+
+    @property
+    def reconcile_interval(self) -> float:
+        """
+        Get the reconcile_interval of the ListingIndex object.
+
+        :return: The seconds between two full listings of the same prefix.
+        """
+        return self._reconcile_interval
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the index, committing on success.
+
+        :return: A context manager yielding the connection.
+        """
+        connection = sqlite3.connect(self._path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def refresh(
+        self, aws_connector: AwsConnector, bucket: str, prefix: str
+    ) -> None:
+        """
+        Bring the index of a prefix up to date.
+
+        The listing is written in batches of REFRESH_BATCH_SIZE objects, each
+        one in its own transaction, so other processes can read and refresh
+        the index while the bucket is being listed. A full listing is staged
+        first and swapped with the indexed one in a single short
+        transaction.
+
+        :param aws_connector: AWS connector object used to list the bucket.
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix to refresh.
+        """
+        with self._connect() as connection:
+            listing = connection.execute(
+                "SELECT last_key, reconciled_at FROM listings "
+                "WHERE bucket = ? AND prefix = ?",
+                (bucket, prefix),
+            ).fetchone()
+
+        now = time.time()
+        if listing is None or now - listing[1] >= self._reconcile_interval:
+            self._reconcile(aws_connector, bucket, prefix, now)
+            return
+
+        file_infos = aws_connector.s3_iter_objects(
+            bucket=bucket, prefix=prefix, start_after=listing[0]
+        )
+        for batch in _iter_batches(file_infos):
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO objects "
+                    "(bucket, prefix, key, size, etag, last_modified) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ((bucket, prefix, *row) for row in batch),
+                )
+                # Concurrent refreshes only move the last key forward
+                connection.execute(
+                    "UPDATE listings SET last_key = MAX(last_key, ?) "
+                    "WHERE bucket = ? AND prefix = ?",
+                    (batch[-1][0], bucket, prefix),
+                )
+
+    def _reconcile(
+        self,
+        aws_connector: AwsConnector,
+        bucket: str,
+        prefix: str,
+        reconciled_at: float,
+    ) -> None:
+        """
+        List a whole prefix into the staging table, then replace its indexed
+        objects with the staged ones.
+
+        :param aws_connector: AWS connector object used to list the bucket.
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The prefix to reconcile.
+        :param reconciled_at: Timestamp of the reconciliation.
+        """
+        log.debug(f"Reconciling listing index of {bucket}/{prefix}")
+        # Identifies the staged rows of this listing among concurrent ones
+        token = uuid.uuid4().hex
+        try:
+            file_infos = aws_connector.s3_iter_objects(
+                bucket=bucket, prefix=prefix
+            )
+            for batch in _iter_batches(file_infos):
+                with self._connect() as connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO staged_objects "
+                        "(token, key, size, etag, last_modified) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        ((token, *row) for row in batch),
+                    )
+
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM objects WHERE bucket = ? AND prefix = ?",
+                    (bucket, prefix),
+                )
+                connection.execute(
+                    "INSERT INTO objects "
+                    "(bucket, prefix, key, size, etag, last_modified) "
+                    "SELECT ?, ?, key, size, etag, last_modified "
+                    "FROM staged_objects WHERE token = ?",
+                    (bucket, prefix, token),
+                )
+                (last_key,) = connection.execute(
+                    "SELECT MAX(key) FROM staged_objects WHERE token = ?",
+                    (token,),
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO listings "
+                    "(bucket, prefix, last_key, reconciled_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (bucket, prefix, last_key or "", reconciled_at),
+                )
+        finally:
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM staged_objects WHERE token = ?", (token,)
+                )
+
+    def iter_files(
+        self, bucket: str, prefix: str
+    ) -> Generator[Dict[str, str], None, None]:
+        """
+        Iterate over the indexed files of a prefix.
+
+        :param bucket: The name of the S3 bucket.
+        :param prefix: The indexed prefix.
+        :return: A generator yielding a dictionary per file containing
+        "file_path", "last_modified", "size" and "etag", in key order.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "SELECT key, last_modified, size, etag FROM objects "
+                "WHERE bucket = ? AND prefix = ? ORDER BY key",
+                (bucket, prefix),
+            )
+            for key, last_modified, size, etag in cursor:
+                # Skip objects that represent folders
+                if key.endswith("/"):
+                    continue
+                yield {
+                    "file_path": key,
+                    "last_modified": last_modified,
+                    "size": size,
+                    "etag": etag,
+                }
+
+
+def _iter_batches(
+    file_infos: Iterable[Dict[str, str]],
+) -> Generator[List[Tuple], None, None]:
+    """
+    Group listed files into batches of index rows.
+
+    :param file_infos: The file information dictionaries of a listing.
+    :return: A generator yielding lists of up to REFRESH_BATCH_SIZE tuples of
+    (key, size, etag, last_modified).
+    """
+    rows = (
+        (
+            file_info["file_path"],
+            file_info["size"],
+            file_info["etag"],
+            file_info["last_modified"],
+        )
+        for file_info in file_infos
+    )
+    while True:
+        batch = list(itertools.islice(rows, REFRESH_BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
@@ -1,15 +1,34 @@
+from typing import Optional
+
+from aws_handler.util.compression import split_compression_extension
+
+
 class UrlFile:
-    def __init__(self, last_modified: str, s3_url: str):
+    def __init__(
+        self,
+        last_modified: str,
+        s3_url: str,
+        size: Optional[int] = None,
+        etag: Optional[str] = None,
+    ):
         """
         Initialize a UrlFile object object.
 
         :param last_modified: The last_modified of the UrlFile object.
         :param s3_url: The s3_url of the UrlFile object.
+        :param size: The size in bytes of the UrlFile object, if known.
+        :param etag: The ETag of the UrlFile object, if known.
         """
-        self._file_extension = s3_url.split(".")[-1]
+        # "data.csv.gz" is a gzip compressed "csv" file
+        uncompressed_url, self._compression = split_compression_extension(
+            s3_url
+        )
+        self._file_extension = uncompressed_url.split(".")[-1]
         self._last_modified = last_modified
         self._s3_url = s3_url
         self._file_name = self._extract_file_name(s3_url)
+        self._size = size
+        self._etag = etag
 
     @property
     def file_extension(self) -> str:
@@ -20,6 +39,16 @@ class UrlFile:
         """
         return self._file_extension
 
+    @property
+    def compression(self) -> Optional[str]:
+        """
+        Get the compression of the UrlFile object.
+
+        :return: The compression of the UrlFile object ("gzip", "bz2", "xz"
+        or "zstd"), None for uncompressed files.
+        """
+        return self._compression
+
     @property
     def last_modified(self) -> str:
         """
@@ -47,18 +76,40 @@ class UrlFile:
         """
         return self._file_name
 
+    @property
+    def size(self) -> Optional[int]:
+        """
+        Get the size of the UrlFile object.
+
+        :return: The size in bytes of the UrlFile object, None if unknown.
+        """
+        return self._size
+
+    @property
+    def etag(self) -> Optional[str]:
+        """
+        Get the etag of the UrlFile object.
+
+        :return: The ETag of the UrlFile object, None if unknown.
+        """
+        return self._etag
+
     def to_dict(self) -> dict:
         """
         Convert the UrlFile object to a dictionary representation.
 
         :return: A dictionary with keys:
-            'file_extension', 'last_modified', 's3_url', and 'file_name'.
+            'file_extension', 'compression', 'last_modified', 's3_url',
+            'file_name', 'size' and 'etag'.
         """
         return {
             "file_extension": self._file_extension,
+            "compression": self._compression,
             "last_modified": self._last_modified,
             "s3_url": self._s3_url,
             "file_name": self._file_name,
+            "size": self._size,
+            "etag": self._etag,
         }
 
     def _extract_file_name(self, s3_url: str) -> str:
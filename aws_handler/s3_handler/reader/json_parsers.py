@@ -0,0 +1,266 @@
+from typing import Any, Dict, List, Optional, Union
+import codecs
+import io
+import json
+
+import pandas as pd
+
+from aws_handler.s3_handler.reader.records import (
+    RecordChunkParser,
+    records_to_dataframe,
+)
+from aws_handler.util.json_engine import get_json_engine, json_loads
+
+# Number of bytes read at a time when parsing a JSON stream
+JSON_READ_SIZE = 8 * 1024 * 1024
+
+# Byte order mark some editors write at the start of UTF-8 files
+UTF8_BOM = codecs.BOM_UTF8
+
+
+def read_ndjson(
+    source: io.IOBase,
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+    nrows: Optional[int] = None,
+    engine: Optional[str] = None,
+    encoding: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read a newline-delimited JSON file as a DataFrame, one row per line.
+
+    :param source: Binary stream over the content of the file.
+    :param usecols: Optional subset of the fields to keep, in order.
+    :param dtype: Optional dtype (or dtype per column) of the DataFrame.
+    :param nrows: Optional maximum number of lines to parse, the rest of the
+    stream is not read.
+    :param engine: "orjson" or "json", see `get_json_engine`.
+    :param encoding: Optional encoding of the file, UTF-8 by default.
+    :return: The DataFrame.
+    """
+    parser = NdjsonChunkParser(nrows=nrows, as_records=True, engine=engine)
+    records = []
+    while not parser.done:
+        chunk = source.read(JSON_READ_SIZE)
+        if not chunk:
+            break
+        for batch in parser.feed(chunk, encoding):
+            records += batch
+    for batch in parser.finish():
+        records += batch
+    return records_to_dataframe(records, usecols, dtype)
+
+
+class NdjsonChunkParser(RecordChunkParser):
+    def __init__(
+        self,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        usecols: Optional[List[str]] = None,
+        nrows: Optional[int] = None,
+        as_records: bool = False,
+        engine: Optional[str] = None,
+    ):
+        """
+        Initialize a NdjsonChunkParser object.
+
+        The parser turns consecutive chunks of a newline-delimited JSON file
+        (one JSON value per line) into batches of records. The bytes after
+        the last newline of a chunk are carried over to the next one. Blank
+        lines are ignored.
+
+        :param chunk_rows: Number of records of each batch. If None, a batch
+        with all the complete records is returned per chunk.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param usecols: Optional subset of the fields to keep, in order.
+        :param nrows: Optional maximum number of records to parse.
+        :param as_records: If True, the batches are lists of the parsed
+        records instead of DataFrames.
+        :param engine: "orjson" or "json", see `get_json_engine`.
+        """
+        super().__init__(chunk_rows, dtype, usecols, nrows, as_records)
+        self._engine = get_json_engine(engine)
+        self._buffer = bytearray()
+        self._encoding: Optional[str] = None
+        self._started = False
+
+    def feed(
+        self, chunk: bytes, encoding: Optional[str] = None
+    ) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the next chunk of the file.
+
+        :param chunk: The raw content of the chunk.
+        :param encoding: Optional encoding of the file, UTF-8 by default.
+        Only ASCII-compatible encodings are supported.
+        :return: The batches completed by the chunk (possibly none).
+        """
+        if self.done:
+            return []
+        if encoding and codecs.lookup(encoding).name not in (
+            "ascii",
+            "utf-8",
+            "utf-8-sig",
+        ):
+            self._encoding = encoding
+        self._buffer += chunk
+        if not self._started and len(self._buffer) >= len(UTF8_BOM):
+            self._started = True
+            if self._buffer.startswith(UTF8_BOM):
+                del self._buffer[: len(UTF8_BOM)]
+
+        lines_end = self._buffer.rfind(b"\n") + 1
+        if lines_end:
+            self._parse_lines(bytes(self._buffer[:lines_end]))
+            del self._buffer[:lines_end]
+        return self._take_batches(final=False)
+
+    def finish(self) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the records left once the whole file has been fed, including a
+        last line without a trailing newline.
+
+        :return: The remaining batches (possibly none).
+        """
+        if not self.done and self._buffer:
+            if not self._started and self._buffer.startswith(UTF8_BOM):
+                del self._buffer[: len(UTF8_BOM)]
+            self._parse_lines(bytes(self._buffer))
+            self._buffer.clear()
+        return self._take_batches(final=True)
+
+    def _parse_lines(self, lines: bytes):
+        """
+        Parse complete lines into records.
+
+        :param lines: The lines, each one ended by a newline (except maybe
+        the last one).
+        """
+        if self._encoding is not None:
+            lines = lines.decode(self._encoding).encode("utf-8")
+        # JSON strings cannot contain raw newlines
+        lines = [line for line in lines.split(b"\n") if line.strip()]
+        if self._rows_left is not None:
+            lines = lines[: self._rows_left]
+        self._add_records([json_loads(line, self._engine) for line in lines])
+
+
+class JsonArrayChunkParser(RecordChunkParser):
+    def __init__(
+        self,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        usecols: Optional[List[str]] = None,
+        nrows: Optional[int] = None,
+        as_records: bool = False,
+    ):
+        """
+        Initialize a JsonArrayChunkParser object.
+
+        The parser incrementally parses a JSON document whose top-level value
+        is an array, and turns its elements into batches of records as soon
+        as they are complete, so the document is never parsed as a whole.
+        The text after the last complete element of a chunk is carried over
+        to the next one.
+
+        :param chunk_rows: Number of records of each batch. If None, a batch
+        with all the complete records is returned per chunk.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param usecols: Optional subset of the fields to keep, in order.
+        :param nrows: Optional maximum number of records to parse.
+        :param as_records: If True, the batches are lists of the parsed
+        records instead of DataFrames.
+        """
+        super().__init__(chunk_rows, dtype, usecols, nrows, as_records)
+        self._json_decoder = json.JSONDecoder()
+        self._text_decoder = None
+        self._text = ""
+        # What the parser expects next: "[", "value", "value_or_end",
+        # "comma_or_end", or "end" once the array is closed
+        self._expected = "["
+
+    def feed(
+        self, chunk: bytes, encoding: Optional[str] = None
+    ) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the next chunk of the file.
+
+        :param chunk: The raw content of the chunk.
+        :param encoding: Optional encoding of the file, UTF-8 by default.
+        :return: The batches completed by the chunk (possibly none).
+        """
+        if self.done:
+            return []
+        if self._text_decoder is None:
+            self._text_decoder = codecs.getincrementaldecoder(
+                encoding or "utf-8-sig"
+            )()
+        self._text += self._text_decoder.decode(chunk)
+        self._parse_elements(final=False)
+        return self._take_batches(final=False)
+
+    def finish(self) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the elements left once the whole file has been fed.
+
+        :return: The remaining batches (possibly none).
+        :raises: ValueError if the content is not a complete JSON array.
+        """
+        if not self.done:
+            if self._text_decoder is not None:
+                self._text += self._text_decoder.decode(b"", final=True)
+            self._parse_elements(final=True)
+            if self._expected != "end":
+                raise ValueError("The JSON array ended before its closing ].")
+        return self._take_batches(final=True)
+
+    def _parse_elements(self, final: bool):
+        """
+        Parse the complete elements of the buffered text.
+
+        :param final: True once the whole file has been fed, so an element
+        ending the text is complete.
+        """
+        text = self._text
+        position = 0
+        records = []
+        while self._expected != "end" and len(records) != self._rows_left:
+            while position < len(text) and text[position].isspace():
+                position += 1
+            if position == len(text):
+                break
+            char = text[position]
+            if self._expected == "[":
+                if char != "[":
+                    raise ValueError(
+                        "Only JSON documents whose top-level value is an "
+                        "array can be parsed in chunks."
+                    )
+                self._expected = "value_or_end"
+                position += 1
+            elif char == "]" and self._expected != "value":
+                self._expected = "end"
+                position += 1
+            elif self._expected == "comma_or_end":
+                if char != ",":
+                    raise ValueError(
+                        f"Expected ',' or ']' in the JSON array, got {char!r}."
+                    )
+                self._expected = "value"
+                position += 1
+            else:
+                try:
+                    record, end = self._json_decoder.raw_decode(text, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # The element continues in the next chunk
+                    break
+                if end == len(text) and not final:
+                    # A number may continue in the next chunk
+                    break
+                records.append(record)
+                self._expected = "comma_or_end"
+                position = end
+        self._text = text[position:]
+        self._add_records(records)
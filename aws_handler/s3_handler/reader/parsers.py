@@ -0,0 +1,770 @@
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import codecs
+import csv
+import importlib.util
+import io
+
+import numpy as np
+import pandas as pd
+
+from aws_handler.s3_handler.reader.json_parsers import (
+    JsonArrayChunkParser,
+    NdjsonChunkParser,
+    read_ndjson,
+)
+from aws_handler.s3_handler.reader.xml_parsers import XmlChunkParser
+from aws_handler.util.arrow import ARROW_FILE_TYPES, read_arrow_file
+from aws_handler.util.buffer_reader import open_buffer
+from aws_handler.util.compression import open_decompressed
+from aws_handler.util.encoding import EncodingDetector
+from aws_handler.util.json_engine import NDJSON_FILE_TYPES, load_json
+
+# File types parsed while being decompressed, without holding the whole
+# decompressed content in memory
+STREAMED_FILE_TYPES = ("csv", "json", "xml") + NDJSON_FILE_TYPES
+
+# File types that can be read in chunks with `read_file_by_chunks`
+CHUNKED_FILE_TYPES = ("csv", "json", "xlsx", "xml") + NDJSON_FILE_TYPES
+
+# File types that can be parsed by `parse_file_content`
+SUPPORTED_FILE_TYPES = (
+    (
+        "json",
+        "csv",
+        "xlsx",
+        "xml",
+        "txt",
+    )
+    + ARROW_FILE_TYPES
+    + NDJSON_FILE_TYPES
+)
+
+# File types whose content is text and needs its encoding detected
+TEXT_FILE_TYPES = ("csv", "txt")
+
+# Number of bytes at the start of a CSV file used to detect its delimiter
+CSV_SNIFF_SIZE = 64 * 1024
+
+# Default pandas engine used to parse CSV files
+DEFAULT_CSV_ENGINE = "c"
+
+# Number of rows of each DataFrame yielded when streaming an Excel sheet
+DEFAULT_EXCEL_CHUNK_ROWS = 10000
+
+# Default number of bytes downloaded at a time when streaming a file
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Chunk size of the CSV reads limited to a number of rows, smaller so the
+# download stops soon after the last row
+ROW_LIMIT_CHUNK_SIZE = 1024 * 1024
+
+
+def get_first_last_line(decoded_content: str) -> Tuple[str, str]:
+    """
+    Get the first and the last lines in a CSV file wrapped in a string.
+
+    :param decoded_content: Content of the CSV file as a string.
+    :return: The last and first lines.
+    """
+    first_line = decoded_content.partition("\n")[0]
+    last_line = decoded_content.rpartition("\n")[-1]
+    return (first_line, last_line)
+
+
+def sniff_delimiter(line: str) -> str:
+    """
+    Detect the delimiter of a CSV line.
+
+    :param line: A line of the CSV file, usually the header.
+    :return: The detected delimiter.
+    """
+    sniffer = csv.Sniffer()
+    dialect = sniffer.sniff(line)
+    return dialect.delimiter
+
+
+def sniff_csv_delimiter(
+    file_content: bytes,
+    encoding: str,
+    skiprows: Optional[Union[int, List[int], Callable]] = None,
+) -> str:
+    """
+    Detect the delimiter of a CSV file from its header, decoding only the
+    head of the content (through a memoryview, without copying the rest).
+
+    :param file_content: The raw content of the CSV file.
+    :param encoding: The encoding of the content.
+    :param skiprows: Optional lines skipped before the header, as in
+    `pd.read_csv`.
+    :return: The detected delimiter.
+    """
+    with memoryview(file_content) as content_view:
+        head = str(content_view[:CSV_SNIFF_SIZE], encoding, errors="ignore")
+    if skiprows:
+        if isinstance(skiprows, int):
+            skiprows = range(skiprows)
+        is_skipped = (
+            skiprows if callable(skiprows) else set(skiprows).__contains__
+        )
+        lines = head.split("\n")
+        head = next(
+            (
+                line
+                for index, line in enumerate(lines)
+                if not is_skipped(index)
+            ),
+            "",
+        )
+    first_line, _ = get_first_last_line(decoded_content=head)
+    return sniff_delimiter(first_line)
+
+
+def open_file_content(
+    file_content: bytes, compression: Optional[str] = None
+) -> io.IOBase:
+    """
+    Open the raw content of a file as a binary stream, decompressing it as
+    it is read if the file is compressed.
+
+    :param file_content: The raw content of the file, any bytes-like object.
+    :param compression: The compression of the file, None if uncompressed.
+    :return: A binary stream over the (decompressed) content.
+    """
+    content_stream = open_buffer(file_content)
+    if compression is None:
+        return content_stream
+    return open_decompressed(content_stream, compression)
+
+
+def read_file_content(file_content: bytes, compression: str) -> bytes:
+    """
+    Decompress the whole content of a compressed file.
+
+    :param file_content: The raw content of the file, any bytes-like object.
+    :param compression: The compression of the file.
+    :return: The decompressed content.
+    """
+    with open_file_content(file_content, compression) as content_stream:
+        return content_stream.read()
+
+
+def read_content_head(
+    file_content: bytes, size: int, compression: Optional[str] = None
+) -> bytes:
+    """
+    Read the start of the (decompressed) content of a file, decompressing
+    only what is needed.
+
+    :param file_content: The raw content of the file, any bytes-like object.
+    :param size: The number of bytes to read.
+    :param compression: The compression of the file, None if uncompressed.
+    :return: The first `size` bytes (or less) of the content.
+    """
+    with open_file_content(file_content, compression) as content_stream:
+        return content_stream.read(size)
+
+
+def get_excel_engine(engine: Optional[str] = None) -> str:
+    """
+    Get the pandas engine used to read Excel files.
+
+    :param engine: Optional engine requested by the caller.
+    :return: The requested engine, or "calamine" (Rust-based, much faster)
+    when `python-calamine` is installed, otherwise "openpyxl".
+    """
+    if engine is not None:
+        return engine
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "openpyxl"
+
+
+def read_excel(
+    file_content: bytes,
+    sheet_name: Optional[Union[str, int, List]] = None,
+    engine: Optional[str] = None,
+    usecols: Optional[Union[List, Callable]] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+    nrows: Optional[int] = None,
+    skiprows: Optional[Union[int, List[int], Callable]] = None,
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Parse an Excel workbook, opening it only once.
+
+    :param file_content: The raw content of the workbook.
+    :param sheet_name: The sheet(s) to read, by name or position. If None,
+    the only sheet of the workbook, or every sheet if there are several.
+    :param engine: Optional pandas engine, see `get_excel_engine`.
+    :param usecols: Optional subset of the columns to parse.
+    :param dtype: Optional dtype (or dtype per column) to use.
+    :param nrows: Optional number of rows to parse per sheet.
+    :param skiprows: Optional rows to skip, as in `pd.read_excel`.
+    :return: A DataFrame for a single sheet, a dictionary of DataFrames by
+    sheet name otherwise.
+    """
+    with pd.ExcelFile(
+        open_buffer(file_content), engine=get_excel_engine(engine)
+    ) as excel_file:
+        if sheet_name is None and len(excel_file.sheet_names) == 1:
+            sheet_name = 0
+        return excel_file.parse(
+            sheet_name=sheet_name,
+            usecols=usecols,
+            dtype=dtype,
+            nrows=nrows,
+            skiprows=skiprows,
+        )
+
+
+def iter_excel_batches(
+    file_content: bytes,
+    sheet_name: Optional[Union[str, int]] = None,
+    chunk_rows: Optional[int] = None,
+    usecols: Optional[List[Union[str, int]]] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+    nrows: Optional[int] = None,
+    skiprows: int = 0,
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Stream the rows of an Excel sheet in batches, with openpyxl in read-only
+    mode: the rows are read from the sheet XML as they are needed, so only
+    one batch is held in memory instead of the whole workbook.
+
+    :param file_content: The raw content of the workbook.
+    :param sheet_name: The sheet to read, by name or position, the first
+    one by default.
+    :param chunk_rows: Number of rows of each DataFrame (the last one may be
+    shorter), DEFAULT_EXCEL_CHUNK_ROWS by default.
+    :param usecols: Optional subset of the columns to parse, by name or
+    position.
+    :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+    :param nrows: Optional maximum number of rows to read.
+    :param skiprows: Number of rows skipped before the header.
+    :return: A generator yielding DataFrames with the header columns.
+    """
+    chunk_rows = chunk_rows or DEFAULT_EXCEL_CHUNK_ROWS
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(
+        open_buffer(file_content),
+        read_only=True,
+        data_only=True,
+        keep_links=False,
+    )
+    try:
+        if sheet_name is None or isinstance(sheet_name, int):
+            worksheet = workbook.worksheets[sheet_name or 0]
+        else:
+            worksheet = workbook[sheet_name]
+        rows = worksheet.iter_rows(min_row=skiprows + 1, values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            name if name is not None else f"Unnamed: {index}"
+            for index, name in enumerate(header)
+        ]
+        if usecols is not None:
+            column_indexes = [
+                column if isinstance(column, int) else columns.index(column)
+                for column in usecols
+            ]
+            columns = [columns[index] for index in column_indexes]
+        else:
+            column_indexes = range(len(columns))
+
+        batch = []
+        rows_left = nrows
+        for row in rows:
+            if rows_left is not None and rows_left <= 0:
+                break
+            # Blank rows are skipped, as by `pd.read_excel`
+            if all(value is None for value in row):
+                continue
+            batch.append(
+                [
+                    row[index] if index < len(row) else None
+                    for index in column_indexes
+                ]
+            )
+            if rows_left is not None:
+                rows_left -= 1
+            if len(batch) == chunk_rows:
+                yield _excel_batch_to_dataframe(batch, columns, dtype)
+                batch = []
+        if batch:
+            yield _excel_batch_to_dataframe(batch, columns, dtype)
+    finally:
+        # Read-only workbooks keep the archive open until closed
+        workbook.close()
+
+
+def _excel_batch_to_dataframe(
+    batch: List[List], columns: List[str], dtype: Optional[Union[str, Dict]]
+) -> pd.DataFrame:
+    """
+    Build the DataFrame of a batch of Excel rows.
+
+    :param batch: The values of the rows.
+    :param columns: The names of the columns.
+    :param dtype: Optional dtype (or dtype per column) of the DataFrame.
+    :return: The DataFrame of the batch.
+    """
+    df = pd.DataFrame(batch, columns=columns)
+    if dtype is None:
+        # Infer the types as `pd.read_excel` does for object columns
+        return df.infer_objects()
+    return df.astype(dtype)
+
+
+def needs_encoding_detection(
+    file_type: str, custom_encoding: str = ""
+) -> bool:
+    """
+    Check whether the encoding of a file has to be detected before parsing
+    it. Binary and self-describing formats (JSON, Excel, XML) do not use the
+    detected encoding, and a custom encoding overrides it.
+
+    :param file_type: The extension of the file.
+    :param custom_encoding: Custom encoding given by the caller.
+    :return: True if the encoding has to be detected.
+    """
+    return file_type in TEXT_FILE_TYPES and custom_encoding == ""
+
+
+def parse_file_content(
+    file_type: str,
+    file_content: bytes,
+    encoding: str,
+    custom_encoding: str = "",
+    engine: str = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    usecols: Optional[Union[List, Callable]] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+    nrows: Optional[int] = None,
+    skiprows: Optional[Union[int, List[int], Callable]] = None,
+    compression: Optional[str] = None,
+    sheet_name: Optional[Union[str, int, List]] = None,
+    encoding_detector: Optional[Callable[[bytes], Optional[str]]] = None,
+) -> Union[pd.DataFrame, dict, Tuple[bytes, str], None]:
+    """
+    Parse the content of a file downloaded from S3.
+
+    :param file_type: The extension of the file.
+    :param file_content: The raw content of the file, any bytes-like object
+    (bytes, bytearray, mmap).
+    :param encoding: The detected encoding of the content.
+    :param custom_encoding: Custom encoding, overrides the detected one.
+    :param engine: Parser engine. For CSV files, the pandas engine: "c"
+    (default), "pyarrow" or "python". For Excel files, "calamine" or
+    "openpyxl" (see `get_excel_engine`). For JSON files, "orjson" or "json"
+    (see `get_json_engine`).
+    :param columns: For Parquet and Arrow files, the columns to read.
+    :param filters: For Parquet and Arrow files, row filters in the pyarrow
+    DNF format, e.g. [("year", "=", 2024)].
+    :param usecols: For CSV, Excel and NDJSON files, the subset of columns
+    to parse.
+    :param dtype: For CSV, Excel and NDJSON files, the dtype (or dtype per
+    column) to use.
+    :param nrows: For CSV, Excel and NDJSON files, the number of rows to
+    parse.
+    :param skiprows: For CSV and Excel files, the rows to skip, as in
+    `pd.read_csv`.
+    :param compression: The compression of the file, None if uncompressed.
+    CSV, JSON, NDJSON and XML files are decompressed while being parsed, the
+    other types are decompressed first.
+    :param sheet_name: For Excel files, the sheet(s) to read, by name or
+    position. If None, the only sheet of the workbook, or a dictionary of
+    every sheet if there are several.
+    :param encoding_detector: For compressed CSV and text files, the function
+    detecting the encoding of the decompressed content, such as the
+    `s3_detect_encoding` method of the connector. A new `EncodingDetector` by
+    default.
+    :return: The parsed file data, None if the file type is not supported.
+    """
+    is_compressed = compression is not None
+    if encoding_detector is None:
+        encoding_detector = EncodingDetector().detect
+    if is_compressed and file_type not in STREAMED_FILE_TYPES:
+        # Random access formats need the whole decompressed content
+        file_content = read_file_content(file_content, compression)
+        compression = None
+
+    if file_type == "json":
+        return load_json(open_file_content(file_content, compression), engine)
+    elif file_type in NDJSON_FILE_TYPES:
+        return read_ndjson(
+            open_file_content(file_content, compression),
+            usecols=usecols,
+            dtype=dtype,
+            nrows=nrows,
+            engine=engine,
+            encoding=custom_encoding or None,
+        )
+    elif file_type == "csv":
+        head = read_content_head(file_content, CSV_SNIFF_SIZE, compression)
+        encoding = encoding if custom_encoding == "" else custom_encoding
+        if not encoding and is_compressed:
+            # The encoding can only be detected after the decompression
+            encoding = encoding_detector(head)
+        encoding = encoding or "utf-8"
+        delimiter = sniff_csv_delimiter(head, encoding, skiprows)
+        df = pd.read_csv(
+            open_file_content(file_content, compression),
+            encoding=encoding,
+            engine=engine or DEFAULT_CSV_ENGINE,
+            sep=delimiter,
+            usecols=usecols,
+            dtype=dtype,
+            nrows=nrows,
+            skiprows=skiprows,
+        )
+        return df
+    elif file_type == "xlsx":
+        return read_excel(
+            file_content,
+            sheet_name=sheet_name,
+            engine=engine,
+            usecols=usecols,
+            dtype=dtype,
+            nrows=nrows,
+            skiprows=skiprows,
+        )
+    elif file_type == "xml":
+        # Parsed from the bytes, as encoded in the XML declaration
+        import xmltodict
+
+        return xmltodict.parse(open_file_content(file_content, compression))
+    elif file_type == "txt":
+        if is_compressed and not (custom_encoding or encoding):
+            encoding = encoding_detector(file_content)
+        return file_content, custom_encoding or encoding
+    elif file_type in ARROW_FILE_TYPES:
+        return read_arrow_file(
+            open_buffer(file_content), file_type, columns, filters
+        )
+    return None
+
+
+def get_chunk_parser(
+    file_type: str,
+    chunk_rows: Optional[int] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+    engine: str = None,
+    usecols: Optional[Union[List, Callable]] = None,
+    skiprows: int = 0,
+    nrows: Optional[int] = None,
+    as_records: bool = False,
+    xml_item: Optional[Union[str, int]] = None,
+) -> "ChunkParser":
+    """
+    Create the parser turning the consecutive chunks of a streamed file
+    into DataFrames. Every parser has the same `feed(chunk, encoding)`,
+    `finish()` and `done` interface.
+
+    :param file_type: "csv", "json" (a top-level array), "jsonl", "ndjson"
+    or "xml".
+    :param chunk_rows: Number of rows of each DataFrame. If None, a
+    DataFrame with all the complete rows is returned per chunk.
+    :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+    :param engine: For CSV files, the pandas engine. For NDJSON files, the
+    JSON engine.
+    :param usecols: Optional subset of the columns to parse.
+    :param skiprows: For CSV files, the number of rows skipped before the
+    header.
+    :param nrows: Optional maximum number of rows to parse.
+    :param as_records: For JSON and XML files, yield lists of the parsed
+    records instead of DataFrames.
+    :param xml_item: For XML files, the repeated element to parse, as a
+    path of tag names or a depth (see `XmlChunkParser`).
+    :return: The chunk parser.
+    """
+    if file_type == "csv":
+        return CsvChunkParser(
+            chunk_rows=chunk_rows,
+            dtype=dtype,
+            engine=engine,
+            usecols=usecols,
+            skiprows=skiprows,
+            nrows=nrows,
+        )
+    if file_type in NDJSON_FILE_TYPES:
+        return NdjsonChunkParser(
+            chunk_rows=chunk_rows,
+            dtype=dtype,
+            usecols=usecols,
+            nrows=nrows,
+            as_records=as_records,
+            engine=engine,
+        )
+    if file_type == "json":
+        return JsonArrayChunkParser(
+            chunk_rows=chunk_rows,
+            dtype=dtype,
+            usecols=usecols,
+            nrows=nrows,
+            as_records=as_records,
+        )
+    if file_type == "xml":
+        return XmlChunkParser(
+            item=xml_item,
+            chunk_rows=chunk_rows,
+            dtype=dtype,
+            usecols=usecols,
+            nrows=nrows,
+            as_records=as_records,
+        )
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+
+def find_row_ends(data: bytes, quotechar: str = '"') -> np.ndarray:
+    """
+    Find the end of every complete row in a block of CSV data, ignoring the
+    newlines inside quoted fields. A newline ends a row when the number of
+    quote characters before it is even (escaped quotes come in pairs).
+
+    :param data: CSV data starting at the beginning of a row, in an
+    ASCII-compatible encoding.
+    :param quotechar: The character used to quote fields.
+    :return: The offsets right after the newline of every complete row.
+    """
+    content = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(content == ord("\n"))
+    quotes = np.flatnonzero(content == ord(quotechar))
+    if len(quotes) == 0:
+        return newlines + 1
+    quotes_before = np.searchsorted(quotes, newlines)
+    return newlines[(quotes_before & 1) == 0] + 1
+
+
+class CsvChunkParser:
+    def __init__(
+        self,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        engine: str = None,
+        usecols: Optional[Union[List, Callable]] = None,
+        skiprows: int = 0,
+        nrows: Optional[int] = None,
+    ):
+        """
+        Initialize a CsvChunkParser object.
+
+        The parser turns consecutive chunks of a CSV file into DataFrames.
+        The delimiter and the header are read once, from the first row. The
+        bytes after the last complete row of a chunk (including rows split
+        inside a quoted field) are carried over to the next one, so the
+        content is never decoded or re-encoded by the parser itself.
+
+        :param chunk_rows: Number of rows of each DataFrame. If None, a
+        DataFrame with all the complete rows is returned per chunk.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames,
+        to keep the same types in every DataFrame.
+        :param engine: The pandas engine used to parse the rows: "c"
+        (default), "pyarrow" or "python".
+        :param usecols: Optional subset of the columns to parse (names,
+        positions or a callable, as in `pd.read_csv`).
+        :param skiprows: Number of rows skipped at the start of the file,
+        before the header.
+        :param nrows: Optional maximum number of rows to parse, the rows
+        after it are ignored.
+        """
+        if chunk_rows is not None and chunk_rows < 1:
+            raise ValueError("chunk_rows must be a positive number.")
+        if not isinstance(skiprows, int) or skiprows < 0:
+            raise ValueError("skiprows must be a non-negative integer.")
+        self._chunk_rows = chunk_rows
+        self._dtype = dtype
+        self._engine = engine or DEFAULT_CSV_ENGINE
+        self._usecols = usecols
+        self._rows_to_skip = skiprows
+        self._rows_left = nrows
+        self._buffer = bytearray()
+        # Ends of the complete rows found in the buffer so far
+        self._row_ends = np.empty(0, dtype=np.intp)
+        self._columns: Optional[List[str]] = None
+        self._delimiter = ","
+        self._encoding = "utf-8"
+
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """
+        Get the columns of the CsvChunkParser object, None until the header
+        has been read.
+        """
+        return self._columns
+
+    @property
+    def done(self) -> bool:
+        """
+        Get whether the CsvChunkParser object has parsed nrows rows, so the
+        rest of the file can be skipped.
+        """
+        return self._rows_left is not None and self._rows_left <= 0
+
+    def feed(
+        self, chunk: bytes, encoding: Optional[str]
+    ) -> List[pd.DataFrame]:
+        """
+        Parse the next chunk of the CSV file.
+
+        :param chunk: The raw content of the chunk.
+        :param encoding: The encoding of the file.
+        :return: The DataFrames completed by the chunk (possibly none).
+        """
+        if self.done:
+            return []
+        self._buffer += chunk
+        self._scan_rows()
+        if self._columns is None and not self._read_header(encoding):
+            return []
+
+        row_ends = self._row_ends
+        if self._rows_left is not None:
+            row_ends = row_ends[: self._rows_left]
+        if len(row_ends) == 0:
+            return []
+        if self._chunk_rows is None:
+            batch_ends = row_ends[-1:]
+        else:
+            batch_ends = row_ends[self._chunk_rows - 1 :: self._chunk_rows]
+            if len(row_ends) == self._rows_left and (
+                len(batch_ends) == 0 or batch_ends[-1] != row_ends[-1]
+            ):
+                # The last rows before the limit make a shorter batch
+                batch_ends = np.append(batch_ends, row_ends[-1])
+            if len(batch_ends) == 0:
+                # Not enough rows for a batch yet, keep them buffered
+                return []
+        if self._rows_left is not None:
+            self._rows_left -= (
+                int(np.searchsorted(row_ends, batch_ends[-1])) + 1
+            )
+        return self._parse_batches(batch_ends)
+
+    def finish(self) -> List[pd.DataFrame]:
+        """
+        Parse the rows left once the whole file has been fed, including a
+        last row without a trailing newline.
+
+        :return: The remaining DataFrames (possibly none).
+        """
+        if self.done:
+            return []
+        if self._columns is None:
+            self._buffer += b"\n"
+            self._scan_rows()
+            if not self._read_header(None):
+                return []
+        if not self._buffer.strip():
+            return []
+        dfs = self._parse_batches([len(self._buffer)])
+        if self._rows_left is not None:
+            # The last row may not end with a newline
+            dfs = [df.iloc[: self._rows_left] for df in dfs]
+            self._rows_left -= sum(len(df) for df in dfs)
+        return dfs
+
+    def _scan_rows(self):
+        """
+        Find the ends of the rows completed by the last chunk, scanning the
+        buffer from the end of the last known row only.
+        """
+        scan_start = int(self._row_ends[-1]) if len(self._row_ends) else 0
+        with memoryview(self._buffer) as buffer_view:
+            new_row_ends = find_row_ends(buffer_view[scan_start:])
+        self._row_ends = np.concatenate(
+            [self._row_ends, new_row_ends + scan_start]
+        )
+
+    def _drop_rows(self, end: int):
+        """
+        Drop the rows before an offset from the buffer.
+
+        :param end: The offset where the dropped rows end.
+        """
+        del self._buffer[:end]
+        self._row_ends = self._row_ends[self._row_ends > end] - end
+
+    def _read_header(self, encoding: Optional[str]) -> bool:
+        """
+        Read the header and detect the delimiter once the first row is
+        complete.
+
+        :param encoding: The encoding of the file.
+        :return: True if the header has been read.
+        """
+        # ASCII is only detected from a sample, the rest may be UTF-8
+        if encoding and codecs.lookup(encoding).name != "ascii":
+            self._encoding = encoding
+
+        if self._rows_to_skip and len(self._row_ends):
+            skipped_rows = min(self._rows_to_skip, len(self._row_ends))
+            self._drop_rows(int(self._row_ends[skipped_rows - 1]))
+            self._rows_to_skip -= skipped_rows
+        if self._rows_to_skip or len(self._row_ends) == 0:
+            return False
+
+        header_end = int(self._row_ends[0])
+        header = bytes(self._buffer[:header_end])
+        self._delimiter = sniff_delimiter(
+            header.decode(self._encoding, errors="ignore")
+        )
+        self._columns = pd.read_csv(
+            io.BytesIO(header),
+            encoding=self._encoding,
+            sep=self._delimiter,
+            nrows=0,
+        ).columns.tolist()
+        self._drop_rows(header_end)
+        return True
+
+    def _parse_batches(self, batch_ends: Iterable[int]) -> List[pd.DataFrame]:
+        """
+        Parse the buffered rows into one DataFrame per batch and drop them
+        from the buffer.
+
+        :param batch_ends: The offset where each batch ends.
+        :return: A DataFrame per batch.
+        """
+        dfs = []
+        start = 0
+        with memoryview(self._buffer) as buffer_view:
+            for end in batch_ends:
+                # Each batch is copied once: pandas reads a BytesIO faster
+                # than a reader over the view, which would also have to be
+                # released before the buffer is resized
+                dfs.append(
+                    pd.read_csv(
+                        io.BytesIO(bytes(buffer_view[start:end])),
+                        encoding=self._encoding,
+                        engine=self._engine,
+                        sep=self._delimiter,
+                        header=None,
+                        names=self._columns,
+                        usecols=self._usecols,
+                        index_col=False,
+                        dtype=self._dtype,
+                    )
+                )
+                start = end
+        self._drop_rows(start)
+        return dfs
+
+
+# Parsers of the files streamed in chunks, see `get_chunk_parser`
+ChunkParser = Union[
+    CsvChunkParser, JsonArrayChunkParser, NdjsonChunkParser, XmlChunkParser
+]
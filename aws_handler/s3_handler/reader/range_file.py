@@ -0,0 +1,132 @@
+from typing import Optional
+import io
+
+from aws_handler.aws_integration import AwsConnector
+
+
+class S3RangeFile(io.RawIOBase):
+    def __init__(
+        self,
+        aws_connector: AwsConnector,
+        bucket: str,
+        key: str,
+        size: int,
+        etag: Optional[str] = None,
+        min_read_size: int = 64 * 1024,
+    ):
+        """
+        Initialize a S3RangeFile object.
+
+        A read-only, seekable binary stream over an S3 object, where every
+        read is a byte-range GET. Columnar readers (Parquet, Arrow IPC) only
+        read the footer and the parts they need, so most of the object is
+        never downloaded. Small reads fetch at least `min_read_size` bytes,
+        and the last fetched block is kept to serve the following small
+        reads (such as the reads of the footer).
+
+        :param aws_connector: AWS connector object used for S3 interactions.
+        :param bucket: The name of the S3 bucket.
+        :param key: The key of the object.
+        :param size: The size in bytes of the object.
+        :param etag: Optional ETag of the object, reads fail if the object
+        changes.
+        :param min_read_size: Minimum number of bytes fetched per request.
+        """
+        super().__init__()
+        self._aws_connector = aws_connector
+        self._bucket = bucket
+        self._key = key
+        self._size = size
+        self._etag = etag
+        self._min_read_size = min_read_size
+        self._position = 0
+        self._block_start = 0
+        self._block = b""
+        self._bytes_fetched = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Get the size of the S3RangeFile object.
+        """
+        return self._size
+
+    @property
+    def bytes_fetched(self) -> int:
+        """
+        Get the number of bytes downloaded by the S3RangeFile object.
+        """
+        return self._bytes_fetched
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._position
+        end = self._size if size is None or size < 0 else start + size
+        end = min(end, self._size)
+        if end <= start:
+            return b""
+
+        block_end = self._block_start + len(self._block)
+        if not (self._block_start <= start and end <= block_end):
+            if end - start >= self._min_read_size:
+                # Large reads are returned as fetched, without being kept
+                data = self._fetch(start, end)
+                self._position += len(data)
+                return data
+
+            fetch_start, fetch_end = start, start + self._min_read_size
+            if fetch_end >= self._size:
+                # Reads near the end of the file are usually footer reads
+                fetch_start = max(0, self._size - self._min_read_size)
+                fetch_end = self._size
+            self._block = self._fetch(fetch_start, fetch_end)
+            self._block_start = fetch_start
+
+        offset = start - self._block_start
+        data = self._block[offset : offset + end - start]
+        self._position += len(data)
+        return data
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        """
+        Download a byte range of the object.
+
+        :param start: The offset of the first byte.
+        :param end: The offset after the last byte.
+        :return: The bytes of the range.
+        """
+        data = self._aws_connector.s3_read_range(
+            self._bucket, self._key, start, end, etag=self._etag
+        )
+        self._bytes_fetched += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        memoryview(buffer).cast("B")[: len(data)] = data
+        return len(data)
@@ -1,180 +1,531 @@
-from typing import Dict, Generator, List, Tuple, Union
-
-import csv
-import io
-import json
-import xmltodict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
+from typing import Any, Callable, Dict, Generator, List, Tuple, Union
 
 import pandas as pd
 
-from aws_handler.aws_integration import AwsConnector, Boto3Connector
+from aws_handler.aws_integration import AwsConnector
+from aws_handler.s3_handler.cache import ParsedResultCache
+from aws_handler.s3_handler.index import ListingIndex
 from aws_handler.s3_handler.models import UrlFile, UrlFileCollection
+from aws_handler.s3_handler.reader.parsers import (
+    CHUNKED_FILE_TYPES,
+    DEFAULT_CHUNK_SIZE,
+    ROW_LIMIT_CHUNK_SIZE,
+    SUPPORTED_FILE_TYPES,
+    ChunkParser,
+    get_chunk_parser,
+    iter_excel_batches,
+    needs_encoding_detection,
+    parse_file_content,
+    read_file_content,
+)
+from aws_handler.s3_handler.reader.range_file import S3RangeFile
+from aws_handler.util.arrow import ARROW_FILE_TYPES, read_arrow_file
+from aws_handler.util.compression import StreamDecompressor
+from aws_handler.util.json_engine import NDJSON_FILE_TYPES
+from aws_handler.util.keyword_matcher import KeywordMatcher
+from aws_handler.util.logger import log
 
 
 class S3Reader:
-    def __init__(self, bucket: str, aws_connector: AwsConnector = None):
+    def __init__(
+        self,
+        bucket: str,
+        aws_connector: AwsConnector = None,
+        listing_index: ListingIndex = None,
+        result_cache: ParsedResultCache = None,
+    ):
         """
         Initialize a S3Writer object.
 
         :param bucket: The name of the S3 bucket.
         :param aws_connector: AWS connector object used for S3 interactions.
+        :param listing_index: Optional local index used to search files
+        without listing the bucket on every call.
+        :param result_cache: Optional in-memory cache of the parsed files
+        returned by `read_file`.
         """
         self._bucket = bucket
-        self._aws_connector = (
-            aws_connector if aws_connector else Boto3Connector()
-        )
+        if not aws_connector:
+            # Imported on use, so boto3 is not loaded with a custom connector
+            from aws_handler.aws_integration import Boto3Connector
 
-    def retrieve_files(
-        self, path: str, keywords: List[str]
-    ) -> Dict[str, UrlFileCollection]:
+            aws_connector = Boto3Connector()
+        self._aws_connector = aws_connector
+        self._listing_index = listing_index
+        self._result_cache = result_cache
+
+    def _iter_indexed_files(
+        self, path: str, keywords: List[str], match_mode: str
+    ) -> Generator[Tuple[str, Dict[str, str]], None, None]:
         """
-        Retrieve file information from S3 and store it as UrlFile instances.
+        Refresh the listing index of a path and search the files locally.
+
+        :param path: A common folder for all the files to be searched.
+        :param keywords: List of keywords to search for files.
+        :param match_mode: How the keywords are interpreted.
+        :return: A generator yielding tuples of (keyword, file information).
         """
-        files_per_keyword: Dict[str, UrlFileCollection] = {}
-        files_path_per_keyword = self._aws_connector.s3_list_files(
-            bucket=self._bucket, folder=path, keywords=keywords
+        keyword_matcher = KeywordMatcher(
+            keywords if keywords is not None else [""], mode=match_mode
         )
+        self._listing_index.refresh(self._aws_connector, self._bucket, path)
+        for file_info in self._listing_index.iter_files(self._bucket, path):
+            for keyword in keyword_matcher.match(file_info["file_path"]):
+                yield keyword, file_info
 
-        for keyword, file_list in files_path_per_keyword.items():
-            url_file_objects = UrlFileCollection()
+    def iter_files(
+        self, path: str, keywords: List[str], match_mode: str = "glob"
+    ) -> Generator[Tuple[str, UrlFile], None, None]:
+        """
+        Lazily retrieve file information from S3 as UrlFile instances.
 
-            for file_info in file_list:
-                url_file_obj = UrlFile(
-                    s3_url=file_info["file_path"],
-                    last_modified=file_info["last_modified"],
-                )
-                url_file_objects.add_url_file_object(url_file_obj)
+        Files are yielded while the listing is still being paginated, so the
+        memory usage does not depend on the number of objects under the path.
 
-            url_file_objects.order_files_by_last_modified_or_name()
-            files_per_keyword[keyword] = url_file_objects
+        :param path: A common folder for all the files to be searched.
+        :param keywords: List of keywords to search for files.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+        :return: A generator yielding tuples of (keyword, UrlFile).
+        """
+        if self._listing_index is not None:
+            files = self._iter_indexed_files(path, keywords, match_mode)
+        else:
+            files = self._aws_connector.s3_iter_files(
+                bucket=self._bucket,
+                folder=path,
+                keywords=keywords,
+                match_mode=match_mode,
+            )
 
-        return files_per_keyword
+        for keyword, file_info in files:
+            url_file_obj = UrlFile(
+                s3_url=file_info["file_path"],
+                last_modified=file_info["last_modified"],
+                size=file_info.get("size"),
+                etag=file_info.get("etag"),
+            )
+            yield keyword, url_file_obj
 
-    def _get_decoded_content_first_last_line(
-        self, decoded_content: str
-    ) -> Tuple[str, str]:
+    def retrieve_files(
+        self, path: str, keywords: List[str], match_mode: str = "glob"
+    ) -> Dict[str, UrlFileCollection]:
         """
-        Get the first and the last lines in a CSV file wrapped in a string.
+        Retrieve file information from S3 and store it as UrlFile instances.
 
-        :param decoded_content: Content of the CSV file as a string.
-        :return: The last and first lines.
+        :param path: A common folder for all the files to be searched.
+        :param keywords: List of keywords to search for files.
+        :param match_mode: How the keywords are interpreted: "glob",
+        "anchored" or "regex".
+        :return: A dictionary with a UrlFileCollection per keyword.
         """
-        first_line = decoded_content.partition("\n")[0]
-        last_line = decoded_content.rpartition("\n")[-1]
-        return (first_line, last_line)
+        files_per_keyword: Dict[str, UrlFileCollection] = {
+            keyword: UrlFileCollection() for keyword in keywords or []
+        }
+
+        for keyword, url_file_obj in self.iter_files(
+            path, keywords, match_mode
+        ):
+            if keyword not in files_per_keyword:
+                files_per_keyword[keyword] = UrlFileCollection()
+            files_per_keyword[keyword].add_url_file_object(url_file_obj)
+
+        for url_file_objects in files_per_keyword.values():
+            url_file_objects.order_files_by_last_modified_or_name()
+
+        return files_per_keyword
 
     def read_file(
-        self, file_object: UrlFile, custom_encoding: str = ""
+        self,
+        file_object: UrlFile,
+        custom_encoding: str = "",
+        engine: str = None,
+        columns: List[str] = None,
+        filters: List = None,
+        usecols: Union[List, Callable] = None,
+        dtype: Union[str, Dict] = None,
+        nrows: int = None,
+        skiprows: int = None,
+        sheet_name: Union[str, int, List] = None,
     ) -> Union[pd.DataFrame, dict, bytes, None]:
         """
         Read a file from S3 based on a UrlFile.
 
+        When columns or filters are given, Parquet and Arrow (Feather) files
+        are read with byte-range requests: only the footer and the data of
+        the selected columns (and, for Parquet, of the row groups matching
+        the filters) are downloaded.
+
+        When nrows is given, CSV and NDJSON files are streamed and the
+        download stops once the rows are parsed.
+
+        Compressed files ("data.csv.gz", see `UrlFile.compression`) are
+        decompressed while they are parsed.
+
         :param file_object: The UrlFile to be read
         :param custom_encoding: Custom encoding.
-        :return: The parsed file data
+        :param engine: Parser engine. For CSV files, the pandas engine: "c"
+        (default), "pyarrow" or "python". For Excel files, "calamine" or
+        "openpyxl" (calamine by default when `python-calamine` is installed).
+        For JSON and NDJSON files, "orjson" or "json" (orjson by default when
+        it is installed).
+        :param columns: For Parquet and Arrow files, the columns to read.
+        :param filters: For Parquet and Arrow files, row filters in the
+        pyarrow DNF format, e.g. [("year", "=", 2024)].
+        :param usecols: For CSV, Excel and NDJSON files, the subset of
+        columns to parse (names, positions or a callable, as in
+        `pd.read_csv`).
+        :param dtype: For CSV, Excel and NDJSON files, the dtype (or dtype
+        per column) to use.
+        :param nrows: For CSV, Excel and NDJSON files, the number of rows to
+        parse.
+        :param skiprows: For CSV and Excel files, the rows to skip, as in
+        `pd.read_csv`.
+        :param sheet_name: For Excel files, the sheet(s) to read, by name or
+        position. If None, the only sheet of the workbook, or a dictionary of
+        every sheet if there are several.
+        :return: The parsed file data. NDJSON files (".jsonl", ".ndjson")
+        are returned as a DataFrame with a row per line.
         """
-        file_path = file_object.s3_url
         file_type = file_object.file_extension
+        if file_type not in SUPPORTED_FILE_TYPES:
+            return None
 
-        if file_type == "json":
-            file_content, _ = self._aws_connector.s3_read_file(
-                self._bucket, key=file_path, raw=True
-            )
-            return json.loads(file_content)
-        elif file_type == "csv":
-            file_content, encoding = self._aws_connector.s3_read_file(
-                self._bucket, key=file_path, bytes_=True
+        # Files are cached per version, unknown versions are not cached
+        version = file_object.etag or file_object.last_modified
+        cache_key = (
+            file_object.s3_url,
+            version,
+            custom_encoding,
+            engine,
+            tuple(columns) if columns is not None else None,
+            repr(filters),
+            repr((usecols, dtype, nrows, skiprows, sheet_name)),
+        )
+        if self._result_cache is not None and version:
+            found, result = self._result_cache.get(cache_key)
+            if found:
+                return result
+
+        dfs = None
+        if (
+            file_type in ("csv",) + NDJSON_FILE_TYPES
+            and nrows is not None
+            and nrows > 0
+            and isinstance(skiprows, (int, type(None)))
+        ):
+            # Stream the rows to stop the download as soon as possible
+            dfs = list(
+                self._iter_parsed_chunks(
+                    file_object.s3_url,
+                    get_chunk_parser(
+                        file_type,
+                        chunk_rows=nrows,
+                        dtype=dtype,
+                        engine=engine,
+                        usecols=usecols,
+                        skiprows=skiprows or 0,
+                        nrows=nrows,
+                    ),
+                    compression=file_object.compression,
+                    chunk_size=ROW_LIMIT_CHUNK_SIZE,
+                    custom_encoding=custom_encoding,
+                    detect_encoding=file_type == "csv",
+                    etag=file_object.etag,
+                )
             )
-            decoded_content = file_content.getvalue().decode(encoding)
-            first_line, _ = self._get_decoded_content_first_last_line(
-                decoded_content=decoded_content
+
+        if (
+            file_type in ARROW_FILE_TYPES
+            and file_object.compression is None
+            and (columns is not None or filters)
+        ):
+            # Whole files are faster to get with concurrent downloads
+            result = self._read_arrow_file(
+                file_object, file_type, columns, filters
             )
-            sniffer = csv.Sniffer()
-            dialect = sniffer.sniff(first_line)
-            delimiter = dialect.delimiter
-            encoding = encoding if custom_encoding == "" else custom_encoding
-            df = pd.read_csv(
-                file_content, encoding=encoding, engine="python", sep=delimiter
+        elif dfs:
+            result = pd.concat(dfs, ignore_index=True)
+        else:
+            # Also reached by streamed files without rows, for the header
+            file_content, encoding = self._aws_connector.s3_read_file(
+                self._bucket,
+                key=file_object.s3_url,
+                raw=True,
+                # Compressed content is detected once decompressed
+                detect_encoding=file_object.compression is None
+                and needs_encoding_detection(file_type, custom_encoding),
             )
-            return df
-        elif file_type == "xlsx":
-            file_content, _ = self._aws_connector.s3_read_file(
-                self._bucket, key=file_path, bytes_=True
+            result = parse_file_content(
+                file_type,
+                file_content,
+                encoding,
+                custom_encoding,
+                engine,
+                usecols=usecols,
+                dtype=dtype,
+                nrows=nrows,
+                skiprows=skiprows,
+                compression=file_object.compression,
+                sheet_name=sheet_name,
+                encoding_detector=partial(
+                    self._aws_connector.s3_detect_encoding,
+                    self._bucket,
+                    file_object.s3_url,
+                    etag=file_object.etag,
+                    compression=file_object.compression,
+                ),
             )
-            xls = pd.ExcelFile(file_content)
-            num_sheets = len(xls.sheet_names)
-            if num_sheets == 1:
-                df = pd.read_excel(file_content)
-            else:
-                df = pd.read_excel(file_content, sheet_name=None)
-            return df
-        elif file_type == "xml":
-            file_content, _ = self._aws_connector.s3_read_file(
-                self._bucket, key=file_path, bytes_=False
+        if self._result_cache is not None and version:
+            result = self._result_cache.put(cache_key, result)
+        return result
+
+    def _read_arrow_file(
+        self,
+        file_object: UrlFile,
+        file_type: str,
+        columns: List[str] = None,
+        filters: List = None,
+    ) -> pd.DataFrame:
+        """
+        Read a Parquet or Arrow file with byte-range requests.
+
+        :param file_object: The UrlFile to be read.
+        :param file_type: "parquet", "feather" or "arrow".
+        :param columns: Optional list of the columns to read.
+        :param filters: Optional row filters in the pyarrow DNF format.
+        :return: A DataFrame with the selected rows and columns.
+        """
+        size, etag = file_object.size, file_object.etag
+        if size is None:
+            file_info = self._aws_connector.s3_head_file(
+                self._bucket, file_object.s3_url
             )
-            return xmltodict.parse(file_content)
-        elif file_type == "txt":
-            file_content, encoding = self._aws_connector.s3_read_file(
-                self._bucket, key=file_path, raw=True
+            if file_info is None:
+                raise FileNotFoundError(
+                    f"File not found: {self._bucket}/{file_object.s3_url}"
+                )
+            size, etag = file_info["size"], file_info["etag"]
+
+        range_file = S3RangeFile(
+            self._aws_connector, self._bucket, file_object.s3_url, size, etag
+        )
+        df = read_arrow_file(range_file, file_type, columns, filters)
+        log.debug(
+            f"Read {range_file.bytes_fetched} out of {size} bytes of "
+            f"{file_object.s3_url}"
+        )
+        return df
+
+    def read_files(
+        self,
+        file_collection: UrlFileCollection,
+        max_workers: int = 8,
+        return_exceptions: bool = False,
+        custom_encoding: str = "",
+    ) -> Dict[str, Union[pd.DataFrame, dict, bytes, Exception, None]]:
+        """
+        Read all the files of a UrlFileCollection concurrently.
+
+        The files are downloaded and parsed on a bounded thread pool. A file
+        failing does not stop the rest of the batch.
+
+        :param file_collection: The UrlFileCollection to be read.
+        :param max_workers: Maximum number of files read at the same time.
+        :param return_exceptions: If True, the exception raised by a file is
+        returned as its result. Otherwise the first exception (in the
+        collection order) is raised once the whole batch is done.
+        :param custom_encoding: Custom encoding.
+        :return: A dictionary with the parsed data of each file, keyed by
+        s3_url in the collection order.
+        """
+
+        def read_one_file(file_object: UrlFile):
+            try:
+                return self.read_file(file_object, custom_encoding)
+            except Exception as excpt:
+                log.error(f"Failed to read {file_object.s3_url}: {excpt}")
+                return excpt
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(
+                zip(
+                    (file_object.s3_url for file_object in file_collection),
+                    pool.map(read_one_file, file_collection),
+                )
             )
-            return file_content, encoding
-        return None
+
+        if not return_exceptions:
+            for result in results.values():
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _iter_parsed_chunks(
+        self,
+        key: str,
+        parser: ChunkParser,
+        compression: str = None,
+        chunk_size: int = None,
+        custom_encoding: str = "",
+        detect_encoding: bool = True,
+        etag: str = None,
+    ) -> Generator[Union[pd.DataFrame, List[Any]], None, None]:
+        """
+        Stream a file from S3 and parse it with a chunk parser (see
+        `get_chunk_parser`).
+
+        The download stops (and the connection is released) once the parser
+        is done, or when the generator is closed.
+
+        :param key: The key of the file.
+        :param parser: The chunk parser.
+        :param compression: The compression of the file, None if
+        uncompressed.
+        :param chunk_size: Size (bytes) of each chunk to read at a time.
+        :param custom_encoding: Custom encoding.
+        :param detect_encoding: Whether the encoding of the file has to be
+        detected (text files), ignored with a custom encoding.
+        :param etag: The ETag of the file, None if unknown. Caches the
+        encoding detected from the decompressed content.
+        :return: A generator yielding parsed chunks.
+        """
+        detect_encoding = detect_encoding and not custom_encoding
+        chunks = self._aws_connector.s3_read_file_by_chunks(
+            bucket=self._bucket,
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            key=key,
+            raw=True,
+            detect_encoding=detect_encoding and compression is None,
+        )
+        decompressor = StreamDecompressor(compression) if compression else None
+        encoding = custom_encoding or None
+        with closing(chunks):
+            for file_content, chunk_encoding in chunks:
+                if file_content == -1:
+                    break
+                if decompressor is not None:
+                    file_content = decompressor.decompress(file_content)
+                    if encoding is None and detect_encoding and file_content:
+                        encoding = self._aws_connector.s3_detect_encoding(
+                            self._bucket,
+                            key,
+                            file_content,
+                            etag=etag,
+                            compression=compression,
+                        )
+                else:
+                    encoding = encoding or chunk_encoding
+                yield from parser.feed(file_content, encoding)
+                if parser.done:
+                    return
+        if decompressor is not None:
+            yield from parser.feed(decompressor.flush(), encoding)
+        yield from parser.finish()
 
     def read_file_by_chunks(
-        self, file_object: UrlFile, chunk_size: int = None
-    ) -> Generator[pd.DataFrame, None, None]:
+        self,
+        file_object: UrlFile,
+        chunk_size: int = None,
+        chunk_rows: int = None,
+        dtype: Union[str, Dict] = None,
+        engine: str = None,
+        usecols: Union[List, Callable] = None,
+        nrows: int = None,
+        skiprows: int = 0,
+        custom_encoding: str = "",
+        sheet_name: Union[str, int] = None,
+        as_records: bool = False,
+        xml_item: Union[str, int] = None,
+    ) -> Generator[Union[pd.DataFrame, List[Any]], None, None]:
         """
         Read a file from S3 in chunks and parse it.
 
+        CSV, NDJSON (".jsonl", ".ndjson"), JSON and XML files are streamed
+        from S3. JSON files must hold a top-level array, whose elements are
+        parsed incrementally. The repeated elements of XML files are parsed
+        incrementally and freed once read, so the memory use does not depend
+        on the size of the document. Excel workbooks are downloaded, then their
+        rows are streamed from the sheet in read-only mode, so the parsed
+        workbook is never held in memory as a whole.
+
         :param file_object: The UrlFile representing the file to be read.
         :param chunk_size: Size (bytes) of each chunk to read at a time.
-        :return: A generator yielding parsed chunks.
+        :param chunk_rows: Number of rows of each yielded DataFrame (the last
+        one may be shorter). If None, a DataFrame is yielded per chunk read
+        for CSV files, and per DEFAULT_EXCEL_CHUNK_ROWS rows for Excel files.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param engine: For CSV files, the pandas engine: "c" (default),
+        "pyarrow" or "python". For NDJSON files, the JSON engine: "orjson"
+        or "json".
+        :param usecols: Optional subset of the columns to parse (names,
+        positions or, for CSV files, a callable, as in `pd.read_csv`). For
+        JSON and XML files, the fields of the records.
+        :param nrows: Optional maximum number of rows to read, the download
+        stops once they are parsed.
+        :param skiprows: For CSV and Excel files, the number of rows skipped
+        at the start of the file, before the header.
+        :param custom_encoding: Custom encoding, skips the detection.
+        :param sheet_name: For Excel files, the sheet to read, by name or
+        position, the first one by default.
+        :param as_records: For JSON, NDJSON and XML files, yield lists of the
+        parsed records instead of DataFrames.
+        :param xml_item: For XML files, the repeated element to yield, as a
+        path of tag names from the root ("feed/products/product", "*"
+        matches any tag) or as a depth (1 is the root element). The children
+        of the root element by default. Each element is converted to a
+        dictionary as by xmltodict.
+        :return: A generator yielding parsed chunks. Compressed files are
+        decompressed chunk by chunk.
         """
-        file_path = file_object.s3_url
         file_type = file_object.file_extension
+        if file_type not in CHUNKED_FILE_TYPES:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        if nrows is not None and nrows <= 0:
+            return
 
-        if file_type == "csv":
-            df_headers = []
-            last_line = ""
-            for (
-                file_content,
-                encoding,
-            ) in self._aws_connector.s3_read_file_by_chunks(
-                bucket=self._bucket,
-                chunk_size=chunk_size,
-                key=file_path,
-                bytes_=True,
-            ):
-                if file_content == -1:
-                    break
-                decoded_content = last_line + file_content.getvalue().decode(
-                    encoding
-                )
-                first_line, last_line = (
-                    self._get_decoded_content_first_last_line(
-                        decoded_content=decoded_content
-                    )
-                )
-                sniffer = csv.Sniffer()
-                dialect = sniffer.sniff(first_line)
-                delimiter = dialect.delimiter
-                file_content_encoded = io.BytesIO(decoded_content.encode())
-                df = pd.read_csv(
-                    file_content_encoded,
-                    encoding=encoding,
-                    engine="python",
-                    sep=delimiter,
+        if file_type == "xlsx":
+            # Workbooks are zip archives, read from their central directory
+            file_content, _ = self._aws_connector.s3_read_file(
+                self._bucket,
+                key=file_object.s3_url,
+                raw=True,
+                detect_encoding=False,
+            )
+            if file_object.compression is not None:
+                file_content = read_file_content(
+                    file_content, file_object.compression
                 )
-                if len(df_headers) == 0:
-                    df_headers = df.columns.tolist()
-                else:
-                    df_current_headers = pd.DataFrame(
-                        [df.columns.tolist()], columns=df.columns
-                    )
-                    df = pd.concat([df_current_headers, df], ignore_index=True)
-                    df.columns = df_headers
-                if last_line != "":
-                    df = df.drop(df.index[-1]) if len(df) > 0 else df
-                yield df
-        else:
-            raise ValueError(f"Unsupported file type: {file_type}")
+            yield from iter_excel_batches(
+                file_content,
+                sheet_name=sheet_name,
+                chunk_rows=chunk_rows,
+                usecols=usecols,
+                dtype=dtype,
+                nrows=nrows,
+                skiprows=skiprows,
+            )
+            return
+
+        yield from self._iter_parsed_chunks(
+            file_object.s3_url,
+            get_chunk_parser(
+                file_type,
+                chunk_rows=chunk_rows,
+                dtype=dtype,
+                engine=engine,
+                usecols=usecols,
+                skiprows=skiprows,
+                nrows=nrows,
+                as_records=as_records,
+                xml_item=xml_item,
+            ),
+            compression=file_object.compression,
+            chunk_size=chunk_size,
+            custom_encoding=custom_encoding,
+            detect_encoding=file_type == "csv",
+            etag=file_object.etag,
+        )
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+
+def records_to_dataframe(
+    records: List[Any],
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Union[str, Dict]] = None,
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from parsed records (JSON values, XML elements), one
+    row per record. Nested values are kept as Python objects.
+
+    :param records: The records (objects, arrays or scalars).
+    :param usecols: Optional subset of the fields to keep, in order. Fields
+    missing from every record give empty columns.
+    :param dtype: Optional dtype (or dtype per column) of the DataFrame.
+    :return: The DataFrame.
+    """
+    df = pd.DataFrame(records, columns=usecols)
+    if isinstance(dtype, dict):
+        dtype = {col: typ for col, typ in dtype.items() if col in df.columns}
+    if dtype:
+        df = df.astype(dtype)
+    return df
+
+
+class RecordChunkParser:
+    def __init__(
+        self,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        usecols: Optional[List[str]] = None,
+        nrows: Optional[int] = None,
+        as_records: bool = False,
+    ):
+        """
+        Initialize a RecordChunkParser object.
+
+        Base of the parsers of record files (JSON, XML): the records parsed
+        from consecutive chunks of a file are grouped in batches of
+        `chunk_rows` records.
+
+        :param chunk_rows: Number of records of each batch. If None, a batch
+        with all the complete records is returned per chunk.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param usecols: Optional subset of the fields to keep, in order.
+        :param nrows: Optional maximum number of records to parse, the
+        records after it are ignored.
+        :param as_records: If True, the batches are lists of the parsed
+        records instead of DataFrames.
+        """
+        if chunk_rows is not None and chunk_rows < 1:
+            raise ValueError("chunk_rows must be a positive number.")
+        self._chunk_rows = chunk_rows
+        self._dtype = dtype
+        self._usecols = usecols
+        self._rows_left = nrows
+        self._as_records = as_records
+        self._records: List[Any] = []
+
+    @property
+    def done(self) -> bool:
+        """
+        Get whether the RecordChunkParser object has parsed nrows records,
+        so the rest of the file can be skipped.
+        """
+        return self._rows_left is not None and self._rows_left <= 0
+
+    def _add_records(self, records: List[Any]):
+        """
+        Add newly parsed records, up to nrows.
+
+        :param records: The parsed records.
+        """
+        if self._rows_left is not None:
+            records = records[: self._rows_left]
+            self._rows_left -= len(records)
+        self._records += records
+
+    def _take_batches(
+        self, final: bool
+    ) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Take the completed batches of records.
+
+        :param final: True once the whole file has been parsed, so the last
+        records make a shorter batch.
+        :return: The batches, as DataFrames or lists of records.
+        """
+        if self._chunk_rows is None:
+            batches = [self._records] if self._records else []
+            self._records = []
+        else:
+            batch_count = len(self._records) // self._chunk_rows
+            if (final or self.done) and len(self._records) % self._chunk_rows:
+                batch_count += 1
+            batches = [
+                self._records[start : start + self._chunk_rows]
+                for start in range(
+                    0, batch_count * self._chunk_rows, self._chunk_rows
+                )
+            ]
+            del self._records[: batch_count * self._chunk_rows]
+        if self._as_records:
+            return batches
+        return [
+            records_to_dataframe(batch, self._usecols, self._dtype)
+            for batch in batches
+        ]
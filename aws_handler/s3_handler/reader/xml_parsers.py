@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.parsers import expat
+
+import pandas as pd
+
+from aws_handler.s3_handler.reader.records import RecordChunkParser
+
+# Depth of the items yielded when no item is given: the children of the
+# root element
+DEFAULT_XML_ITEM_DEPTH = 2
+
+
+class XmlChunkParser(RecordChunkParser):
+    def __init__(
+        self,
+        item: Union[str, int, None] = None,
+        chunk_rows: Optional[int] = None,
+        dtype: Optional[Union[str, Dict]] = None,
+        usecols: Optional[List[str]] = None,
+        nrows: Optional[int] = None,
+        as_records: bool = False,
+    ):
+        """
+        Initialize a XmlChunkParser object.
+
+        The parser incrementally parses consecutive chunks of an XML
+        document with expat, and turns the repeated elements (the items)
+        into batches of records. Each item is converted the way
+        `xmltodict.parse` converts it: attributes are "@name" keys, child
+        elements are keys (a list when repeated), and the text is a "#text"
+        key, or the value itself for elements with neither attributes nor
+        children. Only the item being read is held in memory, the elements
+        outside the items are never built, so the memory use does not depend
+        on the size of the document.
+
+        :param item: The items, as a path of tag names from the root
+        ("feed/products/product", "*" matches any tag, namespace prefixes
+        can be omitted) or as a depth (1 is the root element, 2 its
+        children). The children of the root element by default.
+        :param chunk_rows: Number of records of each batch. If None, a batch
+        with all the complete records is returned per chunk.
+        :param dtype: Optional dtype (or dtype per column) of the DataFrames.
+        :param usecols: Optional subset of the fields to keep, in order.
+        :param nrows: Optional maximum number of records to parse.
+        :param as_records: If True, the batches are lists of the parsed
+        records instead of DataFrames.
+        """
+        super().__init__(chunk_rows, dtype, usecols, nrows, as_records)
+        if item is None:
+            item = DEFAULT_XML_ITEM_DEPTH
+        if isinstance(item, int):
+            if item < 1:
+                raise ValueError("The XML item depth must be positive.")
+            self._item_path = None
+            self._item_depth = item
+        else:
+            self._item_path = item.strip("/").split("/")
+            self._item_depth = len(self._item_path)
+        self._xml_parser = expat.ParserCreate()
+        # Character data is reported once per text node, not once per line
+        self._xml_parser.buffer_text = True
+        self._xml_parser.StartElementHandler = self._start_element
+        self._xml_parser.EndElementHandler = self._end_element
+        self._xml_parser.CharacterDataHandler = self._character_data
+        # Tags of the open elements, from the root
+        self._tags: List[str] = []
+        # Open elements of the item being read: (tag, value, text parts)
+        self._item_elements: List[Tuple[str, Dict[str, Any], List[str]]] = []
+        self._new_records: List[Any] = []
+
+    def feed(
+        self, chunk: bytes, encoding: Optional[str] = None
+    ) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the next chunk of the document.
+
+        :param chunk: The raw content of the chunk.
+        :param encoding: Ignored, the encoding is read from the XML
+        declaration (UTF-8 by default).
+        :return: The batches completed by the chunk (possibly none).
+        """
+        if self.done:
+            return []
+        self._xml_parser.Parse(chunk, False)
+        self._add_new_records()
+        return self._take_batches(final=False)
+
+    def finish(self) -> List[Union[pd.DataFrame, List[Any]]]:
+        """
+        Parse the items left once the whole document has been fed.
+
+        :return: The remaining batches (possibly none).
+        :raises: xml.parsers.expat.ExpatError if the document is not
+        complete.
+        """
+        if not self.done:
+            self._xml_parser.Parse(b"", True)
+            self._add_new_records()
+        return self._take_batches(final=True)
+
+    def _add_new_records(self):
+        """
+        Add the items completed by the last parsed chunk to the records.
+        """
+        self._add_records(self._new_records)
+        self._new_records = []
+
+    def _is_item(self) -> bool:
+        """
+        Check whether the element just opened is an item.
+
+        :return: True if the open elements match the item path or depth.
+        """
+        if len(self._tags) != self._item_depth:
+            return False
+        if self._item_path is None:
+            return True
+        return all(
+            item_tag in ("*", tag, tag.rpartition(":")[2])
+            for item_tag, tag in zip(self._item_path, self._tags)
+        )
+
+    def _start_element(self, tag: str, attributes: Dict[str, str]):
+        self._tags.append(tag)
+        if self._item_elements or self._is_item():
+            self._item_elements.append(
+                (
+                    tag,
+                    {f"@{name}": value for name, value in attributes.items()},
+                    [],
+                )
+            )
+
+    def _end_element(self, tag: str):
+        self._tags.pop()
+        if not self._item_elements:
+            return
+        tag, value, texts = self._item_elements.pop()
+        text = "".join(texts).strip()
+        if value and text:
+            value["#text"] = text
+        elif not value:
+            value = text or None
+
+        if not self._item_elements:
+            self._new_records.append(value)
+            return
+        parent = self._item_elements[-1][1]
+        if tag not in parent:
+            parent[tag] = value
+        elif isinstance(parent[tag], list):
+            parent[tag].append(value)
+        else:
+            parent[tag] = [parent[tag], value]
+
+    def _character_data(self, data: str):
+        if self._item_elements:
+            self._item_elements[-1][2].append(data)
@@ -1,52 +1,192 @@
-from typing import Dict, Generator, List, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 
-from aws_handler.aws_integration import AwsConnector, Boto3Connector
+from aws_handler.aws_integration import AwsConnector
+from aws_handler.s3_handler.cache import ParsedResultCache
+from aws_handler.s3_handler.index import ListingIndex
 from aws_handler.s3_handler.models import UrlFile, UrlFileCollection
 from aws_handler.s3_handler.reader import S3Reader
 from aws_handler.s3_handler.writer import S3Writer
+from aws_handler.s3_handler.writer.batch import DEFAULT_MAX_IN_FLIGHT_BYTES
 
 
 class S3Handler:
-    def __init__(self, bucket: str, aws_connector: AwsConnector = None):
+    def __init__(
+        self,
+        bucket: str,
+        aws_connector: AwsConnector = None,
+        listing_index: ListingIndex = None,
+        result_cache: ParsedResultCache = None,
+    ):
         """
         Initialize an S3Handler object.
 
         :param bucket: The name of the S3 bucket.
         :param aws_connector: AWS connector object used for S3 interactions.
+        :param listing_index: Optional local index used to search files
+        without listing the bucket on every call.
+        :param result_cache: Optional in-memory cache of the parsed files
+        returned by `read_file`.
         """
         self._bucket = bucket
-        self._aws_connector = (
-            aws_connector if aws_connector else Boto3Connector()
+        if not aws_connector:
+            # Imported on use, so boto3 is not loaded with a custom connector
+            from aws_handler.aws_integration import Boto3Connector
+
+            aws_connector = Boto3Connector()
+        self._aws_connector = aws_connector
+        self._reader = S3Reader(
+            bucket,
+            self._aws_connector,
+            listing_index=listing_index,
+            result_cache=result_cache,
         )
-        self._reader = S3Reader(bucket, self._aws_connector)
         self._writer = S3Writer(bucket, self._aws_connector)
 
     # S3Writer methods
     def write_df_to_s3(
-        self, df_data: pd.DataFrame, file_name: str, file_path: str
+        self,
+        df_data: pd.DataFrame,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
     ):
-        return self._writer.write_df_to_s3(df_data, file_name, file_path)
+        return self._writer.write_df_to_s3(
+            df_data, file_name, file_path, compression, compression_level
+        )
 
-    def write_json_to_s3(self, data, file_name: str, file_path: str):
-        return self._writer.write_json_to_s3(data, file_name, file_path)
+    def write_json_to_s3(
+        self,
+        data,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        return self._writer.write_json_to_s3(
+            data, file_name, file_path, compression, compression_level
+        )
 
-    def write_txt_to_s3(self, text: str, file_name: str, file_path: str):
-        return self._writer.write_txt_to_s3(text, file_name, file_path)
+    def write_ndjson_to_s3(
+        self,
+        records: Iterable,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        return self._writer.write_ndjson_to_s3(
+            records, file_name, file_path, compression, compression_level
+        )
+
+    def write_txt_to_s3(
+        self,
+        text: str,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        return self._writer.write_txt_to_s3(
+            text, file_name, file_path, compression, compression_level
+        )
+
+    def write_many(
+        self,
+        items: Iterable[Union[Tuple, Dict]],
+        max_workers: int = 8,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[int, Exception]]:
+        return self._writer.write_many(
+            items, max_workers, max_in_flight_bytes, return_exceptions
+        )
 
     # S3Reader methods
+    def iter_files(
+        self, path: str, keywords: List[str], match_mode: str = "glob"
+    ) -> Generator[Tuple[str, UrlFile], None, None]:
+        return self._reader.iter_files(path, keywords, match_mode)
+
     def retrieve_files(
-        self, path: str, keywords: List[str]
+        self, path: str, keywords: List[str], match_mode: str = "glob"
     ) -> Dict[str, UrlFileCollection]:
-        return self._reader.retrieve_files(path, keywords)
+        return self._reader.retrieve_files(path, keywords, match_mode)
 
     def read_file(
-        self, file_object: UrlFile, custom_encoding: str = ""
+        self,
+        file_object: UrlFile,
+        custom_encoding: str = "",
+        engine: str = None,
+        columns: List[str] = None,
+        filters: List = None,
+        usecols: Union[List, Callable] = None,
+        dtype: Union[str, Dict] = None,
+        nrows: int = None,
+        skiprows: int = None,
+        sheet_name: Union[str, int, List] = None,
     ) -> Union[pd.DataFrame, dict, bytes, None]:
-        return self._reader.read_file(file_object, custom_encoding)
+        return self._reader.read_file(
+            file_object,
+            custom_encoding,
+            engine,
+            columns,
+            filters,
+            usecols,
+            dtype,
+            nrows,
+            skiprows,
+            sheet_name,
+        )
+
+    def read_files(
+        self,
+        file_collection: UrlFileCollection,
+        max_workers: int = 8,
+        return_exceptions: bool = False,
+        custom_encoding: str = "",
+    ) -> Dict[str, Union[pd.DataFrame, dict, bytes, Exception, None]]:
+        return self._reader.read_files(
+            file_collection, max_workers, return_exceptions, custom_encoding
+        )
 
     def read_file_by_chunks(
-        self, file_object: UrlFile, chunk_size: int = None
-    ) -> Generator[pd.DataFrame, None, None]:
-        return self._reader.read_file_by_chunks(file_object, chunk_size)
+        self,
+        file_object: UrlFile,
+        chunk_size: int = None,
+        chunk_rows: int = None,
+        dtype: Union[str, Dict] = None,
+        engine: str = None,
+        usecols: Union[List, Callable] = None,
+        nrows: int = None,
+        skiprows: int = 0,
+        custom_encoding: str = "",
+        sheet_name: Union[str, int] = None,
+        as_records: bool = False,
+        xml_item: Union[str, int] = None,
+    ) -> Generator[Union[pd.DataFrame, List[Any]], None, None]:
+        return self._reader.read_file_by_chunks(
+            file_object,
+            chunk_size,
+            chunk_rows,
+            dtype,
+            engine,
+            usecols,
+            nrows,
+            skiprows,
+            custom_encoding,
+            sheet_name,
+            as_records,
+            xml_item,
+        )
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Optional, Tuple, Union
+import json
+import os
+
+import pandas as pd
+
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    compress_bytes,
+    normalize_compression,
+    split_compression_extension,
+)
+from aws_handler.util.pandas import dataframe_to_bytes
+
+# Default maximum number of serialized bytes waiting for (or being)
+# uploaded by `write_many`
+DEFAULT_MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024
+
+# Fields of a write_many item
+WRITE_ITEM_FIELDS = (
+    "data",
+    "file_name",
+    "file_path",
+    "compression",
+    "compression_level",
+)
+
+
+def normalize_write_item(
+    item: Union[Tuple, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Validate an item of `write_many`.
+
+    :param item: A dictionary with the "data", "file_name" and "file_path"
+    keys, and optionally "compression" and "compression_level", or a tuple
+    of the values in that order.
+    :return: A dictionary with every field.
+    :raises: ValueError if the item is not valid.
+    """
+    if isinstance(item, tuple):
+        item = dict(zip(WRITE_ITEM_FIELDS, item))
+    if not isinstance(item, dict) or not {
+        "data",
+        "file_name",
+        "file_path",
+    } <= set(item):
+        raise ValueError(
+            "Each item must have a data, a file_name and a file_path."
+        )
+    return {field: item.get(field) for field in WRITE_ITEM_FIELDS}
+
+
+def get_write_item_key(item: Dict[str, Any]) -> str:
+    """
+    Get the key of the object written for an item, as the single write
+    methods build it.
+
+    :param item: A normalized item, see `normalize_write_item`.
+    :return: The key of the object.
+    """
+    if isinstance(item["data"], (pd.DataFrame, str)):
+        return os.path.join(item["file_path"], item["file_name"])
+    return f"{item['file_path']}/{item['file_name']}"
+
+
+def serialize_write_item(
+    item: Dict[str, Any],
+) -> Tuple[Optional[bytes], str]:
+    """
+    Serialize the data of an item the way the single write methods do:
+    DataFrames by the extension of the file name (as `write_df_to_s3`),
+    strings as UTF-8 text (as `write_txt_to_s3`), bytes as they are, and
+    other values as JSON (as `write_json_to_s3`). The content is compressed
+    by the compression of the item, or of the file name ("data.csv.gz").
+
+    :param item: A normalized item, see `normalize_write_item`.
+    :return: A tuple of (content, content type). The content is None for
+    empty DataFrames, which are not written.
+    :raises: ValueError if the file format of a DataFrame is not supported.
+    """
+    data = item["data"]
+    uncompressed_name, file_compression = split_compression_extension(
+        item["file_name"]
+    )
+    compression = normalize_compression(
+        item["compression"] or file_compression
+    )
+    if isinstance(data, pd.DataFrame):
+        if data.empty:
+            return None, ""
+        extension = os.path.splitext(uncompressed_name)[1].replace(".", "")
+        body, content_type = dataframe_to_bytes(data, extension)
+    elif isinstance(data, str):
+        body, content_type = data.encode("utf-8"), "text/plain"
+    elif isinstance(data, (bytes, bytearray)):
+        body, content_type = bytes(data), "application/octet-stream"
+    else:
+        body = json.dumps(data).encode("utf-8")
+        content_type = "application/json"
+
+    if compression is not None:
+        body = compress_bytes(body, compression, item["compression_level"])
+        content_type = COMPRESSION_CONTENT_TYPES[compression]
+    return body, content_type
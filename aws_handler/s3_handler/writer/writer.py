@@ -1,11 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Tuple, Union
+import json
 import os
+import threading
 
 import pandas as pd
 
-from aws_handler.aws_integration import AwsConnector, Boto3Connector
-from aws_handler.util.pandas import format_df_to_excel
+from aws_handler.aws_integration import AwsConnector
+from aws_handler.s3_handler.writer.batch import (
+    DEFAULT_MAX_IN_FLIGHT_BYTES,
+    get_write_item_key,
+    normalize_write_item,
+    serialize_write_item,
+)
+from aws_handler.util.arrow import ARROW_FILE_TYPES
+from aws_handler.util.compression import (
+    COMPRESSION_CONTENT_TYPES,
+    compress_bytes,
+    normalize_compression,
+    split_compression_extension,
+)
+from aws_handler.util.json_engine import (
+    NDJSON_CONTENT_TYPE,
+    NDJSON_FILE_TYPES,
+    iter_ndjson_chunks,
+)
 from aws_handler.util.logger import log
 
+# Extensions of the files written from a DataFrame by `write_df_to_s3`
+DATAFRAME_FILE_TYPES = (
+    ("csv", "xlsx", "xls") + NDJSON_FILE_TYPES + ARROW_FILE_TYPES
+)
+
 
 class S3Writer:
     def __init__(self, bucket: str, aws_connector: AwsConnector = None):
@@ -16,12 +42,20 @@ class S3Writer:
         :param aws_connector: AWS connector object used for S3 interactions.
         """
         self._bucket = bucket
-        self._aws_connector = (
-            aws_connector if aws_connector else Boto3Connector()
-        )
+        if not aws_connector:
+            # Imported on use, so boto3 is not loaded with a custom connector
+            from aws_handler.aws_integration import Boto3Connector
+
+            aws_connector = Boto3Connector()
+        self._aws_connector = aws_connector
 
     def write_df_to_s3(
-        self, df_data: pd.DataFrame, file_name: str, file_path: str
+        self,
+        df_data: pd.DataFrame,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
     ):
         """
         Write data to S3 bucket.
@@ -29,46 +63,213 @@ class S3Writer:
         :param df_data: Data to write (already a DataFrame).
         :param file_name: Name of the file to write.
         :param file_path: Path of the file to write.
+        :param compression: Optional compression: "gzip", "bz2", "xz" or
+        "zstd". By default, inferred from the file name ("data.csv.gz").
+        :param compression_level: Optional compression level.
         """
         if df_data.empty:
             log.debug(f"Attempting to write an empty file: {file_name}")
             return
 
         # Check file extension to determine file type
-        _, extension = os.path.splitext(file_name)
+        uncompressed_name, file_compression = split_compression_extension(
+            file_name
+        )
+        compression = compression or file_compression
+        _, extension = os.path.splitext(uncompressed_name)
         extension = extension.replace(".", "")
         full_file_path = os.path.join(file_path, file_name)
 
-        # Upload to S3
-        if extension == "csv":
+        # Upload to S3, formatted and streamed by the connector
+        if extension in DATAFRAME_FILE_TYPES:
             self._aws_connector.upload_dataframe_to_s3(
                 data=df_data,
                 bucket=self._bucket,
                 key=full_file_path,
                 file_format=extension,
-            )
-        elif extension in ["xlsx", "xls"]:
-            # Format DataFrame to Excel buffer
-            excel_buffer = format_df_to_excel(df_data)
-            self._aws_connector.upload_dataframe_to_s3(
-                data=excel_buffer,
-                bucket=self._bucket,
-                key=full_file_path,
-                file_format=extension,
+                compression=compression,
+                compression_level=compression_level,
             )
 
-    def write_json_to_s3(self, data, file_name: str, file_path: str):
+    def write_json_to_s3(
+        self,
+        data,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
         key = f"{file_path}/{file_name}"
-        self._aws_connector.put_dict_to_s3(
-            bucket=self._bucket, key=key, dict_obj=data
+        compression = compression or split_compression_extension(file_name)[1]
+        if compression is None:
+            self._aws_connector.put_dict_to_s3(
+                bucket=self._bucket, key=key, dict_obj=data
+            )
+            return
+        self._aws_connector.put_object_to_s3(
+            bucket=self._bucket,
+            key=key,
+            data=compress_bytes(
+                json.dumps(data).encode("utf-8"),
+                compression,
+                compression_level,
+            ),
+            content_type=COMPRESSION_CONTENT_TYPES[
+                normalize_compression(compression)
+            ],
+        )
+
+    def write_ndjson_to_s3(
+        self,
+        records: Iterable,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
+        """
+        Write records to S3 as newline-delimited JSON, one record per line.
+        The records are consumed lazily and serialized while the previous
+        ones are uploaded, so a generator of any length can be written.
+
+        :param records: Iterable of JSON-serializable records.
+        :param file_name: Name of the file to write ("events.jsonl").
+        :param file_path: Path of the file to write.
+        :param compression: Optional compression: "gzip", "bz2", "xz" or
+        "zstd". By default, inferred from the file name ("events.jsonl.gz").
+        :param compression_level: Optional compression level.
+        """
+        self._aws_connector.upload_stream_to_s3(
+            iter_ndjson_chunks(records),
+            bucket=self._bucket,
+            key=f"{file_path}/{file_name}",
+            content_type=NDJSON_CONTENT_TYPE,
+            compression=compression
+            or split_compression_extension(file_name)[1],
+            compression_level=compression_level,
         )
 
-    def write_txt_to_s3(self, text: str, file_name: str, file_path: str):
+    def write_txt_to_s3(
+        self,
+        text: str,
+        file_name: str,
+        file_path: str,
+        compression: str = None,
+        compression_level: int = None,
+    ):
         full_file_path = os.path.join(file_path, file_name)
-        # Upload to S3
+        compression = compression or split_compression_extension(file_name)[1]
+        if compression is None:
+            # Upload to S3
+            self._aws_connector.put_object_to_s3(
+                bucket=self._bucket,
+                key=full_file_path,
+                data=text,
+                content_type="text/plain",
+            )
+            return
         self._aws_connector.put_object_to_s3(
             bucket=self._bucket,
             key=full_file_path,
-            data=text,
-            content_type="text/plain",
+            data=compress_bytes(
+                text.encode("utf-8"), compression, compression_level
+            ),
+            content_type=COMPRESSION_CONTENT_TYPES[
+                normalize_compression(compression)
+            ],
         )
+
+    def write_many(
+        self,
+        items: Iterable[Union[Tuple, Dict]],
+        max_workers: int = 8,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[int, Exception]]:
+        """
+        Write many objects, serializing the next items while the previous
+        ones are uploaded.
+
+        The items are consumed lazily and serialized (and compressed) one by
+        one in the calling thread, while up to `max_workers` serialized
+        objects are uploaded by a thread pool. Serialization waits while the
+        serialized objects not uploaded yet exceed `max_in_flight_bytes`, so
+        the memory usage is bounded (a single larger object is still
+        written). An item failing does not stop the rest of the batch.
+
+        :param items: Iterable of items, each one a dictionary with the
+        "data", "file_name" and "file_path" keys (and optionally
+        "compression" and "compression_level"), or a tuple of the values in
+        that order. DataFrames are written as by `write_df_to_s3`, strings as
+        by `write_txt_to_s3`, bytes as they are, and other values as JSON by
+        `write_json_to_s3`.
+        :param max_workers: Maximum number of objects uploaded at the same
+        time.
+        :param max_in_flight_bytes: Maximum number of serialized bytes
+        waiting for (or being) uploaded.
+        :param return_exceptions: If True, the exception raised by an item
+        is returned as its outcome. Otherwise the first exception (in the
+        items order) is raised once the whole batch is done.
+        :return: A dictionary with the outcome of each item, keyed by object
+        key in the items order: the number of bytes uploaded (0 for empty
+        DataFrames, which are not written), or the exception raised.
+        """
+        outcomes: Dict[str, Union[int, Exception]] = {}
+        in_flight = threading.Condition()
+        in_flight_bytes = 0
+
+        def upload(key: str, body: bytes, content_type: str) -> int:
+            nonlocal in_flight_bytes
+            try:
+                self._aws_connector.upload_stream_to_s3(
+                    [body],
+                    bucket=self._bucket,
+                    key=key,
+                    content_type=content_type,
+                )
+                return len(body)
+            finally:
+                with in_flight:
+                    in_flight_bytes -= len(body)
+                    in_flight.notify_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for index, item in enumerate(items):
+                # Items without a valid key are reported by position
+                key = f"items[{index}]"
+                try:
+                    item = normalize_write_item(item)
+                    key = get_write_item_key(item)
+                    body, content_type = serialize_write_item(item)
+                    if body is None:
+                        log.debug(f"Attempting to write an empty file: {key}")
+                        outcomes[key] = 0
+                        continue
+                    with in_flight:
+                        # A single larger object is written alone
+                        in_flight.wait_for(
+                            lambda: in_flight_bytes == 0
+                            or in_flight_bytes + len(body)
+                            <= max_in_flight_bytes
+                        )
+                        in_flight_bytes += len(body)
+                    outcomes[key] = pool.submit(
+                        upload, key, body, content_type
+                    )
+                except Exception as excpt:
+                    log.error(f"Failed to serialize {key}: {excpt}")
+                    outcomes[key] = excpt
+
+        for key, outcome in outcomes.items():
+            if not isinstance(outcome, (int, Exception)):
+                try:
+                    outcomes[key] = outcome.result()
+                except Exception as excpt:
+                    log.error(f"Failed to write {key}: {excpt}")
+                    outcomes[key] = excpt
+
+        if not return_exceptions:
+            for outcome in outcomes.values():
+                if isinstance(outcome, Exception):
+                    raise outcome
+        return outcomes
@@ -0,0 +1,116 @@
+from typing import List, Optional
+import io
+
+import pandas as pd
+
+# File types read and written with pyarrow
+ARROW_FILE_TYPES = ("parquet", "feather", "arrow")
+
+# MIME type of the Parquet files
+PARQUET_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+# MIME type of the Arrow IPC (Feather V2) files
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.file"
+
+
+def import_pyarrow():
+    """
+    Import pyarrow, which is an optional dependency.
+
+    :return: The pyarrow module, with its ipc and parquet modules loaded.
+    :raises: ImportError with installation instructions if it is missing.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as excpt:
+        raise ImportError(
+            "Parquet and Arrow files require the 'pyarrow' package, "
+            "install it with `pip install pyarrow`."
+        ) from excpt
+    return pyarrow
+
+
+def read_arrow_file(
+    source: io.IOBase,
+    file_type: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+) -> pd.DataFrame:
+    """
+    Read a Parquet or Arrow IPC (Feather) file. Only the footer and the
+    buffers of the needed columns are read from the source, and Parquet row
+    groups whose statistics do not match the filters are skipped.
+
+    :param source: A seekable binary stream over the file.
+    :param file_type: "parquet", "feather" or "arrow".
+    :param columns: Optional list of the columns to read.
+    :param filters: Optional row filters in the pyarrow DNF format, e.g.
+    [("year", "=", 2024), ("amount", ">", 0)].
+    :return: A DataFrame with the selected rows and columns.
+    """
+    pa = import_pyarrow()
+    if file_type == "parquet":
+        return pa.parquet.read_table(
+            source, columns=columns, filters=filters
+        ).to_pandas()
+
+    schema = pa.ipc.open_file(source).schema
+    filter_expression = (
+        pa.parquet.filters_to_expression(filters) if filters else None
+    )
+    needed_columns = set(columns if columns is not None else schema.names)
+    if filters:
+        needed_columns.update(_filter_columns(filters))
+    reader = pa.ipc.open_file(
+        source,
+        options=pa.ipc.IpcReadOptions(
+            included_fields=[
+                index
+                for index, name in enumerate(schema.names)
+                if name in needed_columns
+            ]
+        ),
+    )
+    table = reader.read_all()
+    if filter_expression is not None:
+        table = table.filter(filter_expression)
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def _filter_columns(filters: List) -> List[str]:
+    """
+    Get the columns used by filters in the pyarrow DNF format.
+
+    :param filters: A list of (column, op, value) tuples, or a list of such
+    lists.
+    :return: The names of the columns.
+    """
+    if filters and isinstance(filters[0], tuple):
+        filters = [filters]
+    return [column for conjunction in filters for column, _, _ in conjunction]
+
+
+def write_arrow_file(
+    df_data: pd.DataFrame, file_type: str, sink: io.IOBase
+) -> None:
+    """
+    Write a DataFrame as a Parquet or Arrow IPC (Feather) file. The file is
+    written sequentially, so the sink does not need to be seekable.
+
+    :param df_data: The DataFrame to write.
+    :param file_type: "parquet", "feather" or "arrow".
+    :param sink: A binary stream to write the file to.
+    """
+    pa = import_pyarrow()
+    table = pa.Table.from_pandas(df_data, preserve_index=False)
+    if file_type == "parquet":
+        pa.parquet.write_table(table, sink)
+    else:
+        # LZ4 compressed, as pandas' `to_feather`
+        options = pa.ipc.IpcWriteOptions(compression="lz4")
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
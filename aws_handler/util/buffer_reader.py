@@ -0,0 +1,72 @@
+from typing import Union
+import io
+
+
+class BufferReader(io.RawIOBase):
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        """
+        Initialize a BufferReader object.
+
+        A read-only, seekable binary stream over any object supporting the
+        buffer protocol (bytearray, memoryview, mmap, ...). Unlike
+        `io.BytesIO`, the content is read in place instead of being copied
+        first.
+
+        :param buffer: The content to read.
+        """
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        data = self._view[self._position : self._position + len(buffer)]
+        read_size = len(data)
+        memoryview(buffer).cast("B")[:read_size] = data
+        self._position += read_size
+        return read_size
+
+    def readall(self) -> bytes:
+        data = self._view[self._position :].tobytes()
+        self._position = len(self._view)
+        return data
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def open_buffer(buffer: Union[bytes, bytearray, memoryview]) -> io.IOBase:
+    """
+    Open a bytes-like object as a binary stream without copying it.
+
+    :param buffer: The content to read.
+    :return: A BytesIO for bytes (which shares their memory), a
+    BufferReader otherwise.
+    """
+    if isinstance(buffer, bytes):
+        return io.BytesIO(buffer)
+    return BufferReader(buffer)
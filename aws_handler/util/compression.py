@@ -0,0 +1,230 @@
+from typing import Optional, Tuple, Union
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+
+# Compression of the files, by file extension
+COMPRESSION_EXTENSIONS = {
+    "gz": "gzip",
+    "bz2": "bz2",
+    "xz": "xz",
+    "zst": "zstd",
+}
+
+# Supported compressions
+COMPRESSIONS = tuple(COMPRESSION_EXTENSIONS.values())
+
+# MIME type of the compressed files
+COMPRESSION_CONTENT_TYPES = {
+    "gzip": "application/gzip",
+    "bz2": "application/x-bzip2",
+    "xz": "application/x-xz",
+    "zstd": "application/zstd",
+}
+
+# Default level of each compression, trading some ratio for speed
+DEFAULT_COMPRESSION_LEVELS = {
+    "gzip": 6,
+    "bz2": 9,
+    "xz": 6,
+    "zstd": 3,
+}
+
+
+def import_zstandard():
+    """
+    Import zstandard, which is an optional dependency.
+
+    :return: The zstandard module.
+    :raises: ImportError with installation instructions if it is missing.
+    """
+    try:
+        import zstandard
+    except ImportError as excpt:
+        raise ImportError(
+            "Zstandard compressed files require the 'zstandard' package, "
+            "install it with `pip install zstandard`."
+        ) from excpt
+    return zstandard
+
+
+def normalize_compression(compression: Optional[str]) -> Optional[str]:
+    """
+    Validate a compression, given by name ("gzip") or file extension ("gz").
+
+    :param compression: The compression, None for uncompressed files.
+    :return: The name of the compression, None for uncompressed files.
+    :raises: ValueError if the compression is not supported.
+    """
+    if compression is None:
+        return None
+    compression = COMPRESSION_EXTENSIONS.get(compression, compression)
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression: {compression}, "
+            f"use one of {COMPRESSIONS}."
+        )
+    return compression
+
+
+def split_compression_extension(file_name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split the compression extension from a file name, e.g. "data.csv.gz"
+    gives ("data.csv", "gzip").
+
+    :param file_name: The name (or path) of the file.
+    :return: A tuple of (file name without the compression extension,
+    compression), the compression is None for uncompressed files.
+    """
+    base_name, _, extension = file_name.rpartition(".")
+    if base_name and extension.lower() in COMPRESSION_EXTENSIONS:
+        return base_name, COMPRESSION_EXTENSIONS[extension.lower()]
+    return file_name, None
+
+
+def open_decompressed(source: io.IOBase, compression: str) -> io.IOBase:
+    """
+    Open a binary stream decompressing another one as it is read, so the
+    decompressed content is never held in memory as a whole.
+
+    :param source: The compressed binary stream.
+    :param compression: "gzip", "bz2", "xz" or "zstd".
+    :return: A binary stream over the decompressed content.
+    """
+    compression = normalize_compression(compression)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=source, mode="rb")
+    if compression == "bz2":
+        return bz2.BZ2File(source, mode="rb")
+    if compression == "xz":
+        return lzma.LZMAFile(source, mode="rb")
+    zstandard = import_zstandard()
+    return zstandard.ZstdDecompressor().stream_reader(
+        source, read_across_frames=True
+    )
+
+
+def open_compressed(
+    sink: io.IOBase, compression: str, level: Optional[int] = None
+) -> io.IOBase:
+    """
+    Open a binary stream compressing its content into another one. Closing
+    the returned stream writes the end of the compressed data, without
+    closing the sink.
+
+    :param sink: The binary stream receiving the compressed content.
+    :param compression: "gzip", "bz2", "xz" or "zstd".
+    :param level: Optional compression level, DEFAULT_COMPRESSION_LEVELS by
+    default.
+    :return: A writable binary stream.
+    """
+    compression = normalize_compression(compression)
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[compression]
+    if compression == "gzip":
+        # No timestamp, so the same content gives the same object
+        return gzip.GzipFile(
+            fileobj=sink, mode="wb", compresslevel=level, mtime=0
+        )
+    if compression == "bz2":
+        return bz2.BZ2File(sink, mode="wb", compresslevel=level)
+    if compression == "xz":
+        return lzma.LZMAFile(sink, mode="wb", preset=level)
+    zstandard = import_zstandard()
+    return zstandard.ZstdCompressor(level=level).stream_writer(
+        sink, closefd=False
+    )
+
+
+def compress_bytes(
+    data: Union[bytes, bytearray, memoryview],
+    compression: str,
+    level: Optional[int] = None,
+) -> bytes:
+    """
+    Compress bytes data at once.
+
+    :param data: The data to compress.
+    :param compression: "gzip", "bz2", "xz" or "zstd".
+    :param level: Optional compression level, DEFAULT_COMPRESSION_LEVELS by
+    default.
+    :return: The compressed data.
+    """
+    sink = io.BytesIO()
+    with open_compressed(sink, compression, level) as compressed_sink:
+        compressed_sink.write(data)
+    return sink.getvalue()
+
+
+class StreamDecompressor:
+    def __init__(self, compression: str):
+        """
+        Initialize a StreamDecompressor object.
+
+        An incremental decompressor for content received in chunks, such as
+        the chunks of a streamed S3 object. Files made of several
+        concatenated members (or frames) are decompressed as a whole.
+
+        :param compression: "gzip", "bz2", "xz" or "zstd".
+        """
+        self._compression = normalize_compression(compression)
+        self._decompressor = self._new_decompressor()
+        self._started = False
+
+    @property
+    def compression(self) -> str:
+        """
+        Get the compression of the StreamDecompressor object.
+        """
+        return self._compression
+
+    def _new_decompressor(self):
+        """
+        Create the decompressor of a member of the content.
+
+        :return: A decompressor object.
+        """
+        if self._compression == "gzip":
+            return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        if self._compression == "bz2":
+            return bz2.BZ2Decompressor()
+        if self._compression == "xz":
+            return lzma.LZMADecompressor()
+        return import_zstandard().ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """
+        Decompress the next chunk of the content.
+
+        :param chunk: The compressed chunk.
+        :return: The decompressed data (possibly empty).
+        """
+        decompressed = []
+        self._started = self._started or bool(chunk)
+        while chunk:
+            if self._decompressor.eof:
+                # The chunk starts the next member
+                self._decompressor = self._new_decompressor()
+            decompressed.append(self._decompressor.decompress(chunk))
+            chunk = (
+                self._decompressor.unused_data
+                if self._decompressor.eof
+                else b""
+            )
+        return b"".join(decompressed)
+
+    def flush(self) -> bytes:
+        """
+        Finish the decompression once the whole content has been fed.
+
+        :return: The last decompressed data (possibly empty).
+        :raises: EOFError if the content is truncated.
+        """
+        if self._started and not self._decompressor.eof:
+            raise EOFError(
+                f"The {self._compression} content ended before its "
+                "end-of-stream marker."
+            )
+        return b""
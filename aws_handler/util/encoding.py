@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+import codecs
+import threading
+
+
+def detect_encoding_from_bytes(bytes, chunk_size=1024):
+    """
+    Detect the encoding of bytes data with chardet, feeding the whole data
+    until the detector reaches a conclusion.
+
+    :param bytes: The bytes data to detect the encoding from.
+    :param chunk_size: Chunk size to feed into the encoding detector.
+
+    :return: The detected encoding.
+    """
+    import chardet
+
+    detector = chardet.UniversalDetector()
+    offset = 0
+    while offset < len(bytes):
+        # Extract a chunk of data
+        data = bytes[offset : offset + chunk_size]
+
+        # Feed the chunk of data to the encoding detector
+        detector.feed(data)
+
+        # Check if the detector has reached a conclusion
+        if detector.done:
+            break
+
+        # Update the offset to process the next chunk
+        offset += chunk_size
+
+    # Close the encoding detector
+    detector.close()
+
+    return detector.result["encoding"]
+
+
+class EncodingDetector:
+    def __init__(self, sample_size: int = 64 * 1024, cache_size: int = 4096):
+        """
+        Initialize an EncodingDetector object.
+
+        The detector only looks at the first `sample_size` bytes of the data.
+        The sample is first validated as strict UTF-8, which is much cheaper
+        than chardet and covers most files; chardet only runs on the sample
+        when that validation fails. Results can be cached per key (for
+        instance the bucket, key and ETag of an object).
+
+        :param sample_size: Number of bytes at the start of the data used to
+        detect the encoding.
+        :param cache_size: Maximum number of cached results.
+        """
+        self._sample_size = sample_size
+        self._cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def sample_size(self) -> int:
+        """
+        Get the sample_size of the EncodingDetector object.
+
+        :return: The number of bytes used to detect the encoding.
+        """
+        return self._sample_size
+
+    def detect(
+        self, data: bytes, cache_key: Optional[Hashable] = None
+    ) -> Optional[str]:
+        """
+        Detect the encoding of bytes data.
+
+        :param data: The bytes data to detect the encoding from.
+        :param cache_key: Optional key identifying the data, the result is
+        cached under it.
+        :return: The detected encoding, None if it could not be detected.
+        """
+        if cache_key is not None:
+            with self._cache_lock:
+                if cache_key in self._cache:
+                    self._cache.move_to_end(cache_key)
+                    return self._cache[cache_key]
+
+        encoding = self._detect_sample(data)
+
+        if cache_key is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = encoding
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return encoding
+
+    def _detect_sample(self, data: bytes) -> Optional[str]:
+        """
+        Detect the encoding of the sample at the start of the data.
+
+        :param data: The bytes data to detect the encoding from.
+        :return: The detected encoding.
+        """
+        is_complete = len(data) <= self._sample_size
+        with memoryview(data) as data_view:
+            sample = bytes(data_view[: self._sample_size])
+
+        # A multi-byte character may be cut at the end of a partial sample
+        utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            utf8_decoder.decode(sample, final=is_complete)
+        except UnicodeDecodeError:
+            return detect_encoding_from_bytes(sample)
+
+        # Only the whole data proves that no other character follows
+        if is_complete and sample.isascii():
+            return "ascii"
+        return "utf-8"
@@ -0,0 +1,124 @@
+from typing import Any, Generator, Iterable, Optional
+import importlib.util
+import io
+import json
+
+# File extensions of the newline-delimited JSON (JSON Lines) files
+NDJSON_FILE_TYPES = ("jsonl", "ndjson")
+
+# MIME type of the newline-delimited JSON files
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# Supported JSON engines, the fastest first
+JSON_ENGINES = ("orjson", "json")
+
+# Number of bytes serialized at a time when streaming JSON records
+NDJSON_CHUNK_SIZE = 1024 * 1024
+
+
+def get_json_engine(engine: Optional[str] = None) -> str:
+    """
+    Get the engine used to parse and serialize JSON.
+
+    :param engine: "orjson" or "json". If None, orjson when the `orjson`
+    package is installed, the standard library otherwise.
+    :return: The name of the engine.
+    :raises: ValueError if the engine is not supported.
+    """
+    if engine is None:
+        if importlib.util.find_spec("orjson") is not None:
+            return "orjson"
+        return "json"
+    if engine not in JSON_ENGINES:
+        raise ValueError(
+            f"Unsupported JSON engine: {engine}, use one of {JSON_ENGINES}."
+        )
+    return engine
+
+
+def json_loads(data, engine: Optional[str] = None) -> Any:
+    """
+    Parse a JSON document.
+
+    orjson rejects a few documents accepted by the standard library (NaN
+    literals, integers larger than 64 bits), those are parsed again with
+    the standard library.
+
+    :param data: The JSON document, as bytes, any bytes-like object or str.
+    :param engine: "orjson" or "json", see `get_json_engine`.
+    :return: The parsed document.
+    """
+    if get_json_engine(engine) == "orjson":
+        import orjson
+
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if not isinstance(data, (str, bytes, bytearray)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def load_json(source: io.IOBase, engine: Optional[str] = None) -> Any:
+    """
+    Parse a JSON document from a binary stream.
+
+    :param source: The binary stream.
+    :param engine: "orjson" or "json", see `get_json_engine`.
+    :return: The parsed document.
+    """
+    if get_json_engine(engine) == "orjson":
+        return json_loads(source.read(), "orjson")
+    return json.load(source)
+
+
+def json_dumps(obj: Any, engine: Optional[str] = None) -> bytes:
+    """
+    Serialize an object to compact, UTF-8 encoded JSON. Values that are not
+    JSON types (dates, decimals, ...) are serialized as strings.
+
+    :param obj: The object to serialize.
+    :param engine: "orjson" or "json", see `get_json_engine`.
+    :return: The JSON document.
+    """
+    if get_json_engine(engine) == "orjson":
+        import orjson
+
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        obj, default=str, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def iter_ndjson_chunks(
+    records: Iterable,
+    engine: Optional[str] = None,
+    chunk_size: int = NDJSON_CHUNK_SIZE,
+) -> Generator[bytes, None, None]:
+    """
+    Serialize records to newline-delimited JSON, one record per line, in
+    chunks of about `chunk_size` bytes, so the records are consumed lazily
+    and never serialized as a whole.
+
+    :param records: An iterable of JSON-serializable records.
+    :param engine: "orjson" or "json", see `get_json_engine`.
+    :param chunk_size: Number of bytes serialized before a chunk is yielded.
+    :return: A generator yielding the UTF-8 encoded chunks.
+    """
+    engine = get_json_engine(engine)
+    lines = []
+    size = 0
+    for record in records:
+        line = json_dumps(record, engine)
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield b"\n".join(lines) + b"\n"
+            lines, size = [], 0
+    if lines:
+        yield b"\n".join(lines) + b"\n"
@@ -0,0 +1,326 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Supported ways of interpreting the keywords
+MATCH_MODES = ("glob", "anchored", "regex")
+
+
+def _tokenize_glob(keyword: str) -> List[Tuple[bool, str]]:
+    """
+    Split a glob pattern into literal and wildcard tokens.
+
+    :param keyword: The glob pattern to split.
+    :return: A list of tuples of (is_literal, text), where the text of a
+    wildcard token is already translated into a regular expression.
+    """
+    tokens: List[Tuple[bool, str]] = []
+    literal = []
+    index = 0
+    length = len(keyword)
+    while index < length:
+        char = keyword[index]
+        index += 1
+        if char == "*":
+            # Collapse consecutive wildcards into a single one
+            while index < length and keyword[index] == "*":
+                index += 1
+            regex = ".*"
+        elif char == "?":
+            regex = "."
+        elif char == "[":
+            end = index
+            if end < length and keyword[end] == "!":
+                end += 1
+            if end < length and keyword[end] == "]":
+                end += 1
+            while end < length and keyword[end] != "]":
+                end += 1
+            if end >= length:
+                # Unclosed set, the bracket is matched literally
+                literal.append(char)
+                continue
+            char_set = keyword[index:end].replace("\\", "\\\\")
+            index = end + 1
+            if char_set.startswith("!"):
+                char_set = "^" + char_set[1:]
+            elif char_set.startswith("^"):
+                char_set = "\\" + char_set
+            regex = f"[{char_set}]"
+        else:
+            literal.append(char)
+            continue
+
+        if literal:
+            tokens.append((True, "".join(literal)))
+            literal = []
+        tokens.append((False, regex))
+
+    if literal:
+        tokens.append((True, "".join(literal)))
+    return tokens
+
+
+def glob_to_regex(keyword: str) -> str:
+    """
+    Translate a glob pattern into a regular expression.
+
+    `*` matches any sequence of characters (including "/"), `?` matches a
+    single character and `[...]` / `[!...]` match a set of characters. Every
+    other character is matched literally.
+
+    :param keyword: The glob pattern to translate.
+    :return: The equivalent regular expression (not anchored).
+    """
+    return "".join(
+        re.escape(text) if is_literal else text
+        for is_literal, text in _tokenize_glob(keyword)
+    )
+
+
+def glob_literal_prefix(keyword: str) -> str:
+    """
+    Get the literal characters a glob pattern starts with.
+
+    :param keyword: The glob pattern.
+    :return: The literal prefix, empty if the pattern starts with a wildcard.
+    """
+    tokens = _tokenize_glob(keyword)
+    if tokens and tokens[0][0]:
+        return tokens[0][1]
+    return ""
+
+
+def literal_trie_regex(literals: Iterable[str]) -> str:
+    """
+    Build a regular expression matching any of several literals, factored
+    as a trie: the engine follows a single branch per character instead of
+    trying every literal, and matches the longest literal at a position.
+
+    :param literals: The non-empty literals.
+    :return: The regular expression (not anchored).
+    """
+    trie: Dict[str, Dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        # An empty key marks the end of a literal
+        node[""] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1:
+            regex = branches[0]
+        else:
+            regex = "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A literal ends here, the longer ones are optional
+            return f"(?:{regex})?"
+        return regex
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: List[str], mode: str = "glob"):
+        """
+        Initialize a KeywordMatcher object.
+
+        Every keyword is compiled once. Keys are routed to their candidate
+        keywords in a single pass: the longest literal of every glob keyword
+        (the literal prefix of every anchored keyword) is compiled into one
+        trie-shaped regular expression, so a key is scanned once whatever
+        the number of keywords, and the regular expressions of the
+        candidate keywords only confirm the matches. Regex keywords have no
+        known literal and are each searched in the key.
+
+        :param keywords: The keywords to match keys against.
+        :param mode: How the keywords are interpreted:
+            - "glob": glob pattern found anywhere in the key (default).
+            - "anchored": glob pattern that must match the whole key.
+            - "regex": regular expression found anywhere in the key.
+        :raises: ValueError if the mode is not supported.
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(
+                f"Unsupported match mode: {mode}. "
+                f"Expected one of {', '.join(MATCH_MODES)}."
+            )
+        self._mode = mode
+        # Remove duplicated keywords keeping their order
+        self._keywords: List[str] = list(dict.fromkeys(keywords))
+        self._entries = [self._compile(keyword) for keyword in self._keywords]
+        # Indexes of the keywords to check for every key
+        self._always_candidates: List[int] = []
+        # Indexes of the candidate keywords of each dispatch literal
+        self._literal_candidates: Dict[str, List[int]] = {}
+        self._dispatcher: Optional[re.Pattern] = None
+        if mode != "regex":
+            self._build_dispatcher()
+
+    @property
+    def keywords(self) -> List[str]:
+        """
+        Get the keywords of the KeywordMatcher object.
+
+        :return: The keywords of the KeywordMatcher object.
+        """
+        return self._keywords
+
+    @property
+    def mode(self) -> str:
+        """
+        Get the match mode of the KeywordMatcher object.
+
+        :return: The match mode of the KeywordMatcher object.
+        """
+        return self._mode
+
+    def _compile(
+        self, keyword: str
+    ) -> Tuple[str, str, str, Optional[re.Pattern]]:
+        """
+        Compile a keyword.
+
+        :param keyword: The keyword to compile.
+        :return: A tuple of (keyword, required literal, literal prefix,
+        compiled pattern). The pattern is None when the keyword is a plain
+        literal and the literal check is enough.
+        """
+        if self._mode == "regex":
+            return keyword, "", "", re.compile(keyword, re.DOTALL)
+
+        tokens = _tokenize_glob(keyword)
+        literals = [text for is_literal, text in tokens if is_literal]
+        required_literal = max(literals, key=len, default="")
+        prefix = glob_literal_prefix(keyword)
+
+        if self._mode == "anchored":
+            pattern = re.compile(glob_to_regex(keyword) + r"\Z", re.DOTALL)
+            return keyword, required_literal, prefix, pattern
+
+        if all(is_literal for is_literal, _ in tokens):
+            # Plain substring search, no regular expression needed
+            return keyword, keyword, "", None
+        pattern = re.compile(glob_to_regex(keyword), re.DOTALL)
+        return keyword, required_literal, "", pattern
+
+    def _build_dispatcher(self):
+        """
+        Compile the dispatch literals of the keywords into a single regular
+        expression, and map each literal to the keywords it routes to.
+
+        A key containing a literal also contains every literal the first
+        one contains (for anchored keywords, starts with every prefix of
+        it), so the keywords of those are candidates too. This way only the
+        longest literal found at each position is needed.
+        """
+        anchored = self._mode == "anchored"
+        keyword_literals = [
+            prefix if anchored else literal
+            for _, literal, prefix, _ in self._entries
+        ]
+        literals = set(filter(None, keyword_literals))
+        for literal in literals:
+            self._literal_candidates[literal] = [
+                index
+                for index, keyword_literal in enumerate(keyword_literals)
+                if keyword_literal
+                and (
+                    literal.startswith(keyword_literal)
+                    if anchored
+                    else keyword_literal in literal
+                )
+            ]
+        self._always_candidates = [
+            index
+            for index, keyword_literal in enumerate(keyword_literals)
+            if not keyword_literal
+        ]
+        if literals:
+            trie_regex = literal_trie_regex(literals)
+            self._dispatcher = re.compile(
+                trie_regex if anchored else f"(?=({trie_regex}))"
+            )
+
+    def _dispatch(self, key: str) -> List[int]:
+        """
+        Get the candidate keywords of a key, scanning the key once.
+
+        :param key: The key (file path) to match.
+        :return: The indexes of the candidate keywords, in order.
+        """
+        if self._dispatcher is None:
+            return self._always_candidates
+        if self._mode == "anchored":
+            found = self._dispatcher.match(key)
+            found_literals = [found.group()] if found else []
+        else:
+            found_literals = self._dispatcher.findall(key)
+        if not found_literals:
+            return self._always_candidates
+        candidates = set(self._always_candidates)
+        for literal in found_literals:
+            candidates.update(self._literal_candidates[literal])
+        return sorted(candidates)
+
+    def listing_prefixes(self, folder: str = "") -> List[str]:
+        """
+        Get the prefixes that must be listed to find every key under a folder
+        matching the keywords.
+
+        Only anchored keywords can restrict the listing: the literal prefix of
+        each keyword is pushed down into the folder and overlapping prefixes
+        are merged. Keywords that cannot match a key under the folder are
+        discarded. Glob and regex keywords match anywhere in the key, even
+        when they do not start with a wildcard ("reports/2024-*" matches
+        "reports/x/reports/2024-01.csv"), so they need the whole folder.
+
+        :param folder: The common folder of the searched files.
+        :return: A sorted list of prefixes not overlapping each other.
+        """
+        if self._mode != "anchored":
+            return [folder]
+
+        candidate_prefixes = set()
+        for _, _, prefix, _ in self._entries:
+            if prefix.startswith(folder):
+                candidate_prefixes.add(prefix)
+            elif folder.startswith(prefix):
+                candidate_prefixes.add(folder)
+
+        # Keep only the prefixes not already covered by a shorter one
+        prefixes: List[str] = []
+        for prefix in sorted(candidate_prefixes):
+            if not prefixes or not prefix.startswith(prefixes[-1]):
+                prefixes.append(prefix)
+        return prefixes
+
+    def match(self, key: str) -> List[str]:
+        """
+        Get the keywords matching a key.
+
+        :param key: The key (file path) to match.
+        :return: The list of matching keywords, in the keywords order.
+        """
+        if self._mode == "regex":
+            return [
+                keyword
+                for keyword, _, _, pattern in self._entries
+                if pattern.search(key)
+            ]
+        anchored = self._mode == "anchored"
+        matches = []
+        for index in self._dispatch(key):
+            keyword, _, _, pattern = self._entries[index]
+            if pattern is None or (
+                pattern.match(key) if anchored else pattern.search(key)
+            ):
+                matches.append(keyword)
+        return matches
@@ -0,0 +1,28 @@
+from typing import Any, Callable, Dict
+import importlib
+
+
+def lazy_module_getattr(
+    module_name: str, lazy_imports: Dict[str, str]
+) -> Callable[[str], Any]:
+    """
+    Build the module `__getattr__` (PEP 562) of a package exporting names
+    that are imported on first access, so importing the package does not
+    load their (heavy) modules.
+
+    :param module_name: The name of the package, `__name__`.
+    :param lazy_imports: The exported names and the module defining each.
+    :return: The `__getattr__` function of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in lazy_imports:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            )
+        value = getattr(importlib.import_module(lazy_imports[name]), name)
+        # Cache the value, the next accesses do not go through __getattr__
+        setattr(importlib.import_module(module_name), name, value)
+        return value
+
+    return __getattr__
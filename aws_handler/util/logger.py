@@ -1,5 +1,6 @@
 from logging.handlers import RotatingFileHandler
 import logging
+import threading
 
 
 # Define color codes for different log levels
@@ -83,7 +84,34 @@ def setup_logger(name, info_only=True):
     return logger
 
 
-# Set up the logger only once
-log = logging.getLogger("aws-handler")
-if not log.handlers:
-    setup_logger(name="aws-handler")
+class DeferredLogger:
+    def __init__(self, name: str):
+        """
+        Initialize a DeferredLogger object.
+
+        Stands for the logger of the package, which is only set up (with
+        `setup_logger`) the first time it is used, not when the package is
+        imported. A level set on the logger beforehand is kept.
+
+        :param name: The name of the logger.
+        """
+        self._name = name
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    logger = logging.getLogger(self._name)
+                    # Set up the logger only once
+                    if not logger.handlers:
+                        level = logger.level
+                        setup_logger(name=self._name)
+                        if level != logging.NOTSET:
+                            logger.setLevel(level)
+                    self._logger = logger
+        return getattr(self._logger, name)
+
+
+log = DeferredLogger("aws-handler")
@@ -1,7 +1,202 @@
+from typing import Generator, List, Tuple, Union
 import io
 
+import numpy as np
 import pandas as pd
 
+from aws_handler.util.arrow import (
+    ARROW_CONTENT_TYPE,
+    ARROW_FILE_TYPES,
+    PARQUET_CONTENT_TYPE,
+    write_arrow_file,
+)
+from aws_handler.util.json_engine import NDJSON_CONTENT_TYPE, NDJSON_FILE_TYPES
+
+# MIME type of the Excel files
+EXCEL_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# MIME type of each file format a DataFrame can be uploaded as
+DATAFRAME_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "excel": EXCEL_CONTENT_TYPE,
+    "xlsx": EXCEL_CONTENT_TYPE,
+    "xls": EXCEL_CONTENT_TYPE,
+    "parquet": PARQUET_CONTENT_TYPE,
+    "feather": ARROW_CONTENT_TYPE,
+    "arrow": ARROW_CONTENT_TYPE,
+    "jsonl": NDJSON_CONTENT_TYPE,
+    "ndjson": NDJSON_CONTENT_TYPE,
+}
+
+
+# Number of rows sampled to estimate the width of the Excel columns
+EXCEL_WIDTH_SAMPLE_ROWS = 1000
+
+# Number of rows converted at a time when writing an Excel sheet
+EXCEL_WRITE_BATCH_ROWS = 10000
+
+# Maximum number of rows of an Excel sheet, header included
+EXCEL_MAX_ROWS = 1048576
+
+# Day 0 of the Excel dates
+EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+
+class _SequentialWriter(io.RawIOBase):
+    """
+    Write-only, non-seekable view of a binary stream, so zip archives are
+    written sequentially (with data descriptors) even into streams that
+    only support forward seeks, such as compressed streams.
+    """
+
+    def __init__(self, sink: io.IOBase):
+        super().__init__()
+        self._sink = sink
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._sink.write(data)
+        size = len(memoryview(data).cast("B"))
+        self._position += size
+        return size
+
+    def flush(self):
+        self._sink.flush()
+
+
+def estimate_column_widths(
+    df_data: pd.DataFrame, sample_rows: int = EXCEL_WIDTH_SAMPLE_ROWS
+) -> List[int]:
+    """
+    Estimate the width of the Excel columns of a DataFrame from the length
+    of the headers and of the cells of a bounded sample of rows (the first
+    ones and rows spread evenly over the rest), so large DataFrames are
+    never converted to strings as a whole.
+
+    :param df_data: Pandas DataFrame to write.
+    :param sample_rows: Maximum number of rows sampled.
+    :return: The width of each column.
+    """
+    if len(df_data) > sample_rows:
+        head_rows = np.arange(sample_rows // 2)
+        spread_rows = np.linspace(
+            sample_rows // 2, len(df_data) - 1, sample_rows - sample_rows // 2
+        ).astype(np.intp)
+        df_data = df_data.iloc[np.concatenate([head_rows, spread_rows])]
+
+    widths = []
+    for i, col in enumerate(df_data.columns):
+        cell_lengths = df_data.iloc[:, i].astype(str).str.len()
+        max_length = max(
+            # Length of the longest sampled cell in the column
+            int(cell_lengths.max()) if len(cell_lengths) else 0,
+            # Length of the column header
+            len(str(col)),
+        )
+        widths.append(max_length + 2)
+    return widths
+
+
+def write_df_to_excel(
+    df_data: pd.DataFrame, sink: io.IOBase, sheet_name: str = "data"
+) -> None:
+    """
+    Write a Pandas DataFrame as an Excel workbook with headers filtering and
+    column adjustments.
+
+    XlsxWriter runs in constant memory mode: the rows are written in order,
+    in batches, and flushed to a temporary file, instead of keeping every
+    cell of the workbook in memory. The workbook is then written
+    sequentially, so the sink does not need to be seekable (it can be an
+    upload stream).
+
+    :param df_data: Pandas DataFrame to write.
+    :param sink: A binary stream to write the workbook to.
+    :param sheet_name: Name of the sheet.
+    :raises: ValueError if the DataFrame does not fit in a sheet.
+    """
+    if len(df_data) >= EXCEL_MAX_ROWS:
+        raise ValueError(
+            f"The DataFrame has {len(df_data)} rows, an Excel sheet can only "
+            f"have {EXCEL_MAX_ROWS - 1} rows under its header."
+        )
+
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(
+        _SequentialWriter(sink),
+        {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "remove_timezone": True,
+            "nan_inf_to_errors": True,
+        },
+    )
+    worksheet = workbook.add_worksheet(sheet_name)
+    # Same header style as `pd.DataFrame.to_excel`
+    header_format = workbook.add_format(
+        {"bold": True, "border": 1, "align": "center", "valign": "top"}
+    )
+    for i, width in enumerate(estimate_column_widths(df_data)):
+        worksheet.set_column(i, i, width)
+    # Add filters to the headers
+    worksheet.autofilter(0, 0, df_data.shape[0], df_data.shape[1] - 1)
+
+    worksheet.write_row(
+        0, 0, [str(col) for col in df_data.columns], header_format
+    )
+    # Pick the writer of each column once, instead of per cell
+    date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    column_writers = []
+    date_columns = []
+    for i, dtype in enumerate(df_data.dtypes):
+        if dtype.kind in "iuf":
+            column_writers.append(worksheet.write_number)
+        elif dtype.kind == "b":
+            column_writers.append(worksheet.write_boolean)
+        elif dtype.kind == "M":
+            column_writers.append(
+                lambda row, col, value: worksheet.write_number(
+                    row, col, value, date_format
+                )
+            )
+            date_columns.append(i)
+        else:
+            column_writers.append(worksheet.write)
+
+    for start in range(0, len(df_data), EXCEL_WRITE_BATCH_ROWS):
+        df_batch = df_data.iloc[start : start + EXCEL_WRITE_BATCH_ROWS]
+        if date_columns:
+            # Dates are converted to Excel serial numbers all at once
+            df_batch = df_batch.copy()
+            for i in date_columns:
+                dates = df_batch.iloc[:, i]
+                if dates.dt.tz is not None:
+                    dates = dates.dt.tz_localize(None)
+                df_batch.isetitem(
+                    i, (dates - EXCEL_EPOCH) / pd.Timedelta(days=1)
+                )
+        # Missing values are written as empty cells
+        rows = (
+            df_batch.astype(object)
+            .where(df_batch.notna(), None)
+            .to_numpy()
+            .tolist()
+        )
+        for row_number, row in enumerate(rows, start + 1):
+            for col_number, value in enumerate(row):
+                if value is not None:
+                    column_writers[col_number](row_number, col_number, value)
+    workbook.close()
+
 
 @staticmethod
 def format_df_to_excel(df_data: pd.DataFrame) -> io.BytesIO:
@@ -13,24 +208,105 @@ def format_df_to_excel(df_data: pd.DataFrame) -> io.BytesIO:
     :return: Excel buffer containing the formatted DataFrame.
     """
     excel_buffer = io.BytesIO()
-    # Use the XlsxWriter engine to write the DataFrame to the buffer
-    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
-        df_data.to_excel(writer, index=False, sheet_name="data")
-        worksheet = writer.sheets["data"]
-        # Add filters to the headers
-        worksheet.autofilter(0, 0, df_data.shape[0], df_data.shape[1] - 1)
-        # Adjust column width to fit content and headers
-        for i, col in enumerate(df_data.columns):
-            max_length = (
-                max(
-                    # Length of the longest cell in the column
-                    df_data[col].astype(str).map(len).max(),
-                    # Length of the column header
-                    len(str(col)),
-                )
-                + 2
-            )
-            worksheet.set_column(i, i, max_length)
-
+    write_df_to_excel(df_data, excel_buffer)
     excel_buffer.seek(0)
     return excel_buffer
+
+
+def get_dataframe_content_type(
+    data: Union[pd.DataFrame, io.BytesIO], file_format: str
+) -> str:
+    """
+    Validate the data and file format of a DataFrame upload.
+
+    :param data: Pandas DataFrame or BytesIO buffer to upload.
+    :param file_format: File format for the uploaded data.
+    :return: The MIME type of the file format.
+    :raises: ValueError if the data type or the file format is not
+    supported.
+    """
+    if not isinstance(data, (pd.DataFrame, io.BytesIO)):
+        raise ValueError(
+            "Unsupported data type. "
+            "Expected Pandas DataFrame or BytesIO buffer."
+        )
+    if file_format not in DATAFRAME_CONTENT_TYPES:
+        raise ValueError(
+            "Unsupported file format. "
+            f"Only {', '.join(DATAFRAME_CONTENT_TYPES)} are supported."
+        )
+    return DATAFRAME_CONTENT_TYPES[file_format]
+
+
+def iter_csv_slices(
+    df_data: pd.DataFrame, rows_per_slice: int = 50000
+) -> Generator[bytes, None, None]:
+    """
+    Serialize a Pandas DataFrame to CSV in slices of rows, so the whole CSV
+    never has to be held in memory.
+
+    :param df_data: Pandas DataFrame to serialize.
+    :param rows_per_slice: Number of rows serialized at a time.
+    :return: A generator yielding the UTF-8 encoded CSV slices, the first
+    one including the header.
+    """
+    if df_data.empty:
+        yield df_data.to_csv(index=False).encode("utf-8")
+        return
+
+    for start in range(0, len(df_data), rows_per_slice):
+        df_slice = df_data.iloc[start : start + rows_per_slice]
+        yield df_slice.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def iter_ndjson_slices(
+    df_data: pd.DataFrame, rows_per_slice: int = 50000
+) -> Generator[bytes, None, None]:
+    """
+    Serialize a Pandas DataFrame to newline-delimited JSON (one object per
+    row, dates in ISO 8601, floats with 15 significant digits) in slices of
+    rows.
+
+    :param df_data: Pandas DataFrame to serialize.
+    :param rows_per_slice: Number of rows serialized at a time.
+    :return: A generator yielding the UTF-8 encoded slices.
+    """
+    for start in range(0, len(df_data), rows_per_slice):
+        df_slice = df_data.iloc[start : start + rows_per_slice]
+        yield df_slice.to_json(
+            orient="records",
+            lines=True,
+            date_format="iso",
+            double_precision=15,
+            force_ascii=False,
+        ).encode("utf-8")
+
+
+def dataframe_to_bytes(
+    data: Union[pd.DataFrame, io.BytesIO], file_format: str
+) -> Tuple[bytes, str]:
+    """
+    Serialize a Pandas DataFrame (or take an already serialized BytesIO
+    buffer) to be uploaded in a given file format.
+
+    :param data: Pandas DataFrame or BytesIO buffer to serialize.
+    :param file_format: File format for the serialized data.
+    :return: A tuple of (serialized data, content type).
+    :raises: ValueError if the data type or the file format is not
+    supported.
+    """
+    content_type = get_dataframe_content_type(data, file_format)
+    if isinstance(data, io.BytesIO):
+        return data.getvalue(), content_type
+
+    data_buffer = io.BytesIO()
+    if file_format == "csv":
+        data.to_csv(data_buffer, index=False)
+    elif file_format in ARROW_FILE_TYPES:
+        write_arrow_file(data, file_format, data_buffer)
+    elif file_format in NDJSON_FILE_TYPES:
+        for ndjson_slice in iter_ndjson_slices(data):
+            data_buffer.write(ndjson_slice)
+    else:
+        write_df_to_excel(data, data_buffer)
+    return data_buffer.getvalue(), content_type
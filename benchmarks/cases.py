@@ -0,0 +1,187 @@
+from typing import Callable, Dict, List, Tuple
+import importlib.util
+import io
+import itertools
+
+import pandas as pd
+
+from aws_handler import S3Handler
+from aws_handler.s3_handler.models import UrlFile
+from aws_handler.util.encoding import EncodingDetector
+from benchmarks.datasets import DATASETS_PATH, SMALL_FILES_PATH
+
+# Default number of measured runs of each benchmark
+DEFAULT_REPEAT = 5
+
+# Maximum number of small files read one by one
+SMALL_FILES_READ = 100
+
+# Number of rows of each chunk of the chunked reads
+CHUNK_ROWS = 100000
+
+# Number of bytes of the text whose encoding is detected as a whole, chardet
+# reads about 100 KiB per second
+WHOLE_DETECTION_BYTES = 256 * 1024
+
+# Folder (prefix) of the written objects
+OUTPUT_PATH = "output"
+
+# A benchmark: (name, operation, run, repeat). `run` returns the number of
+# bytes and of items (rows, files, ...) it processed.
+Benchmark = Tuple[str, str, Callable[[], Tuple[int, int]], int]
+
+
+def count_items(result) -> int:
+    """
+    Count the items of a read result: rows of DataFrames (of every sheet
+    for a dictionary of DataFrames), elements of lists, or 1.
+
+    :param result: The result of `read_file`, or a chunk.
+    :return: The number of items.
+    """
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    if isinstance(result, dict) and all(
+        isinstance(value, pd.DataFrame) for value in result.values()
+    ):
+        return sum(len(value) for value in result.values())
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def get_benchmarks(
+    s3_handler: S3Handler, datasets: Dict[str, bytes], repeat: int
+) -> List[Benchmark]:
+    """
+    Build the benchmarks of the handler over the uploaded datasets.
+
+    :param s3_handler: The handler, over the bucket holding the datasets.
+    :param datasets: The content of each dataset by object key.
+    :param repeat: Number of measured runs of each benchmark.
+    :return: The benchmarks, in running order.
+    """
+    benchmarks: List[Benchmark] = []
+
+    def add(name: str, operation: str, run, runs: int = repeat) -> None:
+        benchmarks.append((name, operation, run, runs))
+
+    def dataset_file(name: str) -> Tuple[UrlFile, int]:
+        key = f"{DATASETS_PATH}/{name}"
+        return UrlFile(last_modified="", s3_url=key), len(datasets[key])
+
+    small_keys = sorted(
+        key for key in datasets if key.startswith(f"{SMALL_FILES_PATH}/")
+    )
+
+    # Listing
+    def list_small_files() -> Tuple[int, int]:
+        files = s3_handler.retrieve_files(SMALL_FILES_PATH, ["*.csv"])
+        return 0, files["*.csv"].number_of_files
+
+    add("list_small_files", "retrieve_files", list_small_files)
+
+    # Whole reads
+    small_files = itertools.cycle(small_keys)
+
+    def read_small_file() -> Tuple[int, int]:
+        key = next(small_files)
+        df = s3_handler.read_file(UrlFile(last_modified="", s3_url=key))
+        return len(datasets[key]), len(df)
+
+    add(
+        "read_small_csv",
+        "read_file",
+        read_small_file,
+        min(len(small_keys), SMALL_FILES_READ),
+    )
+
+    for name, read_kwargs in (
+        ("large.csv", {}),
+        ("wide.csv", {}),
+        ("multi.xlsx", {"sheet_name": None}),
+        ("large.json", {}),
+        ("large.jsonl", {}),
+        ("large.xml", {}),
+    ):
+
+        def read_dataset(name=name, read_kwargs=read_kwargs):
+            file_object, size = dataset_file(name)
+            result = s3_handler.read_file(file_object, **read_kwargs)
+            return size, count_items(result)
+
+        add(f"read_{name.replace('.', '_')}", "read_file", read_dataset)
+
+    # Chunked reads
+    for name, chunk_kwargs in (
+        ("large.csv", {}),
+        ("large.jsonl", {}),
+        ("large.json", {"as_records": True}),
+        ("large.xml", {"xml_item": "export/rows/row"}),
+        ("multi.xlsx", {}),
+    ):
+
+        def read_dataset_chunks(name=name, chunk_kwargs=chunk_kwargs):
+            file_object, size = dataset_file(name)
+            items = sum(
+                count_items(chunk)
+                for chunk in s3_handler.read_file_by_chunks(
+                    file_object, chunk_rows=CHUNK_ROWS, **chunk_kwargs
+                )
+            )
+            return size, items
+
+        add(
+            f"read_chunks_{name.replace('.', '_')}",
+            "read_file_by_chunks",
+            read_dataset_chunks,
+        )
+
+    # Writes
+    large_df = pd.read_csv(io.BytesIO(datasets[f"{DATASETS_PATH}/large.csv"]))
+    wide_df = pd.read_csv(io.BytesIO(datasets[f"{DATASETS_PATH}/wide.csv"]))
+    excel_df = pd.read_excel(
+        io.BytesIO(datasets[f"{DATASETS_PATH}/multi.xlsx"])
+    )
+    writes = [
+        ("large.csv", large_df),
+        ("large.csv.gz", large_df),
+        ("large.jsonl", large_df),
+        ("records.xlsx", excel_df),
+        ("wide.csv", wide_df),
+    ]
+    if importlib.util.find_spec("pyarrow") is not None:
+        writes += [("large.parquet", large_df), ("wide.parquet", wide_df)]
+
+    for file_name, df in writes:
+
+        def write_dataset(file_name=file_name, df=df):
+            s3_handler.write_df_to_s3(df, file_name, OUTPUT_PATH)
+            return int(df.memory_usage(deep=True).sum()), len(df)
+
+        add(
+            f"write_{file_name.replace('.', '_')}",
+            "write_df_to_s3",
+            write_dataset,
+        )
+
+    # Encoding detection
+    latin1_text = datasets[f"{DATASETS_PATH}/latin1.txt"]
+    utf8_text = datasets[f"{DATASETS_PATH}/large.csv"]
+    for name, text, detector in (
+        ("detect_utf8_sample", utf8_text, EncodingDetector()),
+        ("detect_latin1_sample", latin1_text, EncodingDetector()),
+        (
+            "detect_latin1_whole",
+            latin1_text[:WHOLE_DETECTION_BYTES],
+            EncodingDetector(sample_size=WHOLE_DETECTION_BYTES),
+        ),
+    ):
+
+        def detect_encoding(text=text, detector=detector):
+            detector.detect(text)
+            return min(len(text), detector.sample_size), 1
+
+        add(name, "encoding_detector", detect_encoding)
+
+    return benchmarks
@@ -0,0 +1,91 @@
+"""
+Compare two benchmark results, for example of two commits.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.2
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import sys
+
+# Relative increase of the median duration reported as a regression
+DEFAULT_THRESHOLD = 0.1
+
+
+def compare_results(
+    baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict]:
+    """
+    Compare the median durations and peak RSS increases of the benchmarks
+    present in both results.
+
+    :param baseline: The results of `run_benchmarks` to compare against.
+    :param current: The new results of `run_benchmarks`.
+    :param threshold: Relative increase of the median duration above which
+    a benchmark is a regression.
+    :return: A comparison per benchmark, with the "ratio" of the median
+    durations (current / baseline) and whether it is a "regression".
+    """
+    baseline_results = {
+        result["name"]: result for result in baseline["results"]
+    }
+    comparisons = []
+    for result in current["results"]:
+        previous = baseline_results.get(result["name"])
+        if previous is None:
+            continue
+        previous_median = previous["seconds"]["p50"]
+        median = result["seconds"]["p50"]
+        ratio = median / previous_median if previous_median else None
+        comparisons.append(
+            {
+                "name": result["name"],
+                "baseline_seconds": previous_median,
+                "current_seconds": median,
+                "ratio": ratio,
+                "baseline_rss_increase_bytes": previous["rss"][
+                    "peak_increase_bytes"
+                ],
+                "current_rss_increase_bytes": result["rss"][
+                    "peak_increase_bytes"
+                ],
+                "regression": ratio is not None and ratio > 1 + threshold,
+            }
+        )
+    return comparisons
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("baseline", help="Results to compare against.")
+    parser.add_argument("current", help="New results.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown of the median reported as a regression.",
+    )
+    options = parser.parse_args(args)
+
+    with open(options.baseline) as baseline, open(options.current) as current:
+        comparisons = compare_results(
+            json.load(baseline), json.load(current), options.threshold
+        )
+
+    for comparison in comparisons:
+        ratio = comparison["ratio"]
+        print(
+            f"{comparison['name']:<28} "
+            f"{comparison['baseline_seconds']:>10.4f}s "
+            f"{comparison['current_seconds']:>10.4f}s "
+            f"{'x' + format(ratio, '.2f') if ratio else '-':>7}"
+            f"{'  REGRESSION' if comparison['regression'] else ''}"
+        )
+    # A non-zero exit code lets CI jobs fail on regressions
+    if any(comparison["regression"] for comparison in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
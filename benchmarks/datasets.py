@@ -0,0 +1,173 @@
+from typing import Dict
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+# Size of the synthetic datasets per scale
+SCALES = {
+    "small": {
+        "small_files": 50,
+        "wide_rows": 1000,
+        "wide_columns": 200,
+        "large_rows": 20000,
+        "excel_rows": 2000,
+        "excel_sheets": 3,
+        "json_rows": 20000,
+        "xml_rows": 20000,
+        "text_bytes": 1024 * 1024,
+    },
+    "default": {
+        "small_files": 500,
+        "wide_rows": 20000,
+        "wide_columns": 200,
+        "large_rows": 1000000,
+        "excel_rows": 50000,
+        "excel_sheets": 3,
+        "json_rows": 300000,
+        "xml_rows": 300000,
+        "text_bytes": 4 * 1024 * 1024,
+    },
+}
+
+# Seed of the random generator, so the datasets are the same on every run
+SEED = 0
+
+# Folders (prefixes) of the datasets in the bucket
+SMALL_FILES_PATH = "small"
+DATASETS_PATH = "datasets"
+
+
+def make_records_df(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Build a DataFrame mixing integers, floats, strings, categories and
+    dates.
+
+    :param rows: Number of rows.
+    :param rng: The random generator.
+    :return: The DataFrame.
+    """
+    ids = np.arange(rows)
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "amount": rng.normal(100, 25, rows).round(2),
+            "quantity": rng.integers(0, 1000, rows),
+            "name": [f"customer-{value}" for value in ids],
+            "country": rng.choice(["CR", "ES", "FR", "MX", "US"], rows),
+            "created": pd.date_range("2024-01-01", periods=rows, freq="s")
+            .strftime("%Y-%m-%d %H:%M:%S")
+            .tolist(),
+        }
+    )
+
+
+def make_wide_df(
+    rows: int, columns: int, rng: np.random.Generator
+) -> pd.DataFrame:
+    """
+    Build a DataFrame with many float columns.
+
+    :param rows: Number of rows.
+    :param columns: Number of columns.
+    :param rng: The random generator.
+    :return: The DataFrame.
+    """
+    return pd.DataFrame(
+        rng.random((rows, columns)).round(6),
+        columns=[f"column_{index}" for index in range(columns)],
+    )
+
+
+def make_excel(rows: int, sheets: int, rng: np.random.Generator) -> bytes:
+    """
+    Build a workbook with several sheets of records.
+
+    :param rows: Number of rows of each sheet.
+    :param sheets: Number of sheets.
+    :param rng: The random generator.
+    :return: The content of the xlsx file.
+    """
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        for sheet in range(sheets):
+            make_records_df(rows, rng).to_excel(
+                writer, sheet_name=f"sheet_{sheet}", index=False
+            )
+    return buffer.getvalue()
+
+
+def make_xml(rows: int, rng: np.random.Generator) -> bytes:
+    """
+    Build an XML document with one repeated element per record.
+
+    :param rows: Number of records.
+    :param rng: The random generator.
+    :return: The content of the XML file.
+    """
+    df = make_records_df(rows, rng)
+    items = "".join(
+        f'<row id="{row.id}"><name>{row.name}</name>'
+        f"<amount>{row.amount}</amount><country>{row.country}</country>"
+        f"</row>"
+        for row in df.itertuples()
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f"<export><rows>{items}</rows></export>"
+    ).encode("utf-8")
+
+
+def make_latin1_text(size: int) -> bytes:
+    """
+    Build a Latin-1 encoded text, which is not valid UTF-8.
+
+    :param size: Approximate size in bytes.
+    :return: The encoded text.
+    """
+    line = "Año,Dirección,Teléfono,Señal,Cañón,Pingüino\n"
+    return (line * (size // len(line) + 1)).encode("latin-1")[:size]
+
+
+def build_datasets(scale: str) -> Dict[str, bytes]:
+    """
+    Build the synthetic datasets of a scale.
+
+    :param scale: "small" or "default", see SCALES.
+    :return: The content of each dataset by object key.
+    """
+    sizes = SCALES[scale]
+    rng = np.random.default_rng(SEED)
+    datasets = {
+        f"{SMALL_FILES_PATH}/part-{index:05d}.csv": make_records_df(20, rng)
+        .to_csv(index=False)
+        .encode("utf-8")
+        for index in range(sizes["small_files"])
+    }
+
+    large_df = make_records_df(sizes["large_rows"], rng)
+    datasets[f"{DATASETS_PATH}/large.csv"] = large_df.to_csv(
+        index=False
+    ).encode("utf-8")
+    datasets[f"{DATASETS_PATH}/wide.csv"] = (
+        make_wide_df(sizes["wide_rows"], sizes["wide_columns"], rng)
+        .to_csv(index=False)
+        .encode("utf-8")
+    )
+    datasets[f"{DATASETS_PATH}/multi.xlsx"] = make_excel(
+        sizes["excel_rows"], sizes["excel_sheets"], rng
+    )
+
+    json_df = make_records_df(sizes["json_rows"], rng)
+    datasets[f"{DATASETS_PATH}/large.json"] = json.dumps(
+        json_df.to_dict(orient="records")
+    ).encode("utf-8")
+    datasets[f"{DATASETS_PATH}/large.jsonl"] = json_df.to_json(
+        orient="records", lines=True
+    ).encode("utf-8")
+    datasets[f"{DATASETS_PATH}/large.xml"] = make_xml(sizes["xml_rows"], rng)
+    datasets[f"{DATASETS_PATH}/latin1.txt"] = make_latin1_text(
+        sizes["text_bytes"]
+    )
+    return datasets
@@ -0,0 +1,146 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+
+# Percentiles of the durations reported for each benchmark
+PERCENTILES = (50, 90, 99)
+
+# Interval in seconds between two RSS samples
+RSS_SAMPLE_INTERVAL = 0.005
+
+
+def get_rss() -> int:
+    """
+    Get the current resident set size of the process.
+
+    :return: The RSS in bytes. Where /proc is not available, the peak RSS of
+    the process so far is returned instead.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes on the other systems
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class PeakRssSampler:
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        """
+        Initialize a PeakRssSampler object.
+
+        Used as a context manager, it samples the RSS of the process in a
+        background thread, and keeps the RSS at the start and the highest
+        sampled RSS.
+
+        :param interval: Interval in seconds between two samples.
+        """
+        self._interval = interval
+        self._start_rss = 0
+        self._peak_rss = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def start_rss(self) -> int:
+        """
+        Get the start rss of the PeakRssSampler object.
+        """
+        return self._start_rss
+
+    @property
+    def peak_rss(self) -> int:
+        """
+        Get the peak rss of the PeakRssSampler object.
+        """
+        return self._peak_rss
+
+    def __enter__(self) -> "PeakRssSampler":
+        self._start_rss = self._peak_rss = get_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._peak_rss = max(self._peak_rss, get_rss())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._peak_rss = max(self._peak_rss, get_rss())
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Compute a percentile with linear interpolation between the closest
+    ranks.
+
+    :param values: The values, in any order.
+    :param percent: The percentile, between 0 and 100.
+    :return: The percentile of the values.
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def measure(
+    run: Callable[[], Tuple[int, int]], repeat: int, warmup: int = 1
+) -> Dict:
+    """
+    Run a benchmark several times and summarize its durations, throughput
+    and memory use.
+
+    :param run: The benchmark, returning the number of bytes and of items
+    (rows, files, ...) it processed.
+    :param repeat: Number of measured runs.
+    :param warmup: Number of runs before the measured ones.
+    :return: A dictionary with the durations in seconds (mean, min, max and
+    percentiles), the median throughput in bytes and items per second, and
+    the start and peak RSS in bytes.
+    """
+    for _ in range(warmup):
+        run()
+    gc.collect()
+
+    durations: List[float] = []
+    processed_bytes = processed_items = 0
+    with PeakRssSampler() as rss_sampler:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            processed_bytes, processed_items = run()
+            durations.append(time.perf_counter() - start)
+
+    median = percentile(durations, 50)
+    return {
+        "repeat": repeat,
+        "bytes": processed_bytes,
+        "items": processed_items,
+        "seconds": {
+            "mean": sum(durations) / len(durations),
+            "min": min(durations),
+            "max": max(durations),
+            **{f"p{pct}": percentile(durations, pct) for pct in PERCENTILES},
+        },
+        "throughput": {
+            "bytes_per_second": processed_bytes / median if median else None,
+            "items_per_second": processed_items / median if median else None,
+        },
+        "rss": {
+            "start_bytes": rss_sampler.start_rss,
+            "peak_bytes": rss_sampler.peak_rss,
+            "peak_increase_bytes": rss_sampler.peak_rss
+            - rss_sampler.start_rss,
+        },
+    }
@@ -0,0 +1,159 @@
+"""
+Run the benchmark suite against an in-process S3 stand-in (moto) and print
+the results as JSON.
+
+    python -m benchmarks.run --scale small --output results.json
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import datetime
+import importlib.metadata
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+
+from benchmarks.cases import DEFAULT_REPEAT, get_benchmarks
+from benchmarks.datasets import SCALES, build_datasets
+from benchmarks.measure import measure
+
+# Bucket of the datasets in the S3 stand-in
+BENCHMARK_BUCKET = "aws-handler-benchmarks"
+
+# Packages whose versions are recorded with the results
+RECORDED_PACKAGES = ("boto3", "botocore", "moto", "pandas", "pyarrow")
+
+
+def get_git_commit() -> Optional[str]:
+    """
+    Get the commit of the working tree.
+
+    :return: The commit hash, None outside of a git repository.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_environment(scale: str) -> Dict:
+    """
+    Describe the environment of a run, so results can be compared.
+
+    :param scale: The scale of the datasets.
+    :return: A dictionary describing the run.
+    """
+    versions = {}
+    for package in RECORDED_PACKAGES:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": get_git_commit(),
+        "scale": scale,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def run_benchmarks(
+    scale: str = "small",
+    repeat: int = DEFAULT_REPEAT,
+    only: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Upload the synthetic datasets to a mocked S3 bucket and run the
+    benchmarks.
+
+    :param scale: The scale of the datasets, see `datasets.SCALES`.
+    :param repeat: Number of measured runs of each benchmark.
+    :param only: Optional substrings, only the benchmarks whose name or
+    operation contains one of them are run.
+    :return: A dictionary with the "environment" and the "results".
+    """
+    # moto patches botocore, the credentials are never sent anywhere
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    # The debug logs of every read would be measured too
+    logging.getLogger("aws-handler").setLevel(logging.WARNING)
+
+    import boto3
+    from moto import mock_aws
+
+    from aws_handler import S3Handler
+
+    results = []
+    with mock_aws():
+        s3 = boto3.client("s3")
+        s3.create_bucket(Bucket=BENCHMARK_BUCKET)
+        print(f"Building the {scale} datasets", file=sys.stderr)
+        datasets = build_datasets(scale)
+        for key, content in datasets.items():
+            s3.put_object(Bucket=BENCHMARK_BUCKET, Key=key, Body=content)
+
+        s3_handler = S3Handler(bucket=BENCHMARK_BUCKET)
+        for name, operation, run, runs in get_benchmarks(
+            s3_handler, datasets, repeat
+        ):
+            if only and not any(
+                pattern in name or pattern in operation for pattern in only
+            ):
+                continue
+            print(f"Running {name}", file=sys.stderr)
+            results.append(
+                {"name": name, "operation": operation, **measure(run, runs)}
+            )
+
+    return {"environment": get_environment(scale), "results": results}
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--scale",
+        choices=sorted(SCALES),
+        default="small",
+        help="Size of the synthetic datasets.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Number of measured runs of each benchmark.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="Only run the benchmarks whose name or operation contains one "
+        "of these substrings.",
+    )
+    parser.add_argument(
+        "--output", help="File to write the results to, stdout by default."
+    )
+    options = parser.parse_args(args)
+
+    report = json.dumps(
+        run_benchmarks(options.scale, options.repeat, options.only), indent=2
+    )
+    if options.output:
+        with open(options.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import boto3
+import pytest
+
+TEST_BUCKET = "my-bucket"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """
+    A boto3 S3 client with a bucket, served in-process by moto.
+    """
+    mock_aws = pytest.importorskip("moto").mock_aws
+    # moto patches botocore, the credentials are never sent anywhere
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=TEST_BUCKET)
+        yield s3
+
+
+@pytest.fixture
+def boto3_connector(s3_client, monkeypatch):
+    """
+    A new Boto3Connector singleton, whose clients are served by moto.
+    """
+    from aws_handler.aws_integration.connectors.boto3.boto3_connector import (
+        Boto3Connector,
+    )
+
+    monkeypatch.setattr(Boto3Connector, "_instance", None)
+    return Boto3Connector()
@@ -0,0 +1,185 @@
+from contextlib import aclosing
+import asyncio
+
+import pytest
+
+TEST_BUCKET = "my-bucket"
+SUB_PREFIXES = ["data/a/", "data/b/", "data/c/", "data/d/", "data/e/"]
+SUB_KEYS = [
+    f"{sub_prefix}part-{index}.csv"
+    for sub_prefix in SUB_PREFIXES
+    for index in range(3)
+]
+# Parts of the multipart uploads, the minimum accepted by S3
+PART_SIZE = 5 * 1024 * 1024
+
+
+def put_objects(s3_client, keys):
+    for key in keys:
+        s3_client.put_object(Bucket=TEST_BUCKET, Key=key, Body=b"a\n1\n")
+
+
+def new_tasks(tasks_before):
+    """
+    Get the tasks still running that were started after a snapshot.
+    """
+    return asyncio.all_tasks() - tasks_before
+
+
+def test_aiobotocore_listing_sub_prefixes(
+    aiobotocore_connector, moto_server_client
+):
+    """
+    Test that the sub-prefixes listed concurrently, with fewer workers than
+    sub-prefixes, return every key once.
+    """
+    put_objects(moto_server_client, ["data/root.csv", "other.csv"] + SUB_KEYS)
+    aiobotocore_connector.LIST_MAX_WORKERS = 2
+
+    async def list_files():
+        async with aiobotocore_connector:
+            return await aiobotocore_connector.s3_list_files(
+                TEST_BUCKET, folder="data", keywords=["*.csv"]
+            )
+
+    files = asyncio.run(list_files())
+    assert sorted(info["file_path"] for info in files["*.csv"]) == sorted(
+        ["data/root.csv"] + SUB_KEYS
+    )
+
+
+def test_aiobotocore_listing_early_close(
+    aiobotocore_connector, moto_server_client
+):
+    """
+    Test that closing the listing early, while the workers wait for room in
+    the queue, cancels them without hanging.
+    """
+    put_objects(moto_server_client, SUB_KEYS)
+    aiobotocore_connector.LIST_MAX_WORKERS = 1
+
+    async def list_first_object():
+        async with aiobotocore_connector:
+            tasks_before = asyncio.all_tasks()
+            objects = aiobotocore_connector._iter_objects_concurrently(
+                TEST_BUCKET, ["data/"]
+            )
+            async with aclosing(objects):
+                async for obj in objects:
+                    break
+            return obj, new_tasks(tasks_before)
+
+    obj, pending_tasks = asyncio.run(
+        asyncio.wait_for(list_first_object(), timeout=30)
+    )
+    assert obj["Key"] in SUB_KEYS
+    assert pending_tasks == set()
+
+
+def test_aiobotocore_listing_worker_error(
+    aiobotocore_connector, moto_server_client, monkeypatch
+):
+    """
+    Test that an error listing a sub-prefix reaches the caller and stops
+    the other workers.
+    """
+    put_objects(moto_server_client, SUB_KEYS)
+    iter_pages = aiobotocore_connector._iter_pages
+
+    async def failing_iter_pages(bucket, prefix="", **kwargs):
+        if prefix == "data/c/":
+            raise RuntimeError("Listing failed")
+        async for page in iter_pages(bucket, prefix=prefix, **kwargs):
+            yield page
+
+    monkeypatch.setattr(
+        aiobotocore_connector, "_iter_pages", failing_iter_pages
+    )
+
+    async def list_files():
+        async with aiobotocore_connector:
+            tasks_before = asyncio.all_tasks()
+            with pytest.raises(RuntimeError, match="Listing failed"):
+                await aiobotocore_connector.s3_list_files(
+                    TEST_BUCKET, folder="data/", keywords=["*.csv"]
+                )
+            return new_tasks(tasks_before)
+
+    assert asyncio.run(list_files()) == set()
+
+
+def test_aiobotocore_read_by_chunks(aiobotocore_connector, moto_server_client):
+    """
+    Test that an object is streamed in chunks of the requested size, with
+    the encoding detected from the first chunk and a final sentinel.
+    """
+    content = "id;name\n" + "".join(f"{index};ñandú\n" for index in range(50))
+    moto_server_client.put_object(
+        Bucket=TEST_BUCKET, Key="data.csv", Body=content.encode("utf-8")
+    )
+
+    async def read_chunks():
+        async with aiobotocore_connector:
+            chunks = aiobotocore_connector.s3_read_file_by_chunks(
+                TEST_BUCKET, "data.csv", chunk_size=100, raw=True
+            )
+            return [chunk async for chunk in chunks]
+
+    chunks = asyncio.run(read_chunks())
+    assert chunks[-1] == (-1, -1)
+    assert all(len(chunk) == 100 for chunk, _ in chunks[:-2])
+    assert b"".join(chunk for chunk, _ in chunks[:-1]) == content.encode()
+    assert {encoding for _, encoding in chunks[:-1]} == {"utf-8"}
+
+
+def test_aiobotocore_multipart_upload(
+    aiobotocore_connector, moto_server_client
+):
+    """
+    Test that a stream larger than a part is uploaded in several parts.
+    """
+    aiobotocore_connector.MULTIPART_PART_SIZE = PART_SIZE
+    chunk = bytes(index % 251 for index in range(1024 * 1024))
+
+    async def upload():
+        async with aiobotocore_connector:
+            await aiobotocore_connector.upload_stream_to_s3(
+                [chunk] * 11, TEST_BUCKET, "large.bin"
+            )
+
+    asyncio.run(upload())
+    response = moto_server_client.get_object(
+        Bucket=TEST_BUCKET, Key="large.bin"
+    )
+    assert response["Body"].read() == chunk * 11
+    assert response["ETag"].endswith('-3"')
+
+
+def test_aiobotocore_multipart_upload_failure(
+    aiobotocore_connector, moto_server_client
+):
+    """
+    Test that a failure of the producer after the first parts aborts the
+    multipart upload, so no upload is left open and no object is written.
+    """
+    aiobotocore_connector.MULTIPART_PART_SIZE = PART_SIZE
+
+    async def failing_chunks():
+        for _ in range(2):
+            yield b"x" * PART_SIZE
+        raise RuntimeError("Serialization failed")
+
+    async def upload():
+        async with aiobotocore_connector:
+            await aiobotocore_connector.upload_stream_to_s3(
+                failing_chunks(), TEST_BUCKET, "failed.bin"
+            )
+
+    with pytest.raises(RuntimeError, match="Serialization failed"):
+        asyncio.run(upload())
+    assert "Uploads" not in moto_server_client.list_multipart_uploads(
+        Bucket=TEST_BUCKET
+    )
+    assert "Contents" not in moto_server_client.list_objects_v2(
+        Bucket=TEST_BUCKET
+    )
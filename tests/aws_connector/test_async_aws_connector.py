@@ -0,0 +1,59 @@
+import inspect
+import unittest
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AsyncAwsConnector,
+    AsyncAwsConnectorMock,
+    AwsConnector,
+)
+
+
+def get_methods(cls):
+    return {
+        method[0]: method[1]
+        for method in inspect.getmembers(cls, predicate=inspect.isfunction)
+    }
+
+
+class TestAsyncAwsConnectorInterface(unittest.TestCase):
+    """
+    Test the interface consistency of the asynchronous connectors.
+
+    AsyncAwsConnectorMock must have the same methods and signatures as
+    AsyncAwsConnector, and AsyncAwsConnector must expose the same S3 methods
+    as the blocking AwsConnector.
+    """
+
+    def test_async_aws_connector_mock_interface(self):
+        async_connector_methods = get_methods(AsyncAwsConnector)
+        async_connector_mock_methods = get_methods(AsyncAwsConnectorMock)
+
+        self.assertEqual(
+            set(async_connector_methods.keys()),
+            set(async_connector_mock_methods.keys()),
+            "The methods in AsyncAwsConnector and AsyncAwsConnectorMock do "
+            "not match.",
+        )
+        for method_name, method in async_connector_methods.items():
+            self.assertEqual(
+                str(inspect.signature(method)),
+                str(
+                    inspect.signature(
+                        async_connector_mock_methods[method_name]
+                    )
+                ),
+                f"Method signature of '{method_name}' in AsyncAwsConnector"
+                f" and AsyncAwsConnectorMock do not match.",
+            )
+
+    def test_async_aws_connector_mirrors_aws_connector(self):
+        s3_methods = {
+            method_name
+            for method_name in get_methods(AwsConnector)
+            if method_name.startswith(("s3_", "put_", "upload_"))
+        }
+        async_s3_methods = {
+            method_name
+            for method_name in get_methods(AsyncAwsConnector)
+            if method_name.startswith(("s3_", "put_", "upload_"))
+        }
+        self.assertEqual(s3_methods, async_s3_methods)
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from aws_handler.aws_integration.connectors.boto3.client_pool import (
+    Boto3ClientPool,
+    Boto3ConnectorConfig,
+)
+
+TEST_ENDPOINT_URL = "http://localhost:5000"
+
+
+def get_thread_clients(client_pool: Boto3ClientPool, threads: int):
+    clients = []
+
+    def get_client():
+        clients.append(client_pool.get_client())
+
+    workers = [threading.Thread(target=get_client) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return clients
+
+
+def test_client_config():
+    """
+    Test that the configuration is applied to the created clients.
+    """
+    config = Boto3ConnectorConfig(
+        max_pool_connections=32,
+        connect_timeout=5,
+        retry_mode="adaptive",
+        max_attempts=4,
+        tcp_keepalive=True,
+        endpoint_url=TEST_ENDPOINT_URL,
+        region_name="eu-west-1",
+    )
+    client = Boto3ClientPool(config).get_client()
+
+    assert client.meta.endpoint_url == TEST_ENDPOINT_URL
+    assert client.meta.region_name == "eu-west-1"
+    assert client.meta.config.max_pool_connections == 32
+    assert client.meta.config.connect_timeout == 5
+    assert client.meta.config.tcp_keepalive
+    assert client.meta.config.retries == {
+        "mode": "adaptive",
+        "total_max_attempts": 4,
+    }
+
+    with pytest.raises(ValueError):
+        Boto3ConnectorConfig(retry_mode="eager")
+
+
+def test_shared_and_per_thread_clients():
+    """
+    Test that the threads share a single client by default, and get their
+    own client with client_per_thread.
+    """
+    client_pool = Boto3ClientPool(
+        Boto3ConnectorConfig(region_name="us-east-1")
+    )
+    assert len(set(map(id, get_thread_clients(client_pool, 8)))) == 1
+    assert client_pool.clients_created == 1
+
+    client_pool = Boto3ClientPool(
+        Boto3ConnectorConfig(region_name="us-east-1", client_per_thread=True)
+    )
+    clients = get_thread_clients(client_pool, 8)
+    assert len(set(map(id, clients))) == 8
+    assert client_pool.get_client() is client_pool.get_client()
+    assert client_pool.clients_created == 9
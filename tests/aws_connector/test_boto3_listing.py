@@ -0,0 +1,116 @@
+from contextlib import closing
+import threading
+
+import pytest
+
+TEST_BUCKET = "my-bucket"
+# More keys than a page of list_objects_v2 (1000) directly under the folder
+ROOT_KEYS = [f"data/part-{index:05d}.csv" for index in range(1001)]
+SUB_KEYS = ["data/sub/notes.txt", "data/sub/part-00000.csv"]
+# Keys of several sub-prefixes, listed concurrently
+SUB_PREFIX_KEYS = [
+    f"data/{sub_prefix}/part-{index}.csv"
+    for sub_prefix in "abcdef"
+    for index in range(3)
+]
+
+
+def test_boto3_listing_pagination(s3_client, boto3_connector):
+    """
+    Test that prefixes holding more than 1000 keys are listed in full, and
+    that only the keys after `start_after` are listed, across pages.
+    """
+    for key in ROOT_KEYS + SUB_KEYS + ["other.csv"]:
+        s3_client.put_object(Bucket=TEST_BUCKET, Key=key, Body=b"a\n1\n")
+
+    files = boto3_connector.s3_list_files(
+        TEST_BUCKET, folder="data", keywords=["*.csv", "*.txt"]
+    )
+    assert sorted(info["file_path"] for info in files["*.csv"]) == (
+        ROOT_KEYS + SUB_KEYS[1:]
+    )
+    assert [info["file_path"] for info in files["*.txt"]] == SUB_KEYS[:1]
+    assert files["*.csv"][0]["size"] == 4
+
+    objects = boto3_connector.s3_iter_objects(TEST_BUCKET, "data/")
+    assert [info["file_path"] for info in objects] == ROOT_KEYS + SUB_KEYS
+
+    objects = boto3_connector.s3_iter_objects(
+        TEST_BUCKET, "data/", start_after=ROOT_KEYS[2]
+    )
+    assert [info["file_path"] for info in objects] == (
+        ROOT_KEYS[3:] + SUB_KEYS
+    )
+    objects = boto3_connector.s3_iter_objects(
+        TEST_BUCKET, "data/", start_after=ROOT_KEYS[-1]
+    )
+    assert [info["file_path"] for info in objects] == SUB_KEYS
+
+
+def put_sub_prefix_objects(s3_client):
+    for key in SUB_PREFIX_KEYS + ["data/root.csv"]:
+        s3_client.put_object(Bucket=TEST_BUCKET, Key=key, Body=b"a\n1\n")
+
+
+def test_boto3_listing_sub_prefixes(s3_client, boto3_connector):
+    """
+    Test that the sub-prefixes of a folder, listed concurrently by fewer
+    workers than sub-prefixes, return every key once.
+    """
+    put_sub_prefix_objects(s3_client)
+    boto3_connector.LIST_MAX_WORKERS = 2
+
+    files = boto3_connector.s3_list_files(
+        TEST_BUCKET, folder="data", keywords=["*.csv"]
+    )
+    assert sorted(info["file_path"] for info in files["*.csv"]) == sorted(
+        SUB_PREFIX_KEYS + ["data/root.csv"]
+    )
+
+
+def test_boto3_listing_early_close(s3_client, boto3_connector):
+    """
+    Test that closing the listing early, while the workers wait for room in
+    the queue, releases them without hanging.
+    """
+    put_sub_prefix_objects(s3_client)
+    boto3_connector.LIST_MAX_WORKERS = 2
+    listed = []
+
+    def list_first_file():
+        with closing(
+            boto3_connector.s3_iter_files(TEST_BUCKET, "data/", ["*.csv"])
+        ) as files:
+            for _, file_info in files:
+                listed.append(file_info["file_path"])
+                if file_info["file_path"] in SUB_PREFIX_KEYS:
+                    break
+
+    listing_thread = threading.Thread(target=list_first_file)
+    listing_thread.start()
+    listing_thread.join(timeout=30)
+
+    assert not listing_thread.is_alive()
+    assert listed[-1] in SUB_PREFIX_KEYS
+    assert len(listed) < len(SUB_PREFIX_KEYS)
+
+
+def test_boto3_listing_worker_error(s3_client, boto3_connector):
+    """
+    Test that an error listing a page of a sub-prefix, in a worker thread,
+    reaches the caller.
+    """
+    put_sub_prefix_objects(s3_client)
+
+    def fail_sub_prefix(params, **kwargs):
+        if params.get("Prefix") == "data/c/":
+            raise RuntimeError("Listing failed")
+
+    boto3_connector._get_client().meta.events.register(
+        "provide-client-params.s3.ListObjectsV2", fail_sub_prefix
+    )
+
+    with pytest.raises(RuntimeError, match="Listing failed"):
+        boto3_connector.s3_list_files(
+            TEST_BUCKET, folder="data/", keywords=["*.csv"]
+        )
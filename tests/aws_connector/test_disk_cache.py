@@ -0,0 +1,86 @@
+import os
+
+from aws_handler.aws_integration.connectors.boto3.disk_cache import DiskCache
+
+TEST_BUCKET = "my-bucket"
+
+
+def test_disk_cache_versions(tmp_path):
+    """
+    Test that an object is only served for the cached ETag, and that a new
+    version replaces the previous one.
+    """
+    disk_cache = DiskCache(str(tmp_path))
+    disk_cache.write("bucket", "key", '"v1"', b"first")
+
+    assert disk_cache.get_etag("bucket", "key") == '"v1"'
+    assert disk_cache.read("bucket", "key", '"v1"')[:] == b"first"
+    assert disk_cache.read("bucket", "key", '"v2"') is None
+
+    disk_cache.write("bucket", "key", '"v2"', b"second")
+    assert disk_cache.get_etag("bucket", "key") == '"v2"'
+    assert disk_cache.read("bucket", "key", '"v1"') is None
+    assert disk_cache.read("bucket", "key", '"v2"')[:] == b"second"
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    """
+    Test that the least recently read objects are evicted once the cache
+    exceeds its maximum size.
+    """
+    disk_cache = DiskCache(str(tmp_path), max_bytes=30)
+    for key in ("a", "b", "c"):
+        disk_cache.write("bucket", key, "etag", key.encode() * 10)
+    # Reading "a" makes "b" the least recently used object
+    disk_cache.read("bucket", "a", "etag")
+    disk_cache.write("bucket", "d", "etag", b"d" * 10)
+
+    assert disk_cache.get_etag("bucket", "b") is None
+    assert disk_cache.read("bucket", "a", "etag")[:] == b"a" * 10
+    assert disk_cache.read("bucket", "d", "etag")[:] == b"d" * 10
+
+
+def test_boto3_connector_disk_cache(s3_client, boto3_connector, tmp_path):
+    """
+    Test that the objects read through the disk cache are validated with a
+    conditional GET, served from the cache while unchanged, and downloaded
+    again once overwritten or evicted.
+    """
+    statuses = []
+    boto3_connector._get_client().meta.events.register(
+        "after-call.s3.GetObject",
+        lambda http_response, **kwargs: statuses.append(
+            http_response.status_code
+        ),
+    )
+    boto3_connector.enable_disk_cache(str(tmp_path), max_bytes=10)
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="a.txt", Body=b"first")
+
+    def read(key):
+        content, _ = boto3_connector.s3_read_file(
+            TEST_BUCKET, key, detect_encoding=False
+        )
+        return content
+
+    # Downloads are ranged GETs (206), cache hits are answered by a 304
+    assert read("a.txt") == "first"
+    assert read("a.txt") == "first"
+    assert statuses == [206, 304]
+
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="a.txt", Body=b"second")
+    assert read("a.txt") == "second"
+    assert read("a.txt") == "second"
+    assert statuses[2:] == [206, 304]
+
+    # Removed by another process: the cached ETag is still valid
+    etag = boto3_connector.disk_cache.get_etag(TEST_BUCKET, "a.txt")
+    os.unlink(tmp_path / DiskCache._file_name(TEST_BUCKET, "a.txt", etag))
+    assert read("a.txt") == "second"
+    assert statuses[4:] == [304, 206]
+
+    # Evicted once the cache exceeds its maximum size
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="b.txt", Body=b"other")
+    assert read("b.txt") == "other"
+    assert boto3_connector.disk_cache.get_etag(TEST_BUCKET, "a.txt") is None
+    assert read("a.txt") == "second"
+    assert statuses[6:] == [206, 206]
@@ -0,0 +1,129 @@
+import time
+
+import botocore.exceptions
+import pandas as pd
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration import InMemoryConnector, NetworkSimulator
+from aws_handler.s3_handler.models import UrlFile
+
+TEST_BUCKET = "my-bucket"
+TEST_DF = pd.DataFrame({"a": [1, 2], "b": ["x", "é"]})
+
+
+def test_memory_connector_objects():
+    """
+    Test that written objects are listed page by page in key order, and
+    read as a whole or by ranges with ETag conditions.
+    """
+    aws_connector = InMemoryConnector()
+    aws_connector.LIST_PAGE_SIZE = 2
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+    for index in (3, 1, 2, 0, 4):
+        s3_handler.write_df_to_s3(TEST_DF, f"part-{index}.csv.gz", "data")
+    aws_connector.put_object_to_s3(TEST_BUCKET, "other/file.txt", b"0123")
+
+    files = s3_handler.retrieve_files("data", ["*.csv.gz"])["*.csv.gz"]
+    assert [file.s3_url for file in files] == [
+        f"data/part-{index}.csv.gz" for index in range(5)
+    ]
+    assert aws_connector.network.stats["requests.ListObjectsV2"] == 3
+    assert [
+        info["file_path"]
+        for info in aws_connector.s3_iter_objects(
+            TEST_BUCKET, "data/", start_after="data/part-2.csv.gz"
+        )
+    ] == ["data/part-3.csv.gz", "data/part-4.csv.gz"]
+    pd.testing.assert_frame_equal(s3_handler.read_file(files[0]), TEST_DF)
+
+    info = aws_connector.s3_head_file(TEST_BUCKET, "other/file.txt")
+    assert info["size"] == 4
+    assert aws_connector.s3_head_file(TEST_BUCKET, "missing") is None
+    assert aws_connector.s3_read_range(
+        TEST_BUCKET, "other/file.txt", 1, 10, etag=info["etag"]
+    ) == (b"123")
+    with pytest.raises(botocore.exceptions.ClientError) as excinfo:
+        aws_connector.s3_read_range(
+            TEST_BUCKET, "other/file.txt", 0, 2, etag='"stale"'
+        )
+    assert excinfo.value.response["Error"]["Code"] == "PreconditionFailed"
+    assert aws_connector.s3_read_file(TEST_BUCKET, "data/missing.csv") == (
+        None,
+        None,
+    )
+
+
+def test_memory_connector_text_round_trip():
+    """
+    Test that a text written without compression is stored UTF-8 encoded
+    and read back unchanged.
+    """
+    aws_connector = InMemoryConnector()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+    text = "línea 1\nlínea 2\n"
+    s3_handler.write_txt_to_s3(text, "notes.txt", "texts")
+
+    info = aws_connector.s3_head_file(TEST_BUCKET, "texts/notes.txt")
+    assert info["size"] == len(text.encode("utf-8"))
+    content, encoding = s3_handler.read_file(
+        UrlFile(last_modified="", s3_url="texts/notes.txt")
+    )
+    assert content.decode(encoding) == text
+
+
+def test_memory_connector_compressed_encoding(monkeypatch):
+    """
+    Test that the encoding of compressed files is detected once per version
+    of the file by the detector of the connector, whether the file is read
+    as a whole or by chunks.
+    """
+    aws_connector = InMemoryConnector()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+    s3_handler.write_df_to_s3(TEST_DF, "part.csv.gz", "data")
+    file_object = s3_handler.retrieve_files("data", ["part"])["part"][0]
+
+    detector = aws_connector._encoding_detector
+    samples = []
+    detect_sample = detector._detect_sample
+    monkeypatch.setattr(
+        detector,
+        "_detect_sample",
+        lambda data: samples.append(data) or detect_sample(data),
+    )
+    for _ in range(2):
+        pd.testing.assert_frame_equal(
+            s3_handler.read_file(file_object), TEST_DF
+        )
+        df = pd.concat(s3_handler.read_file_by_chunks(file_object))
+        pd.testing.assert_frame_equal(df.reset_index(drop=True), TEST_DF)
+    assert len(samples) == 1
+
+
+def test_memory_connector_network():
+    """
+    Test the simulated latency, bandwidth, throttling, injected failures
+    and retries.
+    """
+    network = NetworkSimulator(latency=0.02, bandwidth=1024 * 1024)
+    aws_connector = InMemoryConnector(network, max_attempts=3)
+    aws_connector.put_object_to_s3(TEST_BUCKET, "a.bin", bytes(100 * 1024))
+
+    start = time.monotonic()
+    aws_connector.s3_read_file(TEST_BUCKET, "a.bin", raw=True)
+    assert time.monotonic() - start >= 0.02 + 0.09
+
+    network.inject_failures(2, operation="GetObject")
+    content, _ = aws_connector.s3_read_file(TEST_BUCKET, "a.bin", raw=True)
+    assert len(content) == 100 * 1024
+    assert network.stats["failed"] == network.stats["retries"] == 2
+    assert network.stats["bytes_received"] == 2 * 100 * 1024
+
+    aws_connector = InMemoryConnector(
+        NetworkSimulator(max_requests_per_second=2)
+    )
+    aws_connector.put_dict_to_s3(TEST_BUCKET, "a.json", {"a": 1})
+    aws_connector.s3_head_file(TEST_BUCKET, "a.json")
+    with pytest.raises(botocore.exceptions.ClientError) as excinfo:
+        aws_connector.s3_head_file(TEST_BUCKET, "a.json")
+    assert excinfo.value.response["Error"]["Code"] == "SlowDown"
@@ -0,0 +1,87 @@
+import botocore.exceptions
+import pytest
+
+from aws_handler.aws_integration.connectors.boto3.multipart import (
+    MIN_PART_SIZE,
+    MultipartUploadWriter,
+)
+
+TEST_BUCKET = "my-bucket"
+
+
+def make_content(size: int) -> bytes:
+    return bytes(index % 251 for index in range(size))
+
+
+def get_object(s3_client, key: str):
+    response = s3_client.get_object(Bucket=TEST_BUCKET, Key=key)
+    return response["Body"].read(), response
+
+
+def test_multipart_writer_single_put(s3_client):
+    """
+    Test that content below the threshold is uploaded with a single
+    put_object, with its content type.
+    """
+    content = make_content(1000)
+    with MultipartUploadWriter(
+        s3_client, TEST_BUCKET, "small.bin", content_type="text/csv"
+    ) as writer:
+        writer.write(content[:400])
+        writer.write(content[400:])
+
+    body, response = get_object(s3_client, "small.bin")
+    assert body == content
+    assert response["ContentType"] == "text/csv"
+    # The ETag of a multipart upload ends with the number of parts
+    assert "-" not in response["ETag"]
+
+
+def test_multipart_writer_parts(s3_client):
+    """
+    Test that content above the threshold is uploaded in several parts and
+    read back byte for byte.
+    """
+    content = make_content(2 * MIN_PART_SIZE + 1000)
+    with MultipartUploadWriter(
+        s3_client,
+        TEST_BUCKET,
+        "large.bin",
+        threshold=MIN_PART_SIZE,
+        part_size=MIN_PART_SIZE,
+        max_in_flight=2,
+    ) as writer:
+        for start in range(0, len(content), 1024 * 1024):
+            writer.write(content[start : start + 1024 * 1024])
+        assert writer.tell() == len(content)
+
+    body, response = get_object(s3_client, "large.bin")
+    assert body == content
+    assert response["ETag"].endswith('-3"')
+    assert "Uploads" not in s3_client.list_multipart_uploads(
+        Bucket=TEST_BUCKET
+    )
+
+
+def test_multipart_writer_producer_failure(s3_client):
+    """
+    Test that a failure of the producer aborts the multipart upload, so no
+    upload is left open and no object is written.
+    """
+    with pytest.raises(RuntimeError):
+        with MultipartUploadWriter(
+            s3_client,
+            TEST_BUCKET,
+            "failed.bin",
+            threshold=MIN_PART_SIZE,
+            part_size=MIN_PART_SIZE,
+        ) as writer:
+            writer.write(make_content(2 * MIN_PART_SIZE))
+            raise RuntimeError("Serialization failed")
+
+    assert writer.closed
+    assert "Uploads" not in s3_client.list_multipart_uploads(
+        Bucket=TEST_BUCKET
+    )
+    with pytest.raises(botocore.exceptions.ClientError):
+        s3_client.head_object(Bucket=TEST_BUCKET, Key="failed.bin")
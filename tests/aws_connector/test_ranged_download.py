@@ -0,0 +1,84 @@
+import botocore.exceptions
+import pytest
+
+from aws_handler.aws_integration.connectors.boto3.ranged import (
+    RangedDownloader,
+)
+
+TEST_BUCKET = "my-bucket"
+PART_SIZE = 1024 * 1024
+CONTENT = bytes(index % 251 for index in range(2 * PART_SIZE + 1000))
+
+
+class FlakyS3Client:
+    """
+    Wrapper of an S3 client failing the first requests of some ranges with
+    a 500 InternalError, and recording the requested ranges.
+    """
+
+    def __init__(self, s3, failing_ranges):
+        self._s3 = s3
+        self._failures_left = dict(failing_ranges)
+        self.ranges = []
+
+    def get_object(self, **kwargs):
+        requested_range = kwargs.get("Range")
+        self.ranges.append(requested_range)
+        if self._failures_left.get(requested_range, 0) > 0:
+            self._failures_left[requested_range] -= 1
+            raise botocore.exceptions.ClientError(
+                {
+                    "Error": {"Code": "InternalError", "Message": "Failed"},
+                    "ResponseMetadata": {"HTTPStatusCode": 500},
+                },
+                "GetObject",
+            )
+        return self._s3.get_object(**kwargs)
+
+
+def test_ranged_download_content(s3_client):
+    """
+    Test that an object larger than a part is downloaded in several ranges
+    into a buffer identical to the object, and a small one at once.
+    """
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="large.bin", Body=CONTENT)
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="small.bin", Body=b"abc")
+    flaky_client = FlakyS3Client(s3_client, {})
+    downloader = RangedDownloader(
+        lambda: flaky_client, part_size=PART_SIZE, max_workers=2
+    )
+
+    content, response = downloader.download(TEST_BUCKET, "large.bin")
+    assert isinstance(content, bytearray)
+    assert content == CONTENT
+    assert (
+        response["ETag"]
+        == s3_client.head_object(Bucket=TEST_BUCKET, Key="large.bin")["ETag"]
+    )
+    assert len(flaky_client.ranges) == 3
+
+    assert downloader.download(TEST_BUCKET, "small.bin")[0] == b"abc"
+
+
+def test_ranged_download_retries_range(s3_client):
+    """
+    Test that a range failing once is retried on its own, and that a range
+    failing on every attempt fails the download.
+    """
+    s3_client.put_object(Bucket=TEST_BUCKET, Key="large.bin", Body=CONTENT)
+    second_range = f"bytes={PART_SIZE}-{2 * PART_SIZE - 1}"
+
+    flaky_client = FlakyS3Client(s3_client, {second_range: 1})
+    downloader = RangedDownloader(lambda: flaky_client, part_size=PART_SIZE)
+    content, _ = downloader.download(TEST_BUCKET, "large.bin")
+    assert content == CONTENT
+    assert flaky_client.ranges.count(second_range) == 2
+    assert len(flaky_client.ranges) == 4
+
+    flaky_client = FlakyS3Client(s3_client, {second_range: 3})
+    downloader = RangedDownloader(
+        lambda: flaky_client, part_size=PART_SIZE, max_attempts=3
+    )
+    with pytest.raises(botocore.exceptions.ClientError):
+        downloader.download(TEST_BUCKET, "large.bin")
+    assert flaky_client.ranges.count(second_range) == 3
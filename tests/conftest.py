@@ -0,0 +1,60 @@
+import urllib.request
+
+import boto3
+import pytest
+
+MOTO_SERVER_BUCKET = "my-bucket"
+MOTO_SERVER_CREDENTIALS = {
+    "region_name": "us-east-1",
+    "aws_access_key_id": "testing",
+    "aws_secret_access_key": "testing",
+}
+
+
+@pytest.fixture(scope="session")
+def moto_server_url():
+    """
+    The URL of a moto server running in a thread, for the clients that are
+    not patched by `mock_aws` (aiobotocore).
+    """
+    moto_server = pytest.importorskip("moto.server")
+    server = moto_server.ThreadedMotoServer(
+        ip_address="127.0.0.1", port=0, verbose=False
+    )
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def moto_server_client(moto_server_url):
+    """
+    A boto3 S3 client of the moto server, reset with an empty bucket.
+    """
+    urllib.request.urlopen(
+        urllib.request.Request(
+            f"{moto_server_url}/moto-api/reset", method="POST"
+        )
+    )
+    s3 = boto3.client(
+        "s3", endpoint_url=moto_server_url, **MOTO_SERVER_CREDENTIALS
+    )
+    s3.create_bucket(Bucket=MOTO_SERVER_BUCKET)
+    return s3
+
+
+@pytest.fixture
+def aiobotocore_connector(moto_server_url, moto_server_client):
+    """
+    An AiobotocoreConnector over the moto server.
+    """
+    pytest.importorskip("aiobotocore")
+    from aws_handler.aws_integration import AiobotocoreConnector
+
+    return AiobotocoreConnector(
+        client_kwargs={
+            "endpoint_url": moto_server_url,
+            **MOTO_SERVER_CREDENTIALS,
+        }
+    )
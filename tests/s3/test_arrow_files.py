@@ -0,0 +1,61 @@
+import io
+
+import pandas as pd
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.models import UrlFile
+from aws_handler.util.arrow import write_arrow_file
+
+pytest.importorskip("pyarrow")
+
+TEST_BUCKET = "my-bucket"
+TEST_DF = pd.DataFrame(
+    {
+        "key": range(10000),
+        **{f"value_{index}": range(10000) for index in range(20)},
+    }
+)
+
+
+class RangeAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector serving byte ranges of a fixed content and counting the
+    downloaded bytes.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.bytes_read = 0
+
+    def s3_read_range(self, bucket, key, start, end, etag=None):
+        self.bytes_read += end - start
+        return self.content[start:end]
+
+
+@pytest.mark.parametrize("file_type", ["parquet", "feather"])
+def test_arrow_file_projection(file_type):
+    """
+    Test that reading some columns of a Parquet or Arrow file only downloads
+    a fraction of the file, and that the row filters are applied.
+    """
+    file_buffer = io.BytesIO()
+    write_arrow_file(TEST_DF, file_type, file_buffer)
+    content = file_buffer.getvalue()
+    aws_connector = RangeAwsConnectorMock(content)
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+
+    df = s3_handler.read_file(
+        UrlFile(
+            s3_url=f"data.{file_type}", last_modified="", size=len(content)
+        ),
+        columns=["key", "value_3"],
+        filters=[("key", "<", 100)],
+    )
+
+    expected = TEST_DF.loc[TEST_DF["key"] < 100, ["key", "value_3"]]
+    pd.testing.assert_frame_equal(df, expected)
+    assert aws_connector.bytes_read < len(content) / 2
@@ -0,0 +1,108 @@
+import asyncio
+
+import pandas as pd
+
+from aws_handler import AsyncS3Handler
+from aws_handler.s3_handler.models import UrlFile, UrlFileCollection
+
+TEST_BUCKET = "my-bucket"
+TEST_DF = pd.DataFrame(
+    {"id": range(250), "name": [f"name-{index}" for index in range(250)]}
+)
+
+
+async def records():
+    for index in range(3):
+        yield {"id": index, "tags": ["a", "b"][: index + 1]}
+
+
+def test_async_handler_write_and_read(aiobotocore_connector):
+    """
+    Test that the files written by the handler are listed and read back,
+    whole, concurrently and in chunks.
+    """
+
+    async def write_and_read():
+        async with AsyncS3Handler(
+            bucket=TEST_BUCKET, aws_connector=aiobotocore_connector
+        ) as s3_handler:
+            await s3_handler.write_df_to_s3(TEST_DF, "data.csv.gz", "out")
+            await s3_handler.write_df_to_s3(TEST_DF, "data.xlsx", "out")
+            await s3_handler.write_ndjson_to_s3(records(), "rows.jsonl", "out")
+            await s3_handler.write_txt_to_s3("hola ñandú", "notes.txt", "out")
+
+            files = await s3_handler.retrieve_files(
+                "out", ["*.csv.gz", "*.xlsx", "*.jsonl", "*.txt"]
+            )
+            results = await s3_handler.read_files(
+                UrlFileCollection(
+                    files["*.csv.gz"].url_file_objects
+                    + files["*.xlsx"].url_file_objects
+                ),
+                max_workers=2,
+            )
+            ndjson_df = await s3_handler.read_file(files["*.jsonl"][0])
+            text, encoding = await s3_handler.read_file(files["*.txt"][0])
+            chunks = [
+                chunk
+                async for chunk in s3_handler.read_file_by_chunks(
+                    files["*.csv.gz"][0], chunk_rows=100, chunk_size=512
+                )
+            ]
+            return files, results, ndjson_df, text.decode(encoding), chunks
+
+    files, results, ndjson_df, text, chunks = asyncio.run(write_and_read())
+
+    assert {keyword: files[keyword].number_of_files for keyword in files} == {
+        "*.csv.gz": 1,
+        "*.xlsx": 1,
+        "*.jsonl": 1,
+        "*.txt": 1,
+    }
+    assert list(results) == ["out/data.csv.gz", "out/data.xlsx"]
+    for df in results.values():
+        pd.testing.assert_frame_equal(df, TEST_DF)
+    assert ndjson_df["id"].tolist() == [0, 1, 2]
+    assert text == "hola ñandú"
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), TEST_DF
+    )
+
+
+def test_async_handler_read_failures(aiobotocore_connector):
+    """
+    Test that a missing file does not stop the batch of `read_files` with
+    `return_exceptions`, and that chunked reads stop at nrows.
+    """
+
+    async def read():
+        async with AsyncS3Handler(
+            bucket=TEST_BUCKET, aws_connector=aiobotocore_connector
+        ) as s3_handler:
+            await s3_handler.write_df_to_s3(TEST_DF, "data.csv", "out")
+            results = await s3_handler.read_files(
+                UrlFileCollection(
+                    [
+                        UrlFile(last_modified="", s3_url="out/missing.xlsx"),
+                        UrlFile(last_modified="", s3_url="out/data.csv"),
+                    ]
+                ),
+                return_exceptions=True,
+            )
+            chunks = [
+                chunk
+                async for chunk in s3_handler.read_file_by_chunks(
+                    UrlFile(last_modified="", s3_url="out/data.csv"),
+                    chunk_rows=10,
+                    nrows=25,
+                    chunk_size=64,
+                )
+            ]
+            return results, chunks
+
+    results, chunks = asyncio.run(read())
+
+    assert isinstance(results["out/missing.xlsx"], Exception)
+    pd.testing.assert_frame_equal(results["out/data.csv"], TEST_DF)
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
@@ -0,0 +1,149 @@
+import io
+
+import pandas as pd
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.models import UrlFile
+from aws_handler.s3_handler.reader.parsers import CsvChunkParser
+
+CSV_CONTENT = (
+    b'id;name;note\n1;a;"first\nline"\n2;b;"semi;colon"\n'
+    b'3;c;"say ""hi"""\n4;d;plain\n5;e;"last\nrow"'
+)
+
+
+class ChunkedAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector streaming a large CSV file and counting the chunks read.
+    """
+
+    def __init__(self):
+        self.chunks_read = 0
+        self.closed = False
+
+    def s3_read_file_by_chunks(self, bucket, key, chunk_size, **kwargs):
+        content = b"x,y,z\n" + b"".join(
+            f"{row},{row * 2},{row * 3}\n".encode() for row in range(10**5)
+        )
+        try:
+            for start in range(0, len(content), chunk_size):
+                self.chunks_read += 1
+                yield content[start : start + chunk_size], "ascii"
+        finally:
+            self.closed = True
+
+
+def parse_in_chunks(parser: CsvChunkParser, chunk_size: int) -> pd.DataFrame:
+    dfs = []
+    for start in range(0, len(CSV_CONTENT), chunk_size):
+        dfs.extend(
+            parser.feed(CSV_CONTENT[start : start + chunk_size], "ascii")
+        )
+    dfs.extend(parser.finish())
+    return dfs
+
+
+def test_csv_chunks_respect_quoting():
+    """
+    Test that rows split between chunks, including quoted fields with
+    newlines and delimiters, are parsed as if the file was read at once.
+    """
+    expected = pd.read_csv(io.BytesIO(CSV_CONTENT), sep=";")
+
+    for chunk_size in (1, 3, 7, 64, len(CSV_CONTENT)):
+        dfs = parse_in_chunks(CsvChunkParser(), chunk_size)
+        pd.testing.assert_frame_equal(
+            pd.concat(dfs, ignore_index=True), expected
+        )
+
+
+def test_csv_chunks_row_count():
+    """
+    Test that the DataFrames have the requested number of rows and the
+    columns of the header.
+    """
+    dfs = parse_in_chunks(CsvChunkParser(chunk_rows=2), 5)
+
+    assert [len(df) for df in dfs] == [2, 2, 1]
+    assert all(df.columns.tolist() == ["id", "name", "note"] for df in dfs)
+    assert dfs[-1]["note"].tolist() == ["last\nrow"]
+
+
+def test_csv_chunks_usecols_and_skiprows():
+    """
+    Test that the rows before the header are skipped and that only the
+    selected columns are parsed.
+    """
+    content = b"generated by\nexport tool\n" + CSV_CONTENT
+    parser = CsvChunkParser(usecols=["id", "note"], skiprows=2)
+    dfs = []
+    for start in range(0, len(content), 4):
+        dfs.extend(parser.feed(content[start : start + 4], "ascii"))
+    dfs.extend(parser.finish())
+
+    df = pd.concat(dfs, ignore_index=True)
+    assert df.columns.tolist() == ["id", "note"]
+    assert df["id"].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_csv_nrows_stops_download():
+    """
+    Test that reading a limited number of rows stops the download once they
+    are parsed and releases the stream.
+    """
+    aws_connector = ChunkedAwsConnectorMock()
+    s3_handler = S3Handler(bucket="my-bucket", aws_connector=aws_connector)
+
+    df = s3_handler.read_file(
+        UrlFile(s3_url="big.csv", last_modified="1"),
+        usecols=["x", "z"],
+        dtype={"z": "float64"},
+        nrows=10,
+    )
+
+    assert df["x"].tolist() == list(range(10))
+    assert df["z"].dtype == "float64"
+    assert (aws_connector.chunks_read, aws_connector.closed) == (1, True)
+
+
+def test_csv_nrows_above_row_count():
+    """
+    Test that reading more rows than the file has returns the whole file,
+    whether the rows are buffered in one chunk or in several.
+    """
+    expected = pd.read_csv(io.BytesIO(CSV_CONTENT), sep=";")
+
+    for chunk_rows, chunk_size in ((None, 64), (10, 64), (10, 7)):
+        parser = CsvChunkParser(chunk_rows=chunk_rows, nrows=1000)
+        dfs = parse_in_chunks(parser, chunk_size)
+        pd.testing.assert_frame_equal(
+            pd.concat(dfs, ignore_index=True), expected
+        )
+
+
+def test_csv_nrows_spanning_chunks():
+    """
+    Test that a number of rows spanning several chunks is split into
+    batches of chunk_rows rows and a shorter last one.
+    """
+    aws_connector = ChunkedAwsConnectorMock()
+    s3_handler = S3Handler(bucket="my-bucket", aws_connector=aws_connector)
+
+    dfs = list(
+        s3_handler.read_file_by_chunks(
+            UrlFile(s3_url="big.csv", last_modified="1"),
+            chunk_rows=10,
+            nrows=25,
+            chunk_size=50,
+        )
+    )
+    df = s3_handler.read_file(
+        UrlFile(s3_url="big.csv", last_modified="1"), nrows=10**6
+    )
+
+    assert [len(chunk) for chunk in dfs] == [10, 10, 5]
+    assert pd.concat(dfs)["x"].tolist() == list(range(25))
+    assert len(df) == 10**5
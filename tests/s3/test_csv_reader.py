@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.models import UrlFile
+from aws_handler.s3_handler.reader.parsers import (
+    CSV_SNIFF_SIZE,
+    sniff_csv_delimiter,
+)
+
+TEST_BUCKET = "my-bucket"
+TEST_DF = pd.DataFrame(
+    {"city": ["San José", "Cañas", "Liberia"], "population": [1, 2, 3]}
+)
+
+
+class CsvAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector returning a fixed content with a fixed encoding.
+    """
+
+    def __init__(self, content, encoding):
+        self._content = content
+        self._encoding = encoding
+
+    def s3_read_file(self, bucket, key, code="utf-8", raw=False, **kwargs):
+        return self._content, self._encoding
+
+
+def read_csv_file(content, encoding, **kwargs) -> pd.DataFrame:
+    s3_handler = S3Handler(
+        bucket=TEST_BUCKET,
+        aws_connector=CsvAwsConnectorMock(content, encoding),
+    )
+    return s3_handler.read_file(
+        UrlFile(s3_url="cities.csv", last_modified="1"), **kwargs
+    )
+
+
+@pytest.mark.parametrize("engine", [None, "c", "python", "pyarrow"])
+def test_csv_engines(engine):
+    """
+    Test that every engine parses the downloaded bytes into the same
+    DataFrame, with the sniffed delimiter and the detected encoding.
+    """
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    content = TEST_DF.to_csv(sep=";", index=False).encode("latin-1")
+
+    df = read_csv_file(content, "ISO-8859-1", engine=engine)
+
+    pd.testing.assert_frame_equal(df, TEST_DF)
+
+
+def test_csv_encoding_fallbacks():
+    """
+    Test that the custom encoding overrides the detected one, and that
+    UTF-8 is used when no encoding was detected.
+    """
+    content = TEST_DF.to_csv(index=False).encode("latin-1")
+    pd.testing.assert_frame_equal(
+        read_csv_file(content, "ascii", custom_encoding="latin-1"), TEST_DF
+    )
+    pd.testing.assert_frame_equal(
+        read_csv_file(TEST_DF.to_csv(index=False).encode(), None), TEST_DF
+    )
+
+
+def test_csv_sniff_head_only():
+    """
+    Test that the delimiter is sniffed from the head of the content, even
+    when the head ends in the middle of a multi-byte character, and from
+    any buffer.
+    """
+    row = "é|1\n".encode("utf-8")
+    content = b"ab|c\n" + row * (CSV_SNIFF_SIZE // len(row) + 1)
+    assert content[CSV_SNIFF_SIZE - 1 : CSV_SNIFF_SIZE + 1] == "é".encode()
+
+    assert sniff_csv_delimiter(content, "utf-8") == "|"
+    assert sniff_csv_delimiter(bytearray(content), "utf-8") == "|"
+    assert sniff_csv_delimiter(b"skipped\n" + content, "utf-8", 1) == "|"
+
+
+def test_csv_invalid_engine():
+    """
+    Test that an unknown engine is rejected.
+    """
+    content = TEST_DF.to_csv(index=False).encode()
+    with pytest.raises(ValueError):
+        read_csv_file(content, "utf-8", engine="unknown")
@@ -0,0 +1,58 @@
+import io
+
+import pandas as pd
+
+from aws_handler.s3_handler.reader.parsers import (
+    iter_excel_batches,
+    read_excel,
+)
+
+TEST_DF = pd.DataFrame(
+    {"id": range(25), "name": [f"n{row}" for row in range(25)], "x": 1.5}
+)
+
+
+def make_workbook() -> bytes:
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter") as writer:
+        TEST_DF.to_excel(writer, sheet_name="data", index=False)
+        TEST_DF.head(3).to_excel(writer, sheet_name="summary", index=False)
+    return excel_buffer.getvalue()
+
+
+def test_read_excel_sheet_selection():
+    """
+    Test that every sheet is returned by default, and that a single sheet
+    can be read with a subset of its columns and rows.
+    """
+    workbook = make_workbook()
+
+    sheets = read_excel(workbook, engine="openpyxl")
+    assert list(sheets) == ["data", "summary"]
+    pd.testing.assert_frame_equal(sheets["data"], TEST_DF)
+
+    df = read_excel(
+        workbook,
+        sheet_name="data",
+        engine="openpyxl",
+        usecols=["id", "x"],
+        nrows=5,
+    )
+    pd.testing.assert_frame_equal(df, TEST_DF[["id", "x"]].head(5))
+
+
+def test_excel_batches():
+    """
+    Test that the rows of a sheet are streamed in batches of the requested
+    size, with the header columns.
+    """
+    dfs = list(
+        iter_excel_batches(
+            make_workbook(), chunk_rows=10, usecols=["name", "id"]
+        )
+    )
+
+    assert [len(df) for df in dfs] == [10, 10, 5]
+    pd.testing.assert_frame_equal(
+        pd.concat(dfs, ignore_index=True), TEST_DF[["name", "id"]]
+    )
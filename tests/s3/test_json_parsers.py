@@ -0,0 +1,72 @@
+import json
+
+import pandas as pd
+import pytest
+
+from aws_handler.s3_handler.reader.json_parsers import (
+    JsonArrayChunkParser,
+    NdjsonChunkParser,
+)
+
+TEST_RECORDS = [
+    {"id": row, "name": f"é{row}", "tags": [row, {"nested": "]"}]}
+    for row in range(25)
+]
+
+
+def feed_in_chunks(parser, content: bytes, chunk_size: int):
+    batches = []
+    for start in range(0, len(content), chunk_size):
+        batches += parser.feed(content[start : start + chunk_size], None)
+    return batches + parser.finish()
+
+
+@pytest.mark.parametrize("engine", ["orjson", "json"])
+def test_ndjson_chunks(engine):
+    """
+    Test that lines split between chunks are parsed once complete, in
+    batches of the requested size, with blank lines ignored.
+    """
+    pytest.importorskip(engine)
+    content = "\n".join(json.dumps(record) for record in TEST_RECORDS)
+    content = ("\n" + content).encode("utf-8")
+
+    dfs = feed_in_chunks(
+        NdjsonChunkParser(chunk_rows=10, engine=engine), content, 7
+    )
+
+    assert [len(df) for df in dfs] == [10, 10, 5]
+    pd.testing.assert_frame_equal(
+        pd.concat(dfs, ignore_index=True), pd.DataFrame(TEST_RECORDS)
+    )
+
+
+def test_json_array_chunks():
+    """
+    Test that the elements of a top-level array are parsed incrementally,
+    including numbers split between chunks, and stop at nrows.
+    """
+    content = json.dumps([12345, 67890] + TEST_RECORDS, indent=1).encode()
+
+    batches = feed_in_chunks(
+        JsonArrayChunkParser(chunk_rows=4, as_records=True), content, 3
+    )
+    assert sum(batches, []) == [12345, 67890] + TEST_RECORDS
+    assert len(batches[-1]) == 3
+
+    parser = JsonArrayChunkParser(nrows=3, as_records=True)
+    assert parser.feed(content, None) == [[12345, 67890, TEST_RECORDS[0]]]
+    assert parser.done
+
+
+def test_json_array_truncated():
+    """
+    Test that a truncated array, or a document that is not an array, fails.
+    """
+    parser = JsonArrayChunkParser()
+    parser.feed(b'[{"id": 1}, {"id"', None)
+    with pytest.raises(ValueError):
+        parser.finish()
+
+    with pytest.raises(ValueError):
+        JsonArrayChunkParser().feed(b'{"id": 1}', None)
@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.index import ListingIndex
+from aws_handler.s3_handler.index import listing_index as listing_index_module
+
+TEST_BUCKET = "my-bucket"
+TEST_FOLDER = "files/csv"
+
+
+class ListingAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector listing a fixed set of keys and recording the StartAfter
+    argument of every listing.
+    """
+
+    def __init__(self, keys, on_key=None):
+        self.keys = keys
+        self.start_after_calls = []
+        # Optional function called before each listed key
+        self.on_key = on_key
+
+    def s3_iter_objects(self, bucket, prefix="", start_after=""):
+        self.start_after_calls.append(start_after)
+        for key in sorted(self.keys):
+            if key.startswith(prefix) and key > start_after:
+                if self.on_key is not None:
+                    self.on_key(key)
+                yield {
+                    "file_path": key,
+                    "last_modified": "2025-01-01 00:00:00+00:00",
+                    "size": 1,
+                    "etag": '"etag"',
+                }
+
+
+def test_listing_index_refresh(tmp_path):
+    """
+    Test that the listing index only lists the keys after the last indexed
+    key between two reconciliations, and that the files are searched in the
+    index.
+    """
+    aws_connector = ListingAwsConnectorMock(
+        [f"{TEST_FOLDER}/a.csv", f"{TEST_FOLDER}/b.json"]
+    )
+    listing_index = ListingIndex(
+        str(tmp_path / "index.db"), reconcile_interval=3600
+    )
+    s3_handler = S3Handler(
+        bucket=TEST_BUCKET,
+        aws_connector=aws_connector,
+        listing_index=listing_index,
+    )
+
+    s3_files = s3_handler.retrieve_files(path=TEST_FOLDER, keywords=["*.csv"])
+    assert s3_files["*.csv"].number_of_files == 1
+
+    aws_connector.keys.append(f"{TEST_FOLDER}/c.csv")
+    s3_files = s3_handler.retrieve_files(path=TEST_FOLDER, keywords=["*.csv"])
+    assert [file.s3_url for file in s3_files["*.csv"]] == [
+        f"{TEST_FOLDER}/a.csv",
+        f"{TEST_FOLDER}/c.csv",
+    ]
+    assert aws_connector.start_after_calls == ["", f"{TEST_FOLDER}/b.json"]
+
+
+def test_listing_index_short_transactions(tmp_path, monkeypatch):
+    """
+    Test that the database can be written by other connections while a
+    prefix is listed, that a reconciliation drops the deleted keys, and
+    that a failed reconciliation leaves the index as it was.
+    """
+    monkeypatch.setattr(listing_index_module, "REFRESH_BATCH_SIZE", 2)
+    path = str(tmp_path / "index.db")
+    keys = [f"{TEST_FOLDER}/{index}.csv" for index in range(5)]
+    write_checks = []
+
+    def check_writable(key):
+        # Fails with "database is locked" if the listing holds the lock
+        with sqlite3.connect(path, timeout=0) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+        write_checks.append(key)
+
+    aws_connector = ListingAwsConnectorMock(keys, on_key=check_writable)
+    listing_index = ListingIndex(path, reconcile_interval=0)
+
+    listing_index.refresh(aws_connector, TEST_BUCKET, TEST_FOLDER)
+    assert write_checks == keys
+
+    del keys[1]
+    listing_index.refresh(aws_connector, TEST_BUCKET, TEST_FOLDER)
+
+    def fail_listing(key):
+        if key == keys[-1]:
+            raise IOError("Listing failed")
+
+    aws_connector.on_key = fail_listing
+    with pytest.raises(IOError):
+        listing_index.refresh(aws_connector, TEST_BUCKET, TEST_FOLDER)
+
+    assert [
+        file_info["file_path"]
+        for file_info in listing_index.iter_files(TEST_BUCKET, TEST_FOLDER)
+    ] == keys
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(
+            "SELECT COUNT(*) FROM staged_objects"
+        ).fetchone() == (0,)
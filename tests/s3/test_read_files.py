@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.models import UrlFile, UrlFileCollection
+
+TEST_BUCKET = "my-bucket"
+FILE_COUNT = 6
+
+
+class DelayedAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector returning a CSV per file, the first files of the batch
+    being the slowest, and failing the reads of "broken" files.
+    """
+
+    def __init__(self):
+        self.read_keys = []
+        self._lock = threading.Lock()
+
+    def s3_read_file(self, bucket, key, code="utf-8", raw=False, **kwargs):
+        index = int(key.split("-")[1].split(".")[0])
+        time.sleep(0.01 * (FILE_COUNT - index))
+        with self._lock:
+            self.read_keys.append(key)
+        if key.startswith("broken"):
+            raise IOError(f"Failed to download {key}")
+        return f"index,name\n{index},file\n".encode(), "ascii"
+
+
+def make_collection(broken_index=None) -> UrlFileCollection:
+    return UrlFileCollection(
+        [
+            UrlFile(
+                s3_url=(
+                    f"broken-{index}.csv"
+                    if index == broken_index
+                    else f"file-{index}.csv"
+                ),
+                last_modified="1",
+            )
+            for index in range(FILE_COUNT)
+        ]
+    )
+
+
+def test_read_files_order():
+    """
+    Test that the results follow the collection order, whatever the order
+    in which the files finish.
+    """
+    aws_connector = DelayedAwsConnectorMock()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+
+    results = s3_handler.read_files(make_collection(), max_workers=FILE_COUNT)
+
+    assert list(results) == [
+        f"file-{index}.csv" for index in range(FILE_COUNT)
+    ]
+    assert [df["index"].tolist() for df in results.values()] == [
+        [index] for index in range(FILE_COUNT)
+    ]
+    assert aws_connector.read_keys != list(results)
+
+
+def test_read_files_failure():
+    """
+    Test that a failing file does not stop the rest of the batch: with
+    `return_exceptions` its exception is returned as its result, otherwise
+    it is raised once every file has been read.
+    """
+    aws_connector = DelayedAwsConnectorMock()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+
+    results = s3_handler.read_files(
+        make_collection(broken_index=1), max_workers=2, return_exceptions=True
+    )
+    assert isinstance(results["broken-1.csv"], IOError)
+    assert [
+        df["index"].tolist()
+        for url, df in results.items()
+        if url != "broken-1.csv"
+    ] == [[index] for index in range(FILE_COUNT) if index != 1]
+
+    aws_connector.read_keys.clear()
+    with pytest.raises(IOError, match="broken-1.csv"):
+        s3_handler.read_files(make_collection(broken_index=1), max_workers=2)
+    assert len(aws_connector.read_keys) == FILE_COUNT
@@ -0,0 +1,69 @@
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+from aws_handler.s3_handler.cache import ParsedResultCache
+from aws_handler.s3_handler.models import UrlFile
+
+TEST_BUCKET = "my-bucket"
+TEST_CSV_CONTENT = b"a,b\n1,2\n3,4\n"
+
+
+class ReadingAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector returning a fixed CSV content and counting the reads.
+    """
+
+    def __init__(self):
+        self.reads = 0
+
+    def s3_read_file(self, bucket, key, code="utf-8", raw=False, **kwargs):
+        self.reads += 1
+        return TEST_CSV_CONTENT, "ascii"
+
+
+def test_result_cache_hits():
+    """
+    Test that a file is parsed once per version and that the callers get
+    copies they can modify without corrupting the cache.
+    """
+    aws_connector = ReadingAwsConnectorMock()
+    result_cache = ParsedResultCache()
+    s3_handler = S3Handler(
+        bucket=TEST_BUCKET,
+        aws_connector=aws_connector,
+        result_cache=result_cache,
+    )
+    file_v1 = UrlFile(s3_url="a.csv", last_modified="1", etag='"v1"')
+
+    df = s3_handler.read_file(file_v1)
+    df.loc[0, "a"] = 100
+    assert s3_handler.read_file(file_v1)["a"].tolist() == [1, 3]
+    assert (aws_connector.reads, result_cache.hits) == (1, 1)
+
+    s3_handler.read_file(UrlFile(s3_url="a.csv", last_modified="2"))
+    assert (aws_connector.reads, result_cache.misses) == (2, 2)
+
+
+def test_result_cache_readonly_and_eviction():
+    """
+    Test that the "readonly" mode rejects in-place writes and that the
+    least recently used results are evicted beyond the maximum size.
+    """
+    result_cache = ParsedResultCache(max_bytes=1000, mode="readonly")
+    s3_handler = S3Handler(
+        bucket=TEST_BUCKET,
+        aws_connector=ReadingAwsConnectorMock(),
+        result_cache=result_cache,
+    )
+
+    df = s3_handler.read_file(UrlFile(s3_url="a.csv", last_modified="1"))
+    with pytest.raises(ValueError):
+        df.loc[0, "a"] = 100
+
+    for version in range(2, 20):
+        s3_handler.read_file(UrlFile(s3_url="a.csv", last_modified=version))
+    assert 0 < len(result_cache) < 19
+    assert result_cache.size <= result_cache.max_bytes
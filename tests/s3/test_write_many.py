@@ -0,0 +1,107 @@
+import gzip
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from aws_handler import S3Handler
+from aws_handler.aws_integration.connectors.aws_connector import (
+    AwsConnectorMock,
+)
+
+TEST_BUCKET = "my-bucket"
+TEST_DF = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+
+class UploadingAwsConnectorMock(AwsConnectorMock):
+    """
+    Mock connector recording the uploaded objects, and failing the uploads
+    of the keys containing "fail".
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def upload_stream_to_s3(
+        self,
+        chunks,
+        bucket,
+        key,
+        content_type="application/octet-stream",
+        compression=None,
+        compression_level=None,
+    ):
+        if "fail" in key:
+            raise ConnectionError(f"Upload of {key} failed")
+        with self._lock:
+            self.objects[key] = (b"".join(chunks), content_type)
+
+
+def test_write_many_outcomes():
+    """
+    Test that every kind of item is serialized like the single write
+    methods, and that the outcomes are keyed by object key in order.
+    """
+    aws_connector = UploadingAwsConnectorMock()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+
+    outcomes = s3_handler.write_many(
+        [
+            (TEST_DF, "data.csv.gz", "files"),
+            {
+                "data": {"hello": "world"},
+                "file_name": "a.json",
+                "file_path": "j",
+            },
+            ("text", "a.txt", "t"),
+            (pd.DataFrame(), "empty.csv", "files"),
+        ],
+        max_workers=2,
+    )
+
+    assert list(outcomes) == [
+        "files/data.csv.gz",
+        "j/a.json",
+        "t/a.txt",
+        "files/empty.csv",
+    ]
+    body, content_type = aws_connector.objects["files/data.csv.gz"]
+    assert outcomes["files/data.csv.gz"] == len(body)
+    assert content_type == "application/gzip"
+    assert gzip.decompress(body).decode().splitlines()[0] == "a,b"
+    assert json.loads(aws_connector.objects["j/a.json"][0]) == {
+        "hello": "world"
+    }
+    assert aws_connector.objects["t/a.txt"] == (b"text", "text/plain")
+    assert outcomes["files/empty.csv"] == 0
+    assert "files/empty.csv" not in aws_connector.objects
+
+
+def test_write_many_failures():
+    """
+    Test that the failed items do not stop the batch, and are returned or
+    raised once the batch is done.
+    """
+    aws_connector = UploadingAwsConnectorMock()
+    s3_handler = S3Handler(bucket=TEST_BUCKET, aws_connector=aws_connector)
+    items = [
+        (TEST_DF, "fail.csv", "files"),
+        (TEST_DF, "data.unknown", "files"),
+        ("missing file_path",),
+        (TEST_DF, "data.csv", "files"),
+    ]
+
+    outcomes = s3_handler.write_many(
+        items, max_in_flight_bytes=1, return_exceptions=True
+    )
+    assert isinstance(outcomes["files/fail.csv"], ConnectionError)
+    assert isinstance(outcomes["files/data.unknown"], ValueError)
+    assert isinstance(outcomes["items[2]"], ValueError)
+    assert outcomes["files/data.csv"] > 0
+
+    aws_connector.objects.clear()
+    with pytest.raises(ConnectionError):
+        s3_handler.write_many(items)
+    assert list(aws_connector.objects) == ["files/data.csv"]
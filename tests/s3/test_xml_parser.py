@@ -0,0 +1,72 @@
+from xml.parsers.expat import ExpatError
+
+import pandas as pd
+import pytest
+import xmltodict
+
+from aws_handler.s3_handler.reader.xml_parsers import XmlChunkParser
+
+TEST_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<feed xmlns:v="urn:vendor"><header><date>2024</date></header>'
+    "<products>"
+    + "".join(
+        f'<v:product id="{row}"><name>é{row}</name><tag>a</tag><tag/>'
+        f'<price currency="EUR">{row}.5</price></v:product>'
+        for row in range(25)
+    )
+    + "</products></feed>"
+).encode("utf-8")
+
+
+def feed_in_chunks(parser, content: bytes, chunk_size: int):
+    batches = []
+    for start in range(0, len(content), chunk_size):
+        batches += parser.feed(content[start : start + chunk_size], None)
+    return batches + parser.finish()
+
+
+def test_xml_items_as_xmltodict():
+    """
+    Test that the items split between chunks (including multi-byte
+    characters) are converted as by xmltodict, in batches of the requested
+    size.
+    """
+    batches = feed_in_chunks(
+        XmlChunkParser(
+            "feed/products/product", chunk_rows=10, as_records=True
+        ),
+        TEST_XML,
+        5,
+    )
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert sum(batches, []) == (
+        xmltodict.parse(TEST_XML)["feed"]["products"]["v:product"]
+    )
+
+
+def test_xml_item_depth_and_nrows():
+    """
+    Test that the items can be selected by depth or by a path with
+    wildcards, and that the parsing stops at nrows.
+    """
+    parser = XmlChunkParser(3, nrows=2, as_records=True)
+    assert parser.feed(TEST_XML, None)[0][0] == "2024"
+    assert parser.done
+
+    parser = XmlChunkParser("*/products/v:product", nrows=2, usecols=["name"])
+    pd.testing.assert_frame_equal(
+        parser.feed(TEST_XML, None)[0], pd.DataFrame({"name": ["é0", "é1"]})
+    )
+    assert parser.done
+
+
+def test_xml_truncated():
+    """
+    Test that a truncated document fails once the whole content is fed.
+    """
+    parser = XmlChunkParser()
+    parser.feed(TEST_XML[:-20], None)
+    with pytest.raises(ExpatError):
+        parser.finish()
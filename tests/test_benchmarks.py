@@ -0,0 +1,45 @@
+from benchmarks.compare import compare_results
+from benchmarks.measure import measure, percentile
+
+
+def make_results(medians):
+    return {
+        "results": [
+            {
+                "name": name,
+                "seconds": {"p50": median},
+                "rss": {"peak_increase_bytes": 0},
+            }
+            for name, median in medians.items()
+        ]
+    }
+
+
+def test_measure_summary():
+    """
+    Test the percentiles and the throughput reported for a benchmark.
+    """
+    assert percentile([4, 1, 3, 2], 50) == 2.5
+    assert percentile([1, 2, 3, 4, 5], 90) == 4.6
+
+    summary = measure(lambda: (1000, 10), repeat=3)
+    assert summary["repeat"] == 3
+    assert summary["seconds"]["min"] <= summary["seconds"]["p50"]
+    assert summary["throughput"]["items_per_second"] > 0
+    assert summary["rss"]["peak_bytes"] >= summary["rss"]["start_bytes"]
+
+
+def test_compare_results():
+    """
+    Test that only the benchmarks slower than the threshold are regressions.
+    """
+    comparisons = compare_results(
+        make_results({"read": 1.0, "write": 1.0, "removed": 1.0}),
+        make_results({"read": 1.05, "write": 1.5, "added": 1.0}),
+        threshold=0.1,
+    )
+
+    assert [
+        (comparison["name"], comparison["regression"])
+        for comparison in comparisons
+    ] == [("read", False), ("write", True)]
@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+
+# Maximum time in seconds of a cold `import aws_handler`. Generous, so a
+# slow or loaded machine does not fail the test: the loaded modules are
+# what guards the cold start. Can be tightened with the environment
+# variable, for example on a dedicated benchmark runner.
+IMPORT_TIME_BUDGET = float(
+    os.environ.get("AWS_HANDLER_IMPORT_TIME_BUDGET", "1.0")
+)
+
+# Modules only loaded when the features needing them are used
+DEFERRED_MODULES = (
+    "boto3",
+    "botocore",
+    "aiobotocore",
+    "xmltodict",
+    "openpyxl",
+    "xlsxwriter",
+    "chardet",
+)
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def cold_import(statement: str) -> dict:
+    """
+    Run an import statement in a new interpreter.
+
+    :param statement: The import statement.
+    :return: A dictionary with the "elapsed" time of the statement and the
+    loaded "modules".
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(statement=statement)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_package_import_time():
+    """
+    Test that importing the package loads neither pandas nor the AWS SDK,
+    and stays within the (generous) import time budget.
+    """
+    runs = [cold_import("import aws_handler") for _ in range(3)]
+
+    modules = set(runs[0]["modules"])
+    assert not modules & {"pandas", "numpy", *DEFERRED_MODULES}
+    assert min(run["elapsed"] for run in runs) < IMPORT_TIME_BUDGET
+
+
+def test_handler_import_defers_dependencies():
+    """
+    Test that importing the handler does not load the AWS SDK or the
+    format-specific dependencies, and that the lazy names resolve.
+    """
+    run = cold_import(
+        "from aws_handler import S3Handler\n"
+        "from aws_handler.aws_integration import AwsConnector"
+    )
+
+    assert not set(run["modules"]) & set(DEFERRED_MODULES)
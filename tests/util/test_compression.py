@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from aws_handler.s3_handler.models import UrlFile
+from aws_handler.s3_handler.reader.parsers import parse_file_content
+from aws_handler.util.compression import (
+    StreamDecompressor,
+    compress_bytes,
+    split_compression_extension,
+)
+
+TEST_CSV_CONTENT = "id;name\n" + "".join(
+    f"{row};é{row}\n" for row in range(1000)
+)
+
+
+def test_compression_extension():
+    """
+    Test that the compression extension is split from the file names, so
+    the file extension is the one of the compressed file.
+    """
+    assert split_compression_extension("data/a.csv.gz") == (
+        "data/a.csv",
+        "gzip",
+    )
+    assert split_compression_extension("a.csv") == ("a.csv", None)
+
+    url_file = UrlFile(s3_url="data/a.json.zst", last_modified="1")
+    assert (url_file.file_extension, url_file.compression) == (
+        "json",
+        "zstd",
+    )
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+def test_stream_decompressor(compression):
+    """
+    Test that content received in small chunks, made of several compressed
+    members, is decompressed as a whole, and that truncated content fails.
+    """
+    content = TEST_CSV_CONTENT.encode("utf-8")
+    compressed = compress_bytes(content[:100], compression) + compress_bytes(
+        content[100:], compression
+    )
+
+    decompressor = StreamDecompressor(compression)
+    decompressed = b"".join(
+        decompressor.decompress(compressed[start : start + 7])
+        for start in range(0, len(compressed), 7)
+    )
+    assert decompressed + decompressor.flush() == content
+
+    decompressor = StreamDecompressor(compression)
+    decompressor.decompress(compressed[:-10])
+    with pytest.raises(EOFError):
+        decompressor.flush()
+
+
+def test_parse_compressed_csv():
+    """
+    Test that compressed CSV files are parsed while being decompressed, with
+    the encoding detected from the decompressed content.
+    """
+    compressed = compress_bytes(TEST_CSV_CONTENT.encode("utf-8"), "gzip")
+
+    df = parse_file_content("csv", compressed, None, compression="gzip")
+
+    pd.testing.assert_frame_equal(
+        df,
+        pd.DataFrame(
+            {"id": range(1000), "name": [f"é{row}" for row in range(1000)]}
+        ),
+    )
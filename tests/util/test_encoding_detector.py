@@ -0,0 +1,33 @@
+from aws_handler.util.encoding import EncodingDetector
+
+
+def test_encoding_detection_is_bounded():
+    """
+    Test that the encoding is detected from a bounded sample: ASCII and UTF-8
+    content is recognized without chardet, and a multi-byte character split
+    at the sample boundary does not break the UTF-8 check.
+    """
+    encoding_detector = EncodingDetector(sample_size=8)
+
+    assert encoding_detector.detect(b"a,b\n1,2\n") == "ascii"
+    assert encoding_detector.detect(b"a,b\n1,2\n3,4\n") == "utf-8"
+    assert encoding_detector.detect("abcdefgñ,b\n".encode("utf-8")) == "utf-8"
+    assert encoding_detector.detect("año".encode("latin-1")) != "utf-8"
+
+
+def test_encoding_detection_cache():
+    """
+    Test that the detected encoding is cached per key, so another version of
+    an object (another ETag) is detected again.
+    """
+    encoding_detector = EncodingDetector(cache_size=1)
+
+    assert encoding_detector.detect(b"abc", cache_key=("b", "k", "1")) == (
+        "ascii"
+    )
+    assert encoding_detector.detect(b"\xff", cache_key=("b", "k", "1")) == (
+        "ascii"
+    )
+    assert encoding_detector.detect(
+        "ñ".encode(), cache_key=("b", "k", "2")
+    ) == ("utf-8")
@@ -0,0 +1,41 @@
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+
+from aws_handler.util.pandas import estimate_column_widths, write_df_to_excel
+
+TEST_DF = pd.DataFrame(
+    {
+        "id": np.arange(2000),
+        "name": [f"name {row}" for row in range(2000)],
+        "amount": np.where(np.arange(2000) % 3 == 0, np.nan, 2.5),
+        "flag": np.arange(2000) % 2 == 0,
+        "date": pd.date_range("2024-01-01", periods=2000, freq="h"),
+    }
+)
+
+
+def test_column_widths_from_sample():
+    """
+    Test that the column widths fit the headers and the sampled cells,
+    including the last rows of the DataFrame.
+    """
+    widths = estimate_column_widths(TEST_DF, sample_rows=10)
+
+    assert widths[:2] == [len("1999") + 2, len("name 1999") + 2]
+
+
+def test_write_excel_to_sequential_stream():
+    """
+    Test that the workbook written into a compressed stream, which only
+    supports forward seeks, reads back as the original DataFrame.
+    """
+    sink = io.BytesIO()
+    with gzip.GzipFile(fileobj=sink, mode="wb") as compressed_sink:
+        write_df_to_excel(TEST_DF, compressed_sink)
+
+    df = pd.read_excel(io.BytesIO(gzip.decompress(sink.getvalue())))
+
+    pd.testing.assert_frame_equal(df, TEST_DF)
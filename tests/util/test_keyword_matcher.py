@@ -0,0 +1,145 @@
+import itertools
+import re
+
+from aws_handler.util.keyword_matcher import (
+    KeywordMatcher,
+    glob_literal_prefix,
+    glob_to_regex,
+    literal_trie_regex,
+)
+
+TEST_KEYS = [
+    "reports/2024-05-01.csv",
+    "reports/2024-05-01.csv.bak",
+    "reports/2024x05-02.csv",
+    "reports/archive/2024-06-01.csv",
+    "files/json/test.json",
+]
+
+
+def test_glob_keywords():
+    """
+    Test that glob keywords are matched anywhere in the key with proper glob
+    semantics, so "." is not a wildcard and "?" and "[...]" are supported.
+    """
+    keyword_matcher = KeywordMatcher(
+        ["2024-05-*.csv", "*.json", "2024-0[56]-0?.csv", ""]
+    )
+    matches = {key: keyword_matcher.match(key) for key in TEST_KEYS}
+
+    assert matches["reports/2024-05-01.csv"] == [
+        "2024-05-*.csv",
+        "2024-0[56]-0?.csv",
+        "",
+    ]
+    assert matches["reports/2024x05-02.csv"] == [""]
+    assert matches["reports/archive/2024-06-01.csv"] == [
+        "2024-0[56]-0?.csv",
+        "",
+    ]
+    assert matches["files/json/test.json"] == ["*.json", ""]
+
+
+def test_anchored_and_regex_keywords():
+    """
+    Test that anchored keywords must match the whole key and regex keywords
+    are used as regular expressions.
+    """
+    anchored_matcher = KeywordMatcher(["reports/2024-05-*.csv"], "anchored")
+    regex_matcher = KeywordMatcher([r"\d{4}-06-\d{2}\.csv$"], "regex")
+
+    assert [key for key in TEST_KEYS if anchored_matcher.match(key)] == [
+        "reports/2024-05-01.csv"
+    ]
+    assert [key for key in TEST_KEYS if regex_matcher.match(key)] == [
+        "reports/archive/2024-06-01.csv"
+    ]
+
+
+def test_glob_literal_prefix():
+    """
+    Test the extraction of the literal prefix of a glob keyword.
+    """
+    assert glob_literal_prefix("reports/2024-05-*.csv") == "reports/2024-05-"
+    assert glob_literal_prefix("reports/[ab]*.csv") == "reports/"
+    assert glob_literal_prefix("*.csv") == ""
+
+
+def test_listing_prefixes():
+    """
+    Test that anchored keywords push their literal prefix down into the
+    listing folder and that overlapping prefixes are merged.
+    """
+    anchored_matcher = KeywordMatcher(
+        [
+            "reports/2024-05-*.csv",
+            "reports/2024-05-01/*.csv",
+            "reports/2024-06-*.csv",
+            "other/*.csv",
+        ],
+        "anchored",
+    )
+    glob_matcher = KeywordMatcher(["reports/2024-05-*.csv"])
+
+    assert anchored_matcher.listing_prefixes("reports") == [
+        "reports/2024-05-",
+        "reports/2024-06-",
+    ]
+    assert anchored_matcher.listing_prefixes("reports/2024-05-01") == [
+        "reports/2024-05-01"
+    ]
+    assert glob_matcher.listing_prefixes("reports") == ["reports"]
+
+
+def test_keyword_dispatch():
+    """
+    Test that routing keys through the combined literals finds the same
+    keywords as matching every keyword, also for keywords whose literals
+    overlap, contain each other or share a prefix.
+    """
+    keywords = [
+        "2024-*",
+        "2024-05-*.csv",
+        "05-0?",
+        "4-05",
+        "*.csv",
+        "reports/*",
+        "reports/2024-0[56]-*",
+        "rep",
+        "*",
+        "",
+    ]
+    keys = TEST_KEYS + [
+        "2024-05-2024-05-01.csv",
+        "reports/reports/x",
+        "rep",
+        "other/4-05.json",
+    ]
+    for mode, search in (("glob", re.search), ("anchored", re.fullmatch)):
+        keyword_matcher = KeywordMatcher(keywords, mode)
+        for key in keys:
+            assert keyword_matcher.match(key) == [
+                keyword
+                for keyword in keywords
+                if search(glob_to_regex(keyword), key, re.DOTALL)
+            ], (mode, key)
+
+
+def test_literal_trie_regex():
+    """
+    Test that the trie of literals matches each literal and prefers the
+    longest one at a position.
+    """
+    literals = ["ab", "abc", "abd", "b.", "c"]
+    pattern = re.compile(literal_trie_regex(literals))
+
+    for literal in literals:
+        assert pattern.fullmatch(literal)
+    assert pattern.match("abcd").group() == "abc"
+    assert pattern.match("abx").group() == "ab"
+    assert not pattern.match("bx")
+    assert [
+        "".join(chars)
+        for chars in itertools.product("abcd.", repeat=2)
+        if pattern.fullmatch("".join(chars))
+    ] == ["ab", "b."]